@@ -1,12 +1,17 @@
 """Common parse tree nodes."""
 
+import asyncio
+import sys
 from abc import ABC
 from abc import abstractmethod
+from typing import TYPE_CHECKING
+from typing import Callable
 from typing import Collection
 from typing import Dict
 from typing import List
 from typing import NamedTuple
 from typing import Optional
+from typing import Set
 from typing import TextIO
 
 from typing_extensions import Literal
@@ -15,10 +20,14 @@ from liquid.context import Context
 from liquid.exceptions import DisabledTagError
 from liquid.exceptions import Error
 from liquid.expression import Expression
+from liquid.output import write_buffer
 from liquid.token import TOKEN_ILLEGAL
 from liquid.token import TOKEN_TAG
 from liquid.token import Token
 
+if TYPE_CHECKING:
+    from liquid.incremental import SourceMap
+
 # ruff: noqa: D102
 
 IllegalToken = Token(-1, TOKEN_ILLEGAL, "")
@@ -33,6 +42,10 @@ class Node(ABC):
     # node regardless of its contents.
     force_output = False
 
+    # Indicates that this node never changes the render context it is given, so it
+    # can be rendered concurrently with its siblings. See `render_concurrently_async`.
+    isolated = False
+
     def token(self) -> Token:
         """The token that started this node."""
         token: Token = getattr(self, "tok", IllegalToken)
@@ -118,11 +131,15 @@ class ChildNode(NamedTuple):
 class ParseTree(Node):
     """The root node of all syntax trees."""
 
-    __slots__ = ("statements", "version")
+    __slots__ = ("statements", "version", "source_map")
 
     def __init__(self) -> None:
         self.statements: List[Node] = []
 
+        # The source text this tree was parsed from, and where each of its statements
+        # starts, if it was parsed with `liquid.incremental.parse`.
+        self.source_map: Optional[SourceMap] = None
+
     def __str__(self) -> str:  # pragma: no cover
         return "".join(str(s) for s in self.statements)
 
@@ -183,6 +200,13 @@ class BlockNode(Node):
     async def render_to_output_async(
         self, context: Context, buffer: TextIO
     ) -> Optional[bool]:
+        if context.env.render_concurrency > 0:
+            for stmts in group_isolated(self.statements):
+                await render_concurrently_async(
+                    stmts, context, buffer, lambda _, err: context.error(err)
+                )
+            return True
+
         for stmt in self.statements:
             try:
                 await stmt.render_async(context, buffer)
@@ -237,3 +261,101 @@ class ConditionalBlockNode(Node):
                 expression=self.condition,
             )
         ]
+
+
+def estimate_size(node: Node) -> int:
+    """Return an estimate of the number of bytes used by parse tree _node_.
+
+    The estimate includes nodes, their tokens and the expressions they reference,
+    using `sys.getsizeof`. Objects shared between parse trees, like cached
+    expressions, are counted for each tree that references them. Nodes that don't
+    implement `children()` are counted, but not their descendants.
+    """
+    seen: Set[int] = set()
+    size = 0
+    stack: List[object] = [node]
+
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        size += sys.getsizeof(obj)
+
+        if isinstance(obj, Expression):
+            stack.extend(obj.children())
+        elif isinstance(obj, ParseTree):
+            size += sys.getsizeof(obj.statements)
+            stack.extend(obj.statements)
+        elif isinstance(obj, Node):
+            tok = getattr(obj, "tok", None)
+            if isinstance(tok, Token):
+                size += sys.getsizeof(tok) + sys.getsizeof(tok.value)
+
+            try:
+                children = obj.children()
+            except NotImplementedError:
+                continue
+
+            for child in children:
+                if child.node is not None:
+                    stack.append(child.node)
+                if child.expression is not None:
+                    stack.append(child.expression)
+
+    return size
+
+
+def group_isolated(statements: List[Node]) -> List[List[Node]]:
+    """Split _statements_ into runs of consecutive isolated nodes and single nodes.
+
+    Nodes in the same run can be rendered concurrently with
+    `render_concurrently_async`.
+    """
+    groups: List[List[Node]] = []
+    for stmt in statements:
+        if stmt.isolated and groups and groups[-1][-1].isolated:
+            groups[-1].append(stmt)
+        else:
+            groups.append([stmt])
+    return groups
+
+
+async def render_concurrently_async(
+    nodes: List[Node],
+    context: Context,
+    buffer: TextIO,
+    on_error: Callable[[Node, Error], None],
+) -> None:
+    """Render _nodes_ concurrently, then write their output to _buffer_ in order.
+
+    Each node is rendered to its own buffer, with at most
+    `Environment.render_concurrency` nodes rendering at the same time. Errors are
+    passed to _on_error_ in node order, after the output of preceding nodes has been
+    written to _buffer_.
+    """
+    if len(nodes) == 1:
+        try:
+            await nodes[0].render_async(context, buffer)
+        except Error as err:
+            on_error(nodes[0], err)
+        return
+
+    semaphore = asyncio.Semaphore(context.env.render_concurrency)
+
+    async def _render(node: Node, buf: TextIO) -> None:
+        async with semaphore:
+            await node.render_async(context, buf)
+
+    bufs = [context.get_buffer(buffer) for _ in nodes]
+    results = await asyncio.gather(
+        *(_render(node, buf) for node, buf in zip(nodes, bufs)),
+        return_exceptions=True,
+    )
+
+    for node, buf, result in zip(nodes, bufs, results):
+        write_buffer(buffer, buf)
+        if isinstance(result, Error):
+            on_error(node, result)
+        elif isinstance(result, BaseException):
+            raise result
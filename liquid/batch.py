@@ -0,0 +1,161 @@
+"""Render one template against many sets of render arguments.
+
+See `BoundTemplate.render_many` and `BoundTemplate.render_many_async`.
+"""
+from __future__ import annotations
+
+import asyncio
+import math
+import os
+import pickle
+from concurrent.futures import Executor
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import TYPE_CHECKING
+from typing import Callable
+from typing import Iterable
+from typing import List
+from typing import Mapping
+from typing import Optional
+from typing import Sequence
+from typing import Union
+
+from liquid.exceptions import Error
+from liquid.output import LimitedStringIO
+
+if TYPE_CHECKING:
+    from io import StringIO
+
+    from liquid import BoundTemplate
+
+__all__ = (
+    "render_many",
+    "render_many_async",
+)
+
+RenderResult = Union[str, Error]
+
+# The template rendered by a worker process. See `_init_worker`.
+_worker_template: Optional[BoundTemplate] = None
+
+
+def render_many(
+    template: BoundTemplate,
+    contexts: Iterable[Mapping[str, object]],
+    *,
+    workers: Optional[int] = None,
+    processes: bool = False,
+    executor: Optional[Executor] = None,
+    chunksize: Optional[int] = None,
+) -> List[RenderResult]:
+    """Render _template_ once for each mapping of render arguments in _contexts_.
+
+    See `BoundTemplate.render_many`.
+    """
+    if executor is None and not processes and (workers is None or workers <= 1):
+        return _render_chunk(template, contexts)
+
+    items = list(contexts)
+    if not items:
+        return []
+
+    if chunksize is None:
+        # Roughly four chunks per worker, like `multiprocessing.Pool.map`.
+        chunksize = math.ceil(len(items) / ((workers or os.cpu_count() or 1) * 4))
+    chunks = [items[i : i + chunksize] for i in range(0, len(items), chunksize)]
+
+    if executor is not None:
+        return _map_chunks(executor, partial(_render_chunk, template), chunks)
+
+    if processes:
+        # Worker processes get a copy of the template that is pickled once, and
+        # unpickled once per worker as it starts. Only render arguments are sent
+        # with each chunk.
+        data = pickle.dumps(template, protocol=pickle.HIGHEST_PROTOCOL)
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker, initargs=(data,)
+        ) as pool:
+            return _map_chunks(pool, _render_worker_chunk, chunks)
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return _map_chunks(pool, partial(_render_chunk, template), chunks)
+
+
+async def render_many_async(
+    template: BoundTemplate,
+    contexts: Iterable[Mapping[str, object]],
+    *,
+    workers: Optional[int] = None,
+) -> List[RenderResult]:
+    """An async version of `render_many`.
+
+    See `BoundTemplate.render_many_async`.
+    """
+    semaphore = asyncio.Semaphore(workers) if workers and workers > 0 else None
+
+    async def _render(item: Mapping[str, object]) -> RenderResult:
+        try:
+            if semaphore is None:
+                return await template.render_async(item)
+            async with semaphore:
+                return await template.render_async(item)
+        except Error as err:
+            return err
+
+    return list(await asyncio.gather(*(_render(item) for item in contexts)))
+
+
+def _map_chunks(
+    executor: Executor,
+    func: Callable[[Sequence[Mapping[str, object]]], List[RenderResult]],
+    chunks: Sequence[Sequence[Mapping[str, object]]],
+) -> List[RenderResult]:
+    futures = [executor.submit(func, chunk) for chunk in chunks]
+    results: List[RenderResult] = []
+    for future in futures:
+        results.extend(future.result())
+    return results
+
+
+def _init_worker(data: bytes) -> None:
+    global _worker_template  # noqa: PLW0603
+    _worker_template = pickle.loads(data)  # noqa: S301
+
+
+def _render_worker_chunk(
+    contexts: Sequence[Mapping[str, object]],
+) -> List[RenderResult]:
+    assert _worker_template is not None
+    return _render_chunk(_worker_template, contexts)
+
+
+def _render_chunk(
+    template: BoundTemplate, contexts: Iterable[Mapping[str, object]]
+) -> List[RenderResult]:
+    # One output buffer is reused for every render in the chunk.
+    buf = template._get_buffer()  # noqa: SLF001
+    results: List[RenderResult] = []
+
+    for item in contexts:
+        context = template.context_class(
+            template.env,
+            globals=template.make_globals(dict(item)),
+            template=template,
+        )
+        try:
+            template.render_with_context(context, buf)
+            results.append(buf.getvalue())
+        except Error as err:
+            results.append(err)
+        finally:
+            _reset(buf)
+
+    return results
+
+
+def _reset(buf: StringIO) -> None:
+    buf.seek(0)
+    buf.truncate()
+    if isinstance(buf, LimitedStringIO):
+        buf.size = 0
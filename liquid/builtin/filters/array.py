@@ -8,9 +8,12 @@ from itertools import islice
 from operator import getitem
 from typing import TYPE_CHECKING
 from typing import Any
+from typing import Dict
 from typing import Iterable
 from typing import List
+from typing import Optional
 from typing import Sequence
+from typing import Set
 from typing import Tuple
 from typing import Union
 
@@ -24,12 +27,15 @@ from liquid.exceptions import FilterError
 from liquid.expression import NIL
 from liquid.filter import array_filter
 from liquid.filter import decimal_arg
+from liquid.filter import flatten
 from liquid.filter import liquid_filter
 from liquid.filter import sequence_filter
+from liquid.filter import with_context
 from liquid.filter import with_environment
 from liquid.undefined import is_undefined
 
 if TYPE_CHECKING:
+    from liquid import Context
     from liquid import Environment
 
 ArrayT = Union[List[Any], Tuple[Any, ...]]
@@ -40,6 +46,10 @@ MAX_CH = chr(0x10FFFF)
 # Unique object for use with the uniq filter.
 MISSING = object()
 
+# Types whose hash is consistent with equality between any of them, so values of
+# these types can be used as keys when indexing an array.
+INDEXABLE_TYPES = frozenset((str, int, float, bool))
+
 
 def _str_if_not(val: object) -> str:
     if not isinstance(val, str):
@@ -169,24 +179,82 @@ def sort_natural(sequence: ArrayT, key: object = None) -> List[object]:
     return sorted(sequence, key=_lower)
 
 
+@with_context
+@liquid_filter
+def where(
+    sequence: ArrayT,
+    attr: object,
+    value: object = None,
+    *,
+    context: Optional[Context] = None,
+) -> List[object]:
+    """Create an array from a map where _attr_ equals _value_.
+
+    The first time an array is filtered by _attr_ during a render, its items are
+    indexed by the value of _attr_, so filtering the same array by the same
+    attribute again, with any value, does not need to scan the array.
+    """
+    if (
+        context is not None
+        and context.filter_cache.capacity
+        and type(value) in INDEXABLE_TYPES
+        and type(attr) is str
+        and isinstance(sequence, (list, tuple))
+    ):
+        index = _where_index(context, sequence, attr)
+        if index is not None:
+            return list(index.get(value, ()))
+
+    return _where(sequence, attr, value)  # type: ignore
+
+
 @sequence_filter
-def where(sequence: ArrayT, attr: object, value: object = None) -> List[object]:
-    """Create an array from a map where _attr_ equals _value_."""
+def _where(sequence: ArrayT, attr: object, value: object = None) -> List[object]:
     if value is not None and not is_undefined(value):
         return [itm for itm in sequence if _getitem(itm, attr) == value]
 
     return [itm for itm in sequence if _getitem(itm, attr) not in (False, None)]
 
 
+def _where_index(
+    context: Context, sequence: ArrayT, attr: str
+) -> Optional[Dict[object, List[object]]]:
+    """Return _sequence_'s items grouped by the value of _attr_.
+
+    Returns `None` if _sequence_ can't be indexed, in which case it is never
+    indexed for the rest of the render.
+    """
+    cache_key = ("where", id(sequence), attr)
+    cached = context.filter_cache.get(cache_key)
+    if cached is not None and cached[0] is sequence:
+        return cached[1]  # type: ignore
+
+    index: Optional[Dict[object, List[object]]] = {}
+    try:
+        for itm in flatten(sequence):
+            val = _getitem(itm, attr)
+            # Only index values with a hash that is consistent with `==`.
+            if type(val) not in INDEXABLE_TYPES and val is not None:
+                index = None
+                break
+            index.setdefault(val, []).append(itm)  # type: ignore
+    except Exception:  # noqa: BLE001
+        # Leave it to `_where` to raise or handle the error.
+        index = None
+
+    # The sequence is kept alive with its index, so its id can't be reused until
+    # the index is evicted.
+    context.filter_cache[cache_key] = (sequence, index)
+    return index
+
+
 @sequence_filter
 def uniq(sequence: ArrayT, key: object = None) -> List[object]:
     """Removes any duplicate elements in an array."""
-    # Note that we're not using a dict or set for deduplication because we need
-    # to handle sequences containing unhashable objects, like dictionaries.
-
-    # This is probably quite slow.
+    # Hashable items are deduplicated using a set. Unhashable items, like
+    # dictionaries, fall back to a slower, equality based search.
     if key is not None:
-        keys = []
+        keys = _Seen()
         result = []
         for obj in sequence:
             try:
@@ -198,13 +266,36 @@ def uniq(sequence: ArrayT, key: object = None) -> List[object]:
                     f"can't read property '{key}' of {obj}"
                 ) from err
 
-            if item not in keys:
-                keys.append(item)
+            if keys.add(item):
                 result.append(obj)
 
         return result
 
-    return [obj for i, obj in enumerate(sequence) if sequence.index(obj) == i]
+    seen = _Seen()
+    return [obj for obj in sequence if seen.add(obj)]
+
+
+class _Seen:
+    """A set-like collection of objects, some of which might not be hashable."""
+
+    __slots__ = ("hashable", "unhashable")
+
+    def __init__(self) -> None:
+        self.hashable: Set[object] = set()
+        self.unhashable: List[object] = []
+
+    def add(self, obj: object) -> bool:
+        """Add _obj_ and return `True` if an equal object has not been seen before."""
+        try:
+            if obj in self.hashable:
+                return False
+            self.hashable.add(obj)
+            return True
+        except TypeError:
+            if obj in self.unhashable:
+                return False
+            self.unhashable.append(obj)
+            return True
 
 
 @sequence_filter
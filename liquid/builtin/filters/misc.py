@@ -4,11 +4,14 @@ from __future__ import annotations
 import datetime
 import decimal
 import functools
+import re
 from typing import TYPE_CHECKING
 from typing import Any
+from typing import Optional
 from typing import Union
 
 from dateutil import parser
+from dateutil import tz
 
 try:
     from markupsafe import Markup
@@ -17,6 +20,7 @@ except ImportError:
 
 from liquid.exceptions import FilterArgumentError
 from liquid.expression import EMPTY
+from liquid.filter import impure
 from liquid.filter import liquid_filter
 from liquid.filter import with_environment
 from liquid.undefined import is_undefined
@@ -60,9 +64,87 @@ def default(obj: Any, default_: object = "", *, allow_false: bool = False) -> An
     return obj
 
 
+# ISO 8601 and RFC 3339 date and time strings, like "2023-08-01T09:30:00Z", that
+# can be parsed without dateutil. Anything else falls back to `parser.parse()`.
+RE_ISO_DATETIME = re.compile(
+    r"(\d{4})-(\d\d)-(\d\d)"
+    r"(?:[Tt ](\d\d):(\d\d)(?::(\d\d)(?:[.,](\d+))?)?"
+    r"(?:([Zz])|([+-])(\d\d)(?::?(\d\d))?)?)?"
+)
+
+
+def _parse_iso_datetime(value: str) -> Optional[datetime.datetime]:
+    """Parse an ISO 8601 date or date and time string without dateutil.
+
+    Returns `None` if _value_ is not in a format we can parse, in which case it
+    should be given to `dateutil.parser.parse()`. Parsed datetimes are equivalent
+    to those from `dateutil.parser.parse()`, including time zones.
+    """
+    match = RE_ISO_DATETIME.fullmatch(value)
+    if not match:
+        return None
+
+    (
+        year,
+        month,
+        day,
+        hour,
+        minute,
+        second,
+        fraction,
+        zulu,
+        sign,
+        offset_hours,
+        offset_minutes,
+    ) = match.groups()
+
+    tzinfo: Optional[datetime.tzinfo] = None
+    if zulu:
+        tzinfo = tz.UTC
+    elif sign:
+        offset = int(offset_hours) * 3600 + int(offset_minutes or 0) * 60
+        if offset >= 86400:  # noqa: PLR2004
+            return None
+        if offset == 0:
+            tzinfo = tz.UTC
+        else:
+            tzinfo = tz.tzoffset(None, -offset if sign == "-" else offset)
+
+    try:
+        return datetime.datetime(
+            int(year),
+            int(month),
+            int(day),
+            int(hour or 0),
+            int(minute or 0),
+            int(second or 0),
+            # Digits beyond microseconds are ignored, like dateutil.
+            int(fraction[:6].ljust(6, "0")) if fraction else 0,
+            tzinfo=tzinfo,
+        )
+    except ValueError:
+        return None
+
+
+@functools.lru_cache(maxsize=4096)
+def _parse_datetime(value: str, today: datetime.date) -> Optional[datetime.datetime]:
+    # Strings that don't include a date are parsed relative to _today_, which is
+    # part of the cache key, so cached results don't go stale at midnight.
+    dat = _parse_iso_datetime(value)
+    if dat is not None:
+        return dat
+
+    try:
+        return parser.parse(
+            value, default=datetime.datetime.combine(today, datetime.time())
+        )
+    except parser.ParserError:
+        return None
+
+
+@impure
 @with_environment
 @liquid_filter
-@functools.lru_cache(maxsize=10)
 def date(  # noqa: PLR0912 PLR0911
     dat: Union[datetime.datetime, str, int],
     fmt: str,
@@ -84,12 +166,12 @@ def date(  # noqa: PLR0912 PLR0911
             # representations of negative integers either.
             dat = datetime.datetime.fromtimestamp(int(dat))
         else:
-            try:
-                dat = parser.parse(dat)
-            except parser.ParserError:
+            parsed = _parse_datetime(dat, datetime.date.today())
+            if parsed is None:
                 # Input is returned unchanged. This is consistent
                 # with the reference implementation.
                 return str(dat)
+            dat = parsed
     elif isinstance(dat, int):
         try:
             dat = datetime.datetime.fromtimestamp(dat)
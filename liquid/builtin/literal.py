@@ -18,6 +18,8 @@ class LiteralNode(Node):
 
     __slots__ = ("tok",)
 
+    isolated = True
+
     def __init__(self, tok: Token):
         self.tok = tok
 
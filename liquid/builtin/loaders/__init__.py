@@ -11,6 +11,11 @@ from .file_system_loader import FileSystemLoader
 
 from .caching_file_system_loader import CachingFileSystemLoader
 
+from .parse_cache import FileSystemParseTreeCache
+from .parse_cache import ParseTreeCache
+
+from .watcher import FileWatcher
+
 __all__ = (
     "BaseLoader",
     "CachingFileSystemLoader",
@@ -18,6 +23,9 @@ __all__ = (
     "DictLoader",
     "FileExtensionLoader",
     "FileSystemLoader",
+    "FileSystemParseTreeCache",
+    "FileWatcher",
+    "ParseTreeCache",
     "TemplateNamespace",
     "TemplateSource",
     "UpToDate",
@@ -4,26 +4,39 @@ from __future__ import annotations
 from abc import ABC
 from pathlib import Path
 from typing import TYPE_CHECKING
+from typing import Any
 from typing import Awaitable
 from typing import Callable
 from typing import Dict
+from typing import List
 from typing import Mapping
 from typing import NamedTuple
 from typing import Optional
 from typing import Union
 
 from liquid.exceptions import TemplateNotFound
+from liquid.mode import Mode
 
 if TYPE_CHECKING:
     from liquid import Context
     from liquid import Environment
     from liquid.template import BoundTemplate
 
+    from .parse_cache import ParseTreeCache
+
 # ruff: noqa: D102 D101
 
 TemplateNamespace = Optional[Mapping[str, object]]
 UpToDate = Union[Callable[[], bool], Callable[[], Awaitable[bool]], None]
 
+# Loaders that override any of these methods might reference the render context.
+_CONTEXT_METHODS = (
+    "get_source_with_context",
+    "get_source_with_context_async",
+    "load_with_context",
+    "load_with_context_async",
+)
+
 
 class TemplateSource(NamedTuple):
     """A Liquid template source as returned by the `get_source` method of a `loader`.
@@ -50,9 +63,27 @@ class BaseLoader(ABC):  # noqa: B024
         caching_loader (bool): Indicates if this loader implements its own cache.
             Setting this sto `True` will cause the `Environment` to disable its cache
             when initialized with a caching loader.
+        parse_cache (Optional[ParseTreeCache]): An optional persistent cache of
+            parsed templates, consulted before parsing template source text. See
+            `liquid.loaders.FileSystemParseTreeCache`.
+        context_aware (bool): Indicates if this loader references the render context
+            when loading partial templates. If `False`, the `include` and `render`
+            tags can reuse a partial template loaded with the same name. Defaults to
+            `True` for loaders that override `get_source_with_context` or
+            `load_with_context`, or their async versions.
     """
 
     caching_loader = False
+    context_aware = False
+    parse_cache: Optional[ParseTreeCache] = None
+
+    def __init_subclass__(cls, **kwargs: Any):
+        super().__init_subclass__(**kwargs)
+        if "context_aware" not in cls.__dict__:
+            cls.context_aware = cls.context_aware or any(
+                getattr(cls, name) is not getattr(BaseLoader, name)
+                for name in _CONTEXT_METHODS
+            )
 
     def get_source(
         self,
@@ -78,6 +109,14 @@ class BaseLoader(ABC):  # noqa: B024
         """
         return self.get_source(env, template_name)
 
+    def list_templates(self) -> List[str]:
+        """Return a sorted list of names of templates this loader can load.
+
+        Raises:
+            NotImplementedError: If this loader can't enumerate its templates.
+        """
+        raise NotImplementedError(f"{self.__class__.__name__} can't list templates")
+
     def get_source_with_args(
         self,
         env: Environment,
@@ -140,7 +179,8 @@ class BaseLoader(ABC):  # noqa: B024
         except Exception as err:  # noqa: BLE001
             raise TemplateNotFound(name) from err
 
-        template = env.from_string(
+        template = self._from_string(
+            env,
             source,
             globals=globals,
             name=name,
@@ -163,7 +203,8 @@ class BaseLoader(ABC):  # noqa: B024
         except Exception as err:  # noqa: BLE001
             raise TemplateNotFound(name) from err
 
-        template = env.from_string(
+        template = self._from_string(
+            env,
             source,
             globals=globals,
             name=name,
@@ -194,7 +235,8 @@ class BaseLoader(ABC):  # noqa: B024
         except Exception as err:  # noqa: BLE001
             raise TemplateNotFound(name) from err
 
-        template = env.from_string(
+        template = self._from_string(
+            env,
             source,
             globals=globals,
             name=name,
@@ -218,7 +260,8 @@ class BaseLoader(ABC):  # noqa: B024
         except Exception as err:  # noqa: BLE001
             raise TemplateNotFound(name) from err
 
-        template = env.from_string(
+        template = self._from_string(
+            env,
             source,
             globals=globals,
             name=name,
@@ -242,7 +285,8 @@ class BaseLoader(ABC):  # noqa: B024
         except Exception as err:  # noqa: BLE001
             raise TemplateNotFound(name) from err
 
-        template = context.env.from_string(
+        template = self._from_string(
+            context.env,
             source,
             globals=context.globals,
             name=name,
@@ -269,7 +313,8 @@ class BaseLoader(ABC):  # noqa: B024
         except Exception as err:  # noqa: BLE001
             raise TemplateNotFound(name) from err
 
-        template = context.env.from_string(
+        template = self._from_string(
+            context.env,
             source,
             globals=context.globals,
             name=name,
@@ -279,6 +324,43 @@ class BaseLoader(ABC):  # noqa: B024
         template.uptodate = uptodate
         return template
 
+    def _from_string(
+        self,
+        env: Environment,
+        source: str,
+        *,
+        name: str,
+        path: Path,
+        globals: TemplateNamespace,  # noqa: A002
+        matter: TemplateNamespace,
+    ) -> BoundTemplate:
+        """Parse template source text, or reuse a tree from the parse cache."""
+        # Parse trees optimized using frozen globals depend on the values of those
+        # globals, which are not part of the cache key.
+        if self.parse_cache is None or (env.optimize_templates and env.frozen_globals):
+            return env.from_string(
+                source, name=name, path=path, globals=globals, matter=matter
+            )
+
+        tree = self.parse_cache.get(env, source)
+        if tree is None:
+            template = env.from_string(
+                source, name=name, path=path, globals=globals, matter=matter
+            )
+            # Parsing in WARN mode must keep warning about the same template.
+            if env.mode != Mode.WARN:
+                self.parse_cache.set(env, source, template.tree)
+            return template
+
+        return env.template_class(
+            env=env,
+            parse_tree=tree,
+            name=name,
+            path=path,
+            globals=env.make_globals(globals),
+            matter=matter,
+        )
+
 
 class DictLoader(BaseLoader):
     """A loader that loads templates from a dictionary.
@@ -298,3 +380,6 @@ class DictLoader(BaseLoader):
             raise TemplateNotFound(template_name) from err
 
         return TemplateSource(source, template_name, None)
+
+    def list_templates(self) -> List[str]:
+        return sorted(self.templates)
@@ -7,9 +7,14 @@ from typing import Awaitable
 from typing import Callable
 from typing import Iterable
 from typing import Mapping
+from typing import MutableMapping
+from typing import Optional
 from typing import Union
 
+from typing_extensions import Literal
+
 from liquid.utils import LRUCache
+from liquid.utils import SizedCache
 
 from .file_system_loader import FileExtensionLoader
 
@@ -22,6 +27,7 @@ if TYPE_CHECKING:
 
     from .base_loader import TemplateNamespace
     from .base_loader import TemplateSource
+    from .parse_cache import ParseTreeCache
 
 # ruff: noqa: D102 D101
 
@@ -43,6 +49,19 @@ class CachingFileSystemLoader(FileExtensionLoader):
             arranged in folders named for each `uid` inside the search path.
         cache_size: The maximum number of templates to hold in the cache before removing
             the least recently used template.
+        cache_max_bytes: If not `None`, the cache is also bounded by the estimated
+            size of cached templates, in bytes. See `liquid.utils.SizedCache`.
+        cache_policy: The eviction policy used when `cache_max_bytes` is set. One of
+            "lru" or "lfu".
+        parse_cache: An optional persistent cache of parsed templates, consulted
+            before parsing a template that is not in the in-memory cache. See
+            `liquid.loaders.FileSystemParseTreeCache`.
+        watch: If `True`, watch the search path for changes using a
+            `liquid.loaders.FileWatcher`, so `auto_reload` does not need to access
+            the file system for every cache hit.
+        check_interval: The minimum number of seconds between checks for changes to
+            a cached template's source file when `auto_reload` is `True`. Defaults
+            to `0`, checking on every cache hit.
     """
 
     caching_loader = True
@@ -56,14 +75,26 @@ class CachingFileSystemLoader(FileExtensionLoader):
         auto_reload: bool = True,
         namespace_key: str = "",
         cache_size: int = 300,
+        cache_max_bytes: Optional[int] = None,
+        cache_policy: Literal["lru", "lfu"] = "lru",
+        parse_cache: Optional[ParseTreeCache] = None,
+        watch: bool = False,
+        check_interval: float = 0,
     ):
         super().__init__(
             search_path=search_path,
             encoding=encoding,
             ext=ext,
+            parse_cache=parse_cache,
+            watch=watch,
+            check_interval=check_interval,
         )
         self.auto_reload = auto_reload
-        self.cache = LRUCache(capacity=cache_size)
+        self.cache: MutableMapping[str, BoundTemplate] = (
+            SizedCache(cache_max_bytes, capacity=cache_size, policy=cache_policy)
+            if cache_max_bytes
+            else LRUCache(capacity=cache_size)
+        )
         self.namespace_key = namespace_key
 
     def load(
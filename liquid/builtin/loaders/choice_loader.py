@@ -47,3 +47,8 @@ class ChoiceLoader(BaseLoader):
                 pass
 
         raise TemplateNotFound(template_name)
+
+    def list_templates(self) -> List[str]:  # noqa: D102
+        return sorted(
+            set().union(*(loader.list_templates() for loader in self.loaders))
+        )
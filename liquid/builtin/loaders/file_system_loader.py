@@ -3,10 +3,15 @@ from __future__ import annotations
 
 import asyncio
 import os
+import time
 from functools import partial
 from pathlib import Path
 from typing import TYPE_CHECKING
+from typing import Awaitable
+from typing import Callable
 from typing import Iterable
+from typing import List
+from typing import Optional
 from typing import Tuple
 from typing import Union
 
@@ -14,10 +19,13 @@ from liquid.exceptions import TemplateNotFound
 
 from .base_loader import BaseLoader
 from .base_loader import TemplateSource
+from .watcher import FileWatcher
 
 if TYPE_CHECKING:
     from liquid import Environment
 
+    from .parse_cache import ParseTreeCache
+
 
 class FileSystemLoader(BaseLoader):
     """A loader that loads templates from one or more directories on the file system.
@@ -25,12 +33,29 @@ class FileSystemLoader(BaseLoader):
     Args:
         search_path: One or more paths to search.
         encoding: Open template files with the given encoding.
+        parse_cache: An optional persistent cache of parsed templates. See
+            `liquid.loaders.FileSystemParseTreeCache`.
+        watch: If `True`, watch the search path for changes using a
+            `liquid.loaders.FileWatcher`, so checking if a template is up to date
+            does not need to access the file system. Call `close()` to stop
+            watching.
+        check_interval: The minimum number of seconds between checks for changes to
+            a template's source file. If a template has been checked in the last
+            _check_interval_ seconds, it is assumed to be up to date without
+            accessing the file system. Defaults to `0`, checking every time.
+        template_pattern: A glob-style pattern that file names must match to be
+            listed by `list_templates()`, like `"*.liquid"`. Defaults to `"*"`.
     """
 
     def __init__(
         self,
         search_path: Union[str, Path, Iterable[Union[str, Path]]],
         encoding: str = "utf-8",
+        *,
+        parse_cache: Optional[ParseTreeCache] = None,
+        watch: bool = False,
+        check_interval: float = 0,
+        template_pattern: str = "*",
     ):
         super().__init__()
         if not isinstance(search_path, Iterable) or isinstance(search_path, str):
@@ -38,6 +63,15 @@ class FileSystemLoader(BaseLoader):
 
         self.search_path = [Path(path) for path in search_path]
         self.encoding = encoding
+        self.parse_cache = parse_cache
+        self.watcher = FileWatcher(self.search_path) if watch else None
+        self.check_interval = check_interval
+        self.template_pattern = template_pattern
+
+    def close(self) -> None:
+        """Stop watching the search path for changes, if we're watching it."""
+        if self.watcher is not None:
+            self.watcher.close()
 
     def resolve_path(self, template_name: str) -> Path:
         """Return a path to the template `template_name`.
@@ -58,6 +92,26 @@ class FileSystemLoader(BaseLoader):
             return source_path
         raise TemplateNotFound(template_name)
 
+    def list_templates(self) -> List[str]:
+        """Return a sorted list of paths to template files in the search path.
+
+        Only files with names matching `template_pattern` are listed. Hidden files
+        and files in hidden directories, those with names starting with a period,
+        are not listed.
+
+        Paths are relative to the search path directory they were found in, using
+        forward slashes.
+        """
+        names = set()
+        for path in self.search_path:
+            for file in path.rglob(self.template_pattern):
+                name = file.relative_to(path)
+                if file.is_file() and not any(
+                    part.startswith(".") for part in name.parts
+                ):
+                    names.add(name.as_posix())
+        return sorted(names)
+
     def _read(self, source_path: Path) -> Tuple[str, float]:
         with source_path.open(encoding=self.encoding) as fd:
             source = fd.read()
@@ -67,11 +121,19 @@ class FileSystemLoader(BaseLoader):
         self, _: Environment, template_name: str
     ) -> TemplateSource:
         source_path = self.resolve_path(template_name)
+        if self.watcher is not None:
+            uptodate = self.watcher.uptodate(source_path)
+            source = self._read(source_path)[0]
+            return TemplateSource(source, str(source_path), uptodate)
+
         source, mtime = self._read(source_path)
+        check = partial(self._uptodate, source_path, mtime)
         return TemplateSource(
             source,
             str(source_path),
-            partial(self._uptodate, source_path, mtime),
+            _CheckInterval(check, self.check_interval)
+            if self.check_interval > 0
+            else check,
         )
 
     @staticmethod
@@ -89,9 +151,19 @@ class FileSystemLoader(BaseLoader):
     ) -> TemplateSource:
         loop = asyncio.get_running_loop()
         source_path = await loop.run_in_executor(None, self.resolve_path, template_name)
+        if self.watcher is not None:
+            uptodate = self.watcher.uptodate(source_path)
+            source = (await loop.run_in_executor(None, self._read, source_path))[0]
+            return TemplateSource(source, str(source_path), uptodate)
+
         source, mtime = await loop.run_in_executor(None, self._read, source_path)
+        check = partial(self._uptodate_async, source_path, mtime)
         return TemplateSource(
-            source, str(source_path), partial(self._uptodate_async, source_path, mtime)
+            source,
+            str(source_path),
+            _CheckIntervalAsync(check, self.check_interval)
+            if self.check_interval > 0
+            else check,
         )
 
 
@@ -102,6 +174,12 @@ class FileExtensionLoader(FileSystemLoader):
         search_path: One or more paths to search.
         encoding: Open template files with the given encoding.
         ext: A default file extension. Should include a leading period.
+        parse_cache: An optional persistent cache of parsed templates. See
+            `liquid.loaders.FileSystemParseTreeCache`.
+        watch: If `True`, watch the search path for changes using a
+            `liquid.loaders.FileWatcher`.
+        check_interval: The minimum number of seconds between checks for changes to
+            a template's source file.
     """
 
     def __init__(
@@ -109,10 +187,26 @@ class FileExtensionLoader(FileSystemLoader):
         search_path: Union[str, Path, Iterable[Union[str, Path]]],
         encoding: str = "utf-8",
         ext: str = ".liquid",
+        *,
+        parse_cache: Optional[ParseTreeCache] = None,
+        watch: bool = False,
+        check_interval: float = 0,
     ):
-        super().__init__(search_path=search_path, encoding=encoding)
+        super().__init__(
+            search_path=search_path,
+            encoding=encoding,
+            parse_cache=parse_cache,
+            watch=watch,
+            check_interval=check_interval,
+        )
         self.ext = ext
 
+    def list_templates(self) -> List[str]:
+        """Return a sorted list of paths to `ext` files in the search path."""
+        return [
+            name for name in super().list_templates() if Path(name).suffix == self.ext
+        ]
+
     def resolve_path(self, template_name: str) -> Path:  # noqa: D102
         template_path = Path(template_name)
 
@@ -130,3 +224,55 @@ class FileExtensionLoader(FileSystemLoader):
                 continue
             return source_path
         raise TemplateNotFound(template_name)
+
+
+class _CheckInterval:
+    """An `uptodate` callable that calls _uptodate_ at most once per _interval_.
+
+    The time of the last check is stored here, with the template it belongs to.
+    """
+
+    __slots__ = ("uptodate", "interval", "checked", "stale")
+
+    def __init__(self, uptodate: Callable[[], bool], interval: float):
+        self.uptodate = uptodate
+        self.interval = interval
+        self.checked = time.monotonic()
+        self.stale = False
+
+    def __call__(self) -> bool:
+        if self.stale:
+            return False
+        now = time.monotonic()
+        if now - self.checked < self.interval:
+            return True
+
+        uptodate = self.uptodate()
+        # Once a template is out of date, it stays out of date.
+        self.stale = not uptodate
+        self.checked = now
+        return uptodate
+
+
+class _CheckIntervalAsync:
+    """An async version of `_CheckInterval`."""
+
+    __slots__ = ("uptodate", "interval", "checked", "stale")
+
+    def __init__(self, uptodate: Callable[[], Awaitable[bool]], interval: float):
+        self.uptodate = uptodate
+        self.interval = interval
+        self.checked = time.monotonic()
+        self.stale = False
+
+    async def __call__(self) -> bool:
+        if self.stale:
+            return False
+        now = time.monotonic()
+        if now - self.checked < self.interval:
+            return True
+
+        uptodate = await self.uptodate()
+        self.stale = not uptodate
+        self.checked = now
+        return uptodate
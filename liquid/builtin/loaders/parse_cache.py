@@ -0,0 +1,175 @@
+"""Persistent caches for parsed templates."""
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import inspect
+import os
+import pickle
+import sys
+import tempfile
+from abc import ABC
+from abc import abstractmethod
+from functools import lru_cache
+from pathlib import Path
+from typing import TYPE_CHECKING
+from typing import Optional
+from typing import Tuple
+from typing import Type
+from typing import Union
+
+from liquid.ast import ParseTree
+from liquid.optimizer import PURE_FILTERS
+
+if TYPE_CHECKING:
+    from liquid import Environment
+    from liquid.tag import Tag
+
+# Written at the start of every cache file. Bump the version byte if the layout of
+# cache files changes.
+MAGIC = b"LQPT\x01"
+
+
+class ParseTreeCache(ABC):
+    """Base class for caches of parsed templates, keyed by template source text.
+
+    Cache keys are derived from a hash of the template source, the environment's
+    delimiters, tolerance mode and optimizer settings, the registered tag set, the
+    version of Python Liquid and the source code of every module defining a registered
+    tag. Changing any of those, including upgrading Python Liquid or editing a custom
+    tag, will cause a cache miss rather than a stale parse tree.
+    """
+
+    def key(self, env: Environment, source: str) -> str:
+        """Return a cache key for template _source_ parsed by environment _env_."""
+        digest = hashlib.sha256(_environment_fingerprint(env).encode())
+        digest.update(source.encode("utf-8", "surrogatepass"))
+        return digest.hexdigest()
+
+    @abstractmethod
+    def get(self, env: Environment, source: str) -> Optional[ParseTree]:
+        """Return a cached parse tree for _source_, or `None` if it's not cached."""
+
+    @abstractmethod
+    def set(self, env: Environment, source: str, tree: ParseTree) -> None:  # noqa: A003
+        """Store parse tree _tree_ for template source text _source_."""
+
+
+class FileSystemParseTreeCache(ParseTreeCache):
+    """A persistent cache of parsed templates, stored as files in a directory.
+
+    Parse trees are serialized using `pickle`, so the cache directory must only be
+    writable by trusted users. Unreadable or corrupt cache files are ignored and
+    overwritten next time the template is parsed.
+
+    Args:
+        directory: A path to a directory in which to store parsed templates. It will
+            be created if it does not exist.
+        suffix: A file name extension for cache files.
+    """
+
+    def __init__(self, directory: Union[str, Path], suffix: str = ".lpt"):
+        self.directory = Path(directory)
+        self.suffix = suffix
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def path(self, key: str) -> Path:
+        """Return the path to the cache file for _key_."""
+        return self.directory.joinpath(key + self.suffix)
+
+    def get(self, env: Environment, source: str) -> Optional[ParseTree]:  # noqa: D102
+        try:
+            data = self.path(self.key(env, source)).read_bytes()
+        except OSError:
+            return None
+
+        if not data.startswith(MAGIC):
+            return None
+
+        try:
+            tree = pickle.loads(memoryview(data)[len(MAGIC) :])  # noqa: S301
+        except Exception:  # noqa: BLE001
+            return None
+
+        return tree if isinstance(tree, ParseTree) else None
+
+    def set(  # noqa: D102, A003
+        self, env: Environment, source: str, tree: ParseTree
+    ) -> None:
+        path = self.path(self.key(env, source))
+        try:
+            data = pickle.dumps(tree, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception:  # noqa: BLE001
+            # Custom nodes might not be picklable. We'll parse them every time.
+            return
+
+        # Write to a temporary file first so concurrent readers never see a partially
+        # written cache file.
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as tmp_file:
+                tmp_file.write(MAGIC)
+                tmp_file.write(data)
+            os.replace(tmp, path)
+        except OSError:
+            with contextlib.suppress(OSError):
+                os.unlink(tmp)
+
+
+def _environment_fingerprint(env: Environment) -> str:
+    from liquid import __version__  # noqa: PLC0415
+
+    tags = tuple(sorted((name, type(tag)) for name, tag in env.tags.items()))
+    return "\x1f".join(
+        (
+            __version__,
+            sys.implementation.cache_tag or "",
+            type(env).__module__,
+            type(env).__qualname__,
+            env.tag_start_string,
+            env.tag_end_string,
+            env.statement_start_string,
+            env.statement_end_string,
+            env.comment_start_string,
+            env.comment_end_string,
+            str(env.mode),
+            str(env.render_whitespace_only_blocks),
+            _optimizer_fingerprint(env),
+            _tags_fingerprint(tags),
+        )
+    )
+
+
+def _optimizer_fingerprint(env: Environment) -> str:
+    if not env.optimize_templates:
+        return ""
+    # Output statements are folded depending on autoescape and which filters are
+    # still the built-in, pure implementation.
+    pure = sorted(name for name, func in env.filters.items() if func in PURE_FILTERS)
+    return f"{env.autoescape}:{','.join(pure)}"
+
+
+@lru_cache(maxsize=32)
+def _tags_fingerprint(tags: Tuple[Tuple[str, Type[Tag]], ...]) -> str:
+    digest = hashlib.sha256()
+    for name, tag_class in tags:
+        node_class = getattr(tag_class, "node_class", tag_class)
+        for cls in (tag_class, node_class):
+            digest.update(f"{name}:{cls.__module__}.{cls.__qualname__}".encode())
+            digest.update(_module_fingerprint(cls.__module__).encode())
+    return digest.hexdigest()
+
+
+@lru_cache(maxsize=128)
+def _module_fingerprint(module_name: str) -> str:
+    # A hash of the source file defining a tag, so editing a custom tag or its node
+    # invalidates cached parse trees, even without a version number change.
+    module = sys.modules.get(module_name)
+    version = str(getattr(module, "__version__", ""))
+    try:
+        source_file = inspect.getsourcefile(module)  # type: ignore
+        if source_file is None:
+            return version
+        return version + hashlib.sha256(Path(source_file).read_bytes()).hexdigest()
+    except (OSError, TypeError):
+        return version
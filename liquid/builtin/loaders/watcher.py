@@ -0,0 +1,259 @@
+"""Watch template directories for changes.
+
+A `FileWatcher` keeps a version number for each file under one or more directories,
+incremented whenever that file changes. A loader records a file's version when it
+reads a template, so checking if a template is up to date is a dictionary lookup
+rather than a `stat` system call.
+
+On Linux, changes are reported by inotify. On other platforms, or if inotify is not
+available, a background thread polls file modification times every `poll_interval`
+seconds. Either way, changes are noticed shortly after they happen, not immediately.
+
+After a watcher has been closed, its up-to-date checks fall back to comparing file
+modification times.
+"""
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import functools
+import os
+import select
+import struct
+import sys
+import threading
+from pathlib import Path
+from typing import Callable
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import Optional
+from typing import Tuple
+from typing import Union
+
+from typing_extensions import Literal
+
+__all__ = ("FileWatcher",)
+
+# inotify event masks. See `man 7 inotify`.
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+
+IN_WATCH_MASK = (
+    IN_MODIFY
+    | IN_ATTRIB
+    | IN_CLOSE_WRITE
+    | IN_MOVED_FROM
+    | IN_MOVED_TO
+    | IN_CREATE
+    | IN_DELETE
+    | IN_DELETE_SELF
+    | IN_MOVE_SELF
+    | IN_ONLYDIR
+)
+
+# struct inotify_event without its variable length name.
+_EVENT = struct.Struct("iIII")
+
+# (generation, file version)
+_Version = Tuple[int, int]
+
+
+class FileWatcher:
+    """Track changes to files under one or more directories.
+
+    Args:
+        paths: Directories to watch, including their subdirectories.
+        poll_interval: The number of seconds between checks for modified files when
+            polling, and the longest a background thread will wait before noticing
+            `close()` has been called.
+        backend: One of "inotify" or "poll". Defaults to "inotify" where it is
+            available, falling back to "poll".
+    """
+
+    def __init__(
+        self,
+        paths: Iterable[Union[str, Path]],
+        *,
+        poll_interval: float = 1.0,
+        backend: Optional[Literal["inotify", "poll"]] = None,
+    ):
+        self.paths = [Path(path) for path in paths]
+        self.poll_interval = poll_interval
+
+        self._lock = threading.Lock()
+        self._versions: Dict[str, int] = {}
+
+        # Incremented when we can't tell which files have changed, invalidating
+        # every file at once.
+        self._generation = 0
+        self._closed = threading.Event()
+
+        watch: Optional[Callable[[], None]] = None
+        if backend in (None, "inotify"):
+            watch = self._init_inotify()
+            if watch is None and backend == "inotify":
+                raise OSError("inotify is not available")
+
+        if watch is None:
+            self.backend: Literal["inotify", "poll"] = "poll"
+            self._mtimes = self._scan()
+            watch = self._poll
+        else:
+            self.backend = "inotify"
+
+        self._thread = threading.Thread(
+            target=watch, name="liquid-file-watcher", daemon=True
+        )
+        self._thread.start()
+
+    def __reduce__(self) -> Tuple[Callable[..., FileWatcher], Tuple[List[Path]]]:
+        # A new watcher, with its own background thread, for unpickled loaders.
+        return (
+            functools.partial(
+                self.__class__, poll_interval=self.poll_interval, backend=self.backend
+            ),
+            (self.paths,),
+        )
+
+    def uptodate(self, path: Union[str, Path]) -> Callable[[], bool]:
+        """Return a function that returns `False` after the file at _path_ changes.
+
+        Call this before reading the file, so changes made while reading are not
+        missed. The file's modification time is recorded too, for checks made after
+        the watcher has been closed.
+        """
+        key = os.path.abspath(path)
+        return functools.partial(self._uptodate, key, self._version(key), _mtime(key))
+
+    def close(self) -> None:
+        """Stop watching for changes."""
+        self._closed.set()
+        if self._thread is not threading.current_thread():
+            self._thread.join()
+
+    def _uptodate(self, key: str, version: _Version, mtime: Optional[int]) -> bool:
+        if self._version(key) != version:
+            return False
+        if self._closed.is_set():
+            # Changes are no longer being reported.
+            return mtime is not None and _mtime(key) == mtime
+        return True
+
+    def _version(self, key: str) -> _Version:
+        return (self._generation, self._versions.get(key, 0))
+
+    def _changed(self, key: str) -> None:
+        with self._lock:
+            self._versions[key] = self._versions.get(key, 0) + 1
+
+    def _invalidate_all(self) -> None:
+        with self._lock:
+            self._generation += 1
+
+    def _scan(self) -> Dict[str, int]:
+        mtimes: Dict[str, int] = {}
+        for path in self.paths:
+            for dirpath, _, filenames in os.walk(path):
+                for filename in filenames:
+                    key = os.path.abspath(os.path.join(dirpath, filename))
+                    try:
+                        mtimes[key] = os.stat(key).st_mtime_ns
+                    except OSError:
+                        continue
+        return mtimes
+
+    def _poll(self) -> None:
+        while not self._closed.wait(self.poll_interval):
+            mtimes = self._scan()
+            for key in self._mtimes.keys() | mtimes.keys():
+                if self._mtimes.get(key) != mtimes.get(key):
+                    self._changed(key)
+            self._mtimes = mtimes
+
+    def _init_inotify(self) -> Optional[Callable[[], None]]:
+        if not sys.platform.startswith("linux"):
+            return None
+
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+            fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        except (OSError, AttributeError):
+            return None
+
+        if fd < 0:
+            return None
+
+        # Watch descriptors to directory paths.
+        dirs: Dict[int, str] = {}
+
+        def add_watches(path: str) -> None:
+            for dirpath, _, _ in os.walk(path):
+                wd = libc.inotify_add_watch(fd, os.fsencode(dirpath), IN_WATCH_MASK)
+                if wd >= 0:
+                    dirs[wd] = os.path.abspath(dirpath)
+
+        for path in self.paths:
+            add_watches(str(path))
+
+        def watch() -> None:
+            try:
+                while not self._closed.is_set():
+                    ready, _, _ = select.select([fd], [], [], self.poll_interval)
+                    if ready:
+                        self._read_events(os.read(fd, 65536), dirs, add_watches)
+            finally:
+                os.close(fd)
+
+        return watch
+
+    def _read_events(
+        self,
+        data: bytes,
+        dirs: Dict[int, str],
+        add_watches: Callable[[str], None],
+    ) -> None:
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = _EVENT.unpack_from(data, offset)
+            offset += _EVENT.size
+            name = os.fsdecode(data[offset : offset + length].rstrip(b"\0"))
+            offset += length
+
+            if mask & IN_Q_OVERFLOW:
+                # Events have been lost.
+                self._invalidate_all()
+                continue
+
+            dirpath = dirs.get(wd)
+            if dirpath is None:
+                continue
+
+            if mask & IN_IGNORED:
+                del dirs[wd]
+            elif mask & (IN_ISDIR | IN_DELETE_SELF | IN_MOVE_SELF):
+                # A directory has been added, moved or removed. Files inside it
+                # are not reported individually.
+                if mask & (IN_CREATE | IN_MOVED_TO):
+                    add_watches(os.path.join(dirpath, name))
+                self._invalidate_all()
+            elif name:
+                self._changed(os.path.join(dirpath, name))
+
+
+def _mtime(key: str) -> Optional[int]:
+    try:
+        return os.stat(key).st_mtime_ns
+    except OSError:
+        return None
@@ -7,6 +7,10 @@ from liquid.ast import ChildNode
 from liquid.ast import Node
 from liquid.context import Context
 from liquid.expression import Expression
+from liquid.expressions.lexed import EXPRESSION_FILTERED
+from liquid.expressions.lexed import (
+    parse_filtered_expression as parse_lexed_filtered_expression,
+)
 from liquid.parse import expect
 from liquid.stream import TokenStream
 from liquid.stringify import to_liquid_string
@@ -60,4 +64,7 @@ class Statement(Tag):
     def parse(self, stream: TokenStream) -> StatementNode:
         tok = stream.current
         expect(stream, TOKEN_STATEMENT)
+        lexed = stream.lexed_expression(EXPRESSION_FILTERED, tok.value)
+        if lexed is not None:
+            return self.node_class(tok, parse_lexed_filtered_expression(lexed))
         return self.node_class(tok, self.env.parse_filtered_expression_value(tok.value))
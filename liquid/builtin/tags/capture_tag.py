@@ -2,7 +2,6 @@
 
 import re
 import sys
-from io import StringIO
 from typing import List
 from typing import Optional
 from typing import TextIO
@@ -11,6 +10,8 @@ from liquid import Markup
 from liquid import ast
 from liquid.context import Context
 from liquid.exceptions import LiquidSyntaxError
+from liquid.output import block_value
+from liquid.output import discard_block
 from liquid.parse import expect
 from liquid.parse import get_parser
 from liquid.stream import TokenStream
@@ -46,24 +47,32 @@ class CaptureNode(ast.Node):
     def __repr__(self) -> str:  # pragma: no cover
         return f"CaptureNode(tok={self.tok}, name={self.name}, block='{self.block}')"
 
-    def _assign(self, context: Context, buf: StringIO) -> None:
+    def _assign(self, context: Context, value: str) -> None:
         if context.autoescape:
-            context.assign(self.name, Markup(buf.getvalue()))
+            context.assign(self.name, Markup(value))
         else:
-            context.assign(self.name, buf.getvalue())
+            context.assign(self.name, value)
 
     def render_to_output(self, context: Context, buffer: TextIO) -> Optional[bool]:
-        buf = context.get_buffer(buffer)
-        self.block.render(context, buf)
-        self._assign(context, buf)
+        buf, mark = context.get_block_buffer(buffer)
+        try:
+            self.block.render(context, buf)
+            value = block_value(buf, mark)
+        finally:
+            discard_block(buf, mark)
+        self._assign(context, value)
         return False
 
     async def render_to_output_async(
         self, context: Context, buffer: TextIO
     ) -> Optional[bool]:
-        buf = context.get_buffer(buffer)
-        await self.block.render_async(context, buf)
-        self._assign(context, buf)
+        buf, mark = context.get_block_buffer(buffer)
+        try:
+            await self.block.render_async(context, buf)
+            value = block_value(buf, mark)
+        finally:
+            discard_block(buf, mark)
+        self._assign(context, value)
         return False
 
     def children(self) -> List[ast.ChildNode]:
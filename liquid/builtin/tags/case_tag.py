@@ -13,6 +13,8 @@ from liquid.expression import InfixExpression
 from liquid.expressions.common import parse_common_expression
 from liquid.expressions.common import tokenize_common_expression
 from liquid.expressions.stream import TokenStream as ExpressionTokenStream
+from liquid.output import commit_block
+from liquid.output import discard_block
 from liquid.parse import expect
 from liquid.parse import get_parser
 from liquid.tag import Tag
@@ -72,39 +74,43 @@ class CaseNode(ast.Node):
         return " ".join(buf)
 
     def render_to_output(self, context: Context, buffer: TextIO) -> Optional[bool]:
-        buf = context.get_buffer(buffer)
-        rendered: Optional[bool] = False
+        buf, mark = context.get_block_buffer(buffer)
+        try:
+            rendered: Optional[bool] = False
 
-        for when in self.whens:
-            if when.render(context, buf):
-                rendered = True
+            for when in self.whens:
+                if when.render(context, buf):
+                    rendered = True
 
-        if not rendered and self.default:
-            rendered = self.default.render(context, buf)
+            if not rendered and self.default:
+                rendered = self.default.render(context, buf)
 
-        val = buf.getvalue()
-        if self.forced_output or not val.isspace():
-            buffer.write(val)
+        except BaseException:
+            discard_block(buf, mark)
+            raise
 
+        commit_block(buffer, buf, mark, force=self.forced_output)
         return rendered
 
     async def render_to_output_async(
         self, context: Context, buffer: TextIO
     ) -> Optional[bool]:
-        buf = context.get_buffer(buffer)
-        rendered: Optional[bool] = False
+        buf, mark = context.get_block_buffer(buffer)
+        try:
+            rendered: Optional[bool] = False
 
-        for when in self.whens:
-            if await when.render_async(context, buf):
-                rendered = True
+            for when in self.whens:
+                if await when.render_async(context, buf):
+                    rendered = True
 
-        if not rendered and self.default:
-            rendered = await self.default.render_async(context, buf)
+            if not rendered and self.default:
+                rendered = await self.default.render_async(context, buf)
 
-        val = buf.getvalue()
-        if self.forced_output or not val.isspace():
-            buffer.write(val)
+        except BaseException:
+            discard_block(buf, mark)
+            raise
 
+        commit_block(buffer, buf, mark, force=self.forced_output)
         return rendered
 
     def children(self) -> List[ast.ChildNode]:
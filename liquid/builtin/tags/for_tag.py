@@ -2,12 +2,17 @@
 from __future__ import annotations
 
 import sys
+from collections import deque
+from itertools import islice
 from typing import TYPE_CHECKING
 from typing import Any
+from typing import Deque
+from typing import FrozenSet
 from typing import Iterator
 from typing import List
 from typing import Mapping
 from typing import Optional
+from typing import Set
 from typing import TextIO
 
 from liquid.ast import BlockNode
@@ -15,6 +20,14 @@ from liquid.ast import ChildNode
 from liquid.ast import Node
 from liquid.exceptions import BreakLoop
 from liquid.exceptions import ContinueLoop
+from liquid.expression import Identifier
+from liquid.expression import IdentifierPathElement
+from liquid.expressions.lexed import EXPRESSION_LOOP
+from liquid.expressions.lexed import (
+    parse_loop_expression as parse_lexed_loop_expression,
+)
+from liquid.output import commit_block
+from liquid.output import discard_block
 from liquid.parse import expect
 from liquid.parse import get_parser
 from liquid.tag import Tag
@@ -24,6 +37,7 @@ from liquid.token import Token
 
 if TYPE_CHECKING:
     from liquid.context import Context
+    from liquid.expression import Expression
     from liquid.expression import LoopExpression
     from liquid.stream import TokenStream
 
@@ -43,6 +57,10 @@ ENDFORELSEBLOCK = frozenset((TAG_ENDFOR,))
 class ForLoop(Mapping[str, object]):
     """Loop helper variables."""
 
+    # A `forloop` changes with every iteration, so paths like `forloop.index` must
+    # never be memoized. See `Environment.memoize_paths`.
+    __liquid_volatile__ = True
+
     __slots__ = (
         "name",
         "it",
@@ -140,7 +158,14 @@ class ForLoop(Mapping[str, object]):
 class ForNode(Node):
     """Parse tree node for the built-in "for" tag."""
 
-    __slots__ = ("tok", "expression", "block", "default", "forced_output")
+    __slots__ = (
+        "tok",
+        "expression",
+        "block",
+        "default",
+        "forced_output",
+        "_batch_keys",
+    )
 
     def __init__(
         self,
@@ -158,6 +183,10 @@ class ForNode(Node):
             b.forced_output for b in (self.block, self.default) if b
         )
 
+        # Properties of the loop variable referenced in the loop's block. Found on
+        # first use. See `Context.prefetch_async`.
+        self._batch_keys: Optional[FrozenSet[str]] = None
+
     def __str__(self) -> str:
         tag_str = f"for ({self.expression}) {{ {self.block} }}"
 
@@ -168,94 +197,127 @@ class ForNode(Node):
 
     def render_to_output(self, context: Context, buffer: TextIO) -> Optional[bool]:
         # This intermediate buffer is used to detect and possibly suppress blocks that,
-        # when rendered, contain only whitespace.
-        buf = context.get_buffer(buffer)
-        rendered: Optional[bool] = False
-
-        loop_iter, length = self.expression.evaluate(context)
-
-        if length:
-            rendered = True
-            name = self.expression.name
-
-            forloop = ForLoop(
-                name=f"{name}-{self.expression.iterable}",
-                it=loop_iter,
-                length=length,
-                parentloop=context.parentloop(),
-            )
-
-            namespace = {
-                "forloop": forloop,
-                name: None,
-            }
-
-            # Extend the context. Essentially giving priority to `ForLoopDrop`, then
-            # delegating `get` and `assign` to the outer context.
-            with context.loop(namespace, forloop):
-                for itm in forloop:
-                    namespace[name] = itm
-                    try:
-                        self.block.render(context, buf)
-                    except ContinueLoop:
-                        continue
-                    except BreakLoop:
-                        break
-
-        elif self.default:
-            rendered = self.default.render(context, buf)
-
-        val = buf.getvalue()
-        if self.forced_output or not val.isspace():
-            buffer.write(val)
+        # when rendered, contain only whitespace. Where possible, it's the enclosing
+        # buffer, starting at the current position.
+        buf, mark = context.get_block_buffer(buffer)
+        try:
+            rendered: Optional[bool] = False
+
+            loop_iter, length = self.expression.evaluate(context)
+
+            if length:
+                rendered = True
+                name = self.expression.name
+
+                forloop = ForLoop(
+                    name=f"{name}-{self.expression.iterable}",
+                    it=loop_iter,
+                    length=length,
+                    parentloop=context.parentloop(),
+                )
 
+                namespace = {
+                    "forloop": forloop,
+                    name: None,
+                }
+
+                # Extend the context. Essentially giving priority to `ForLoopDrop`,
+                # then delegating `get` and `assign` to the outer context.
+                with context.loop(namespace, forloop):
+                    for itm in forloop:
+                        namespace[name] = itm
+                        try:
+                            self.block.render(context, buf)
+                        except ContinueLoop:
+                            continue
+                        except BreakLoop:
+                            break
+
+            elif self.default:
+                rendered = self.default.render(context, buf)
+
+        except BaseException:
+            discard_block(buf, mark)
+            raise
+
+        commit_block(buffer, buf, mark, force=self.forced_output)
         return rendered
 
     async def render_to_output_async(
         self, context: Context, buffer: TextIO
     ) -> Optional[bool]:
-        buf = context.get_buffer(buffer)
-        rendered: Optional[bool] = False
+        buf, mark = context.get_block_buffer(buffer)
+        try:
+            rendered: Optional[bool] = False
 
-        loop_iter, length = await self.expression.evaluate_async(context)
+            loop_iter, length = await self.expression.evaluate_async(context)
 
-        if length:
-            rendered = True
-            name = self.expression.name
+            if length:
+                rendered = True
+                name = self.expression.name
 
-            forloop = ForLoop(
-                name=f"{name}-{self.expression.iterable}",
-                it=loop_iter,
-                length=length,
-                parentloop=context.parentloop(),
-            )
-
-            namespace = {
-                "forloop": forloop,
-                name: None,
-            }
-
-            # Extend the context. Essentially giving priority to `ForLoopDrop`, then
-            # delegating `get` and `assign` to the outer context.
-            with context.loop(namespace, forloop):
-                for itm in forloop:
-                    namespace[name] = itm
-                    try:
-                        await self.block.render_async(context, buf)
-                    except ContinueLoop:
-                        continue
-                    except BreakLoop:
-                        break
-
-        elif self.default:
-            rendered = await self.default.render_async(context, buf)
-
-        val = buf.getvalue()
-        if self.forced_output or not val.isspace():
-            buffer.write(val)
+                batches: Optional[_Batches] = None
+                batch_keys = (
+                    self.batch_keys() if context.env.async_batch_size else frozenset()
+                )
+                if batch_keys:
+                    batches = loop_iter = _Batches(
+                        loop_iter, context.env.async_batch_size
+                    )
+
+                forloop = ForLoop(
+                    name=f"{name}-{self.expression.iterable}",
+                    it=loop_iter,
+                    length=length,
+                    parentloop=context.parentloop(),
+                )
 
+                namespace = {
+                    "forloop": forloop,
+                    name: None,
+                }
+
+                # Extend the context. Essentially giving priority to `ForLoopDrop`,
+                # then delegating `get` and `assign` to the outer context.
+                with context.loop(namespace, forloop):
+                    for itm in forloop:
+                        namespace[name] = itm
+                        if batches is not None and batches.batch:
+                            # The first item of a new batch. Load properties for
+                            # every item in the batch at once.
+                            await context.prefetch_async(
+                                batches.take_batch(), batch_keys
+                            )
+                        try:
+                            await self.block.render_async(context, buf)
+                        except ContinueLoop:
+                            continue
+                        except BreakLoop:
+                            break
+
+            elif self.default:
+                rendered = await self.default.render_async(context, buf)
+
+        except BaseException:
+            discard_block(buf, mark)
+            raise
+
+        commit_block(buffer, buf, mark, force=self.forced_output)
         return rendered
 
+    def batch_keys(self) -> FrozenSet[str]:
+        """Return names of properties of the loop variable used in the loop's block.
+
+        For example, `inventory` and `title` in `{{ product.inventory }}` and
+        `{% if product.title %}`, where `product` is the loop variable. Only
+        expressions in this template are searched.
+        """
+        if self._batch_keys is None:
+            keys: Set[str] = set()
+            _collect_keys(self.block, self.expression.name, keys)
+            self._batch_keys = frozenset(keys)
+        return self._batch_keys
+
     def children(self) -> List[ChildNode]:
         _children = [
             ChildNode(
@@ -275,6 +337,64 @@ class ForNode(Node):
         return _children
 
 
+class _Batches(Iterator[Any]):
+    """An iterator that reads ahead from another iterator, _size_ items at a time."""
+
+    __slots__ = ("it", "size", "buffer", "batch")
+
+    def __init__(self, it: Iterator[Any], size: int):
+        self.it = it
+        self.size = size
+        self.buffer: Deque[Any] = deque()
+        # Items read ahead since `take_batch` was last called.
+        self.batch: List[Any] = []
+
+    def __next__(self) -> Any:
+        if not self.buffer:
+            self.batch = list(islice(self.it, self.size))
+            self.buffer.extend(self.batch)
+        if not self.buffer:
+            raise StopIteration
+        return self.buffer.popleft()
+
+    def take_batch(self) -> List[Any]:
+        batch, self.batch = self.batch, []
+        return batch
+
+
+def _collect_keys(node: Node, name: str, keys: Set[str]) -> None:
+    try:
+        children = node.children()
+    except NotImplementedError:
+        return
+
+    for child in children:
+        if child.expression is not None:
+            _collect_expression_keys(child.expression, name, keys)
+        if child.node is not None:
+            _collect_keys(child.node, name, keys)
+
+
+def _collect_expression_keys(expr: Expression, name: str, keys: Set[str]) -> None:
+    if type(expr) is Identifier and len(expr.path) > 1:  # noqa: E721
+        root, key = expr.path[0], expr.path[1]
+        if (
+            isinstance(root, IdentifierPathElement)
+            and root.value == name
+            and isinstance(key, IdentifierPathElement)
+            and isinstance(key.value, str)
+        ):
+            keys.add(key.value)
+
+    try:
+        children = expr.children()
+    except NotImplementedError:
+        return
+
+    for child in children:
+        _collect_expression_keys(child, name, keys)
+
+
 class BreakNode(Node):
     """Parse tree node for the built-in "break" tag."""
 
@@ -334,7 +454,11 @@ class ForTag(Tag):
         stream.next_token()
 
         expect(stream, TOKEN_EXPRESSION)
-        expr = self.env.parse_loop_expression_value(stream.current.value)
+        lexed = stream.lexed_expression(EXPRESSION_LOOP, stream.current.value)
+        if lexed is not None:
+            expr = parse_lexed_loop_expression(lexed)
+        else:
+            expr = self.env.parse_loop_expression_value(stream.current.value)
         stream.next_token()
 
         block = parser.parse_block(stream, ENDFORBLOCK)
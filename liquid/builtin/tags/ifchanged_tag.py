@@ -10,6 +10,9 @@ from typing import TextIO
 from liquid.ast import BlockNode
 from liquid.ast import ChildNode
 from liquid.ast import Node
+from liquid.output import block_value
+from liquid.output import commit_block
+from liquid.output import discard_block
 from liquid.parse import expect
 from liquid.parse import get_parser
 from liquid.tag import Tag
@@ -46,28 +49,38 @@ class IfChangedNode(Node):
 
     def render_to_output(self, context: Context, buffer: TextIO) -> Optional[bool]:
         # Render to an intermediate buffer.
-        buf = context.get_buffer(buffer)
-        self.block.render(context, buf)
-        val = buf.getvalue()
+        buf, mark = context.get_block_buffer(buffer)
+        try:
+            self.block.render(context, buf)
+        except BaseException:
+            discard_block(buf, mark)
+            raise
 
         # The context will update its namespace if needed.
-        if context.ifchanged(val):
-            buffer.write(val)
+        if context.ifchanged(block_value(buf, mark)):
+            commit_block(buffer, buf, mark, force=True)
             return True
+
+        discard_block(buf, mark)
         return False
 
     async def render_to_output_async(
         self, context: Context, buffer: TextIO
     ) -> Optional[bool]:
         # Render to an intermediate buffer.
-        buf = context.get_buffer(buffer)
-        await self.block.render_async(context, buf)
-        val = buf.getvalue()
+        buf, mark = context.get_block_buffer(buffer)
+        try:
+            await self.block.render_async(context, buf)
+        except BaseException:
+            discard_block(buf, mark)
+            raise
 
         # The context will update its namespace if needed.
-        if context.ifchanged(val):
-            buffer.write(val)
+        if context.ifchanged(block_value(buf, mark)):
+            commit_block(buffer, buf, mark, force=True)
             return True
+
+        discard_block(buf, mark)
         return False
 
     def children(self) -> List[ChildNode]:
@@ -1,5 +1,6 @@
 """Parse tree node and tag definition for the built in "include" tag."""
 import sys
+from typing import TYPE_CHECKING
 from typing import Dict
 from typing import List
 from typing import Optional
@@ -32,16 +33,102 @@ from liquid.token import TOKEN_FOR
 from liquid.token import TOKEN_IDENTIFIER
 from liquid.token import TOKEN_WITH
 from liquid.token import Token
+from liquid.utils import LRUCache
+
+if TYPE_CHECKING:
+    from liquid import BoundTemplate
+    from liquid.builtin.loaders import BaseLoader
 
 # ruff: noqa: D102
 
 TAG_INCLUDE = sys.intern("include")
 
 
+class PartialCache:
+    """Partial templates loaded by one `include` or `render` tag, keyed by name.
+
+    Templates are reused across renders if the environment is caching templates and
+    its loader is not context aware, with `BaseLoader.context_aware` set to `False`.
+    With `auto_reload` enabled, a reused template is validated with its `uptodate`
+    callable first. Otherwise every template is loaded with
+    `Context.get_template_with_context`, as usual.
+
+    Args:
+        capacity: The maximum number of templates to keep for one tag. More than one
+            template is loaded when a tag's template name is not a string literal.
+    """
+
+    __slots__ = ("templates",)
+
+    def __init__(self, capacity: int = 8):
+        self.templates = LRUCache(capacity)
+
+    def __reduce__(self) -> Tuple[type, Tuple[int]]:
+        # Cached templates are not pickled with the parse tree.
+        return (self.__class__, (self.templates.capacity,))
+
+    def get(self, context: Context, name: str, tag: str) -> "BoundTemplate":
+        """Return the template called _name_, loading it if necessary."""
+        if not self.enabled(context):
+            return context.get_template_with_context(name, tag=tag)
+
+        loader = context.env.loader
+        entry: Optional[Tuple["BaseLoader", "BoundTemplate"]] = self.templates.get(name)
+        if (
+            entry is not None
+            and entry[0] is loader
+            and (not self.validate(context) or entry[1].is_up_to_date)
+        ):
+            return entry[1]
+
+        template = context.get_template_with_context(name, tag=tag)
+        self.templates[name] = (loader, template)
+        return template
+
+    async def get_async(
+        self, context: Context, name: str, tag: str
+    ) -> "BoundTemplate":
+        """An async version of `get`."""
+        if not self.enabled(context):
+            return await context.get_template_with_context_async(name, tag=tag)
+
+        loader = context.env.loader
+        entry: Optional[Tuple["BaseLoader", "BoundTemplate"]] = self.templates.get(name)
+        if (
+            entry is not None
+            and entry[0] is loader
+            and (not self.validate(context) or await entry[1].is_up_to_date_async())
+        ):
+            return entry[1]
+
+        template = await context.get_template_with_context_async(name, tag=tag)
+        self.templates[name] = (loader, template)
+        return template
+
+    def add(self, context: Context, name: str, template: "BoundTemplate") -> None:
+        """Add _template_ to the cache, as if it was loaded with _context_."""
+        self.templates[name] = (context.env.loader, template)
+
+    @staticmethod
+    def enabled(context: Context) -> bool:
+        """Return `True` if templates loaded with _context_ can be reused."""
+        env = context.env
+        return not env.loader.context_aware and (
+            env.cache is not None or env.loader.caching_loader
+        )
+
+    @staticmethod
+    def validate(context: Context) -> bool:
+        """Return `True` if reused templates should be checked if they're up to date."""
+        # Caching loaders disable the environment's `auto_reload` in favour of
+        # their own, which applies when we ask them for a template again.
+        return context.env.auto_reload or context.env.loader.caching_loader
+
+
 class IncludeNode(Node):
     """Parse tree node for the built-in "include" tag."""
 
-    __slots__ = ("tok", "name", "var", "alias", "args")
+    __slots__ = ("tok", "name", "var", "alias", "args", "partials")
     tag = TAG_INCLUDE
 
     def __init__(
@@ -57,6 +144,7 @@ class IncludeNode(Node):
         self.var = var
         self.alias = alias
         self.args = args or {}
+        self.partials = PartialCache()
 
     def __str__(self) -> str:
         buf = [f"{self.name}"]
@@ -80,7 +168,7 @@ class IncludeNode(Node):
 
     def render_to_output(self, context: Context, buffer: TextIO) -> Optional[bool]:
         name = self.name.evaluate(context)
-        template = context.get_template_with_context(str(name), tag=self.tag)
+        template = self.partials.get(context, str(name), self.tag)
         namespace: Dict[str, object] = {}
 
         # Add any keyword arguments to the new template context.
@@ -121,9 +209,7 @@ class IncludeNode(Node):
         self, context: Context, buffer: TextIO
     ) -> Optional[bool]:
         name = await self.name.evaluate_async(context)
-        template = await context.get_template_with_context_async(
-            str(name), tag=self.tag
-        )
+        template = await self.partials.get_async(context, str(name), self.tag)
         namespace: Dict[str, object] = {}
 
         for _key, _val in self.args.items():
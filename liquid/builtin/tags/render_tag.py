@@ -1,5 +1,6 @@
 """Parse tree node and tag definition for the built in "render" tag."""
 import sys
+from typing import TYPE_CHECKING
 from typing import Dict
 from typing import List
 from typing import Optional
@@ -11,6 +12,7 @@ from liquid.ast import Node
 from liquid.builtin.drops import IterableDrop
 from liquid.builtin.tags.for_tag import ForLoop
 from liquid.builtin.tags.include_tag import TAG_INCLUDE
+from liquid.builtin.tags.include_tag import PartialCache
 from liquid.context import Context
 from liquid.context import ReadOnlyChainMap
 from liquid.exceptions import LiquidSyntaxError
@@ -37,6 +39,9 @@ from liquid.token import TOKEN_STRING
 from liquid.token import TOKEN_WITH
 from liquid.token import Token
 
+if TYPE_CHECKING:
+    from liquid import BoundTemplate
+
 # ruff: noqa: D102
 
 TAG_RENDER = sys.intern("render")
@@ -45,9 +50,12 @@ TAG_RENDER = sys.intern("render")
 class RenderNode(Node):
     """Parse tree node for the built-in "render" tag."""
 
-    __slots__ = ("tok", "name", "var", "loop", "alias", "args")
+    __slots__ = ("tok", "name", "var", "loop", "alias", "args", "partials")
     tag = TAG_RENDER
 
+    # Partial templates are rendered with a copy of the render context.
+    isolated = True
+
     def __init__(
         self,
         tok: Token,
@@ -63,6 +71,7 @@ class RenderNode(Node):
         self.loop = loop
         self.alias = alias
         self.args = args or {}
+        self.partials = PartialCache()
 
     def __str__(self) -> str:
         buf = [f"{self.name}"]
@@ -87,7 +96,7 @@ class RenderNode(Node):
     def render_to_output(self, context: Context, buffer: TextIO) -> Optional[bool]:
         path = self.name.evaluate(context)
         assert isinstance(path, str)
-        template = context.get_template_with_context(path, tag=self.tag)
+        template = self.partials.get(context, path, self.tag)
 
         # Evaluate keyword arguments once. Unlike 'include', 'render' can not
         # mutate variables in the outer scope, so there's no need to re-evaluate
@@ -129,18 +138,14 @@ class RenderNode(Node):
 
                 for itm in forloop:
                     args[key] = itm
-                    template.render_with_context(
-                        ctx, buffer, partial=True, block_scope=True
-                    )
+                    self._render(template, ctx, buffer)
             else:
                 # The bound variable is not array-like, shove it into the namespace
                 # via args.
                 args[key] = val
-                template.render_with_context(
-                    ctx, buffer, partial=True, block_scope=True
-                )
+                self._render(template, ctx, buffer)
         else:
-            template.render_with_context(ctx, buffer, partial=True, block_scope=True)
+            self._render(template, ctx, buffer)
 
         return True
 
@@ -149,7 +154,7 @@ class RenderNode(Node):
     ) -> Optional[bool]:
         path = await self.name.evaluate_async(context)
         assert isinstance(path, str)
-        template = await context.get_template_with_context_async(path, tag=self.tag)
+        template = await self.partials.get_async(context, path, self.tag)
 
         # Evaluate keyword arguments once. Unlike 'include', 'render' can not
         # mutate variables in the outer scope, so there's no need to re-evaluate
@@ -191,22 +196,38 @@ class RenderNode(Node):
 
                 for itm in forloop:
                     args[key] = itm
-                    await template.render_with_context_async(
-                        ctx, buffer, partial=True, block_scope=True
-                    )
+                    await self._render_async(template, ctx, buffer)
             else:
                 # The bound variable is not array-like, shove it into the namespace
                 # via args.
                 args[key] = val
-                await template.render_with_context_async(
-                    ctx, buffer, partial=True, block_scope=True
-                )
+                await self._render_async(template, ctx, buffer)
+        else:
+            await self._render_async(template, ctx, buffer)
+
+        return True
+
+    def _render(self, template: "BoundTemplate", ctx: Context, buffer: TextIO) -> None:
+        cache = ctx.env.render_cache
+        if cache is None:
+            template.render_with_context(ctx, buffer, partial=True, block_scope=True)
         else:
+            cache.render_with_context(
+                template, ctx, buffer, partial=True, block_scope=True
+            )
+
+    async def _render_async(
+        self, template: "BoundTemplate", ctx: Context, buffer: TextIO
+    ) -> None:
+        cache = ctx.env.render_cache
+        if cache is None:
             await template.render_with_context_async(
                 ctx, buffer, partial=True, block_scope=True
             )
-
-        return True
+        else:
+            await cache.render_with_context_async(
+                template, ctx, buffer, partial=True, block_scope=True
+            )
 
     def children(self) -> List[ChildNode]:
         block_scope: List[str] = list(self.args.keys())
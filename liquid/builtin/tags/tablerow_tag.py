@@ -14,6 +14,10 @@ from liquid.ast import Node
 from liquid.context import Context
 from liquid.expression import NIL
 from liquid.expression import LoopExpression
+from liquid.expressions.lexed import EXPRESSION_LOOP
+from liquid.expressions.lexed import (
+    parse_loop_expression as parse_lexed_loop_expression,
+)
 from liquid.limits import to_int
 from liquid.parse import expect
 from liquid.parse import get_parser
@@ -34,6 +38,9 @@ END_TAGBLOCK = frozenset((TAG_ENDTABLEROW,))
 class TableRow(Mapping[str, object]):
     """Table row helper variables."""
 
+    # See `Environment.memoize_paths`.
+    __liquid_volatile__ = True
+
     __slots__ = (
         "name",
         "it",
@@ -267,7 +274,11 @@ class TablerowTag(Tag):
         stream.next_token()
 
         expect(stream, TOKEN_EXPRESSION)
-        loop_expression = self.env.parse_loop_expression_value(stream.current.value)
+        lexed = stream.lexed_expression(EXPRESSION_LOOP, stream.current.value)
+        if lexed is not None:
+            loop_expression = parse_lexed_loop_expression(lexed)
+        else:
+            loop_expression = self.env.parse_loop_expression_value(stream.current.value)
         stream.next_token()
 
         block = parser.parse_block(stream, END_TAGBLOCK)
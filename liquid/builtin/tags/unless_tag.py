@@ -14,6 +14,12 @@ from liquid.ast import ConditionalBlockNode
 from liquid.ast import IllegalNode
 from liquid.ast import Node
 from liquid.exceptions import LiquidSyntaxError
+from liquid.expressions.lexed import EXPRESSION_BOOLEAN
+from liquid.expressions.lexed import (
+    parse_boolean_expression as parse_lexed_boolean_expression,
+)
+from liquid.output import commit_block
+from liquid.output import discard_block
 from liquid.parse import eat_block
 from liquid.parse import expect
 from liquid.parse import get_parser
@@ -92,24 +98,25 @@ class UnlessNode(Node):
     def render_to_output(self, context: Context, buffer: TextIO) -> Optional[bool]:
         # This intermediate buffer is used to detect and possibly suppress blocks that,
         # when rendered, contain only whitespace.
-        buf = context.get_buffer(buffer)
-
-        if not self.condition.evaluate(context):
-            rendered = self.consequence.render(context, buf)
-        else:
-            rendered = False
-            for alt in self.conditional_alternatives:
-                if alt.render(context, buf):
-                    rendered = True
-                    break
-
-            if not rendered and self.alternative:
-                rendered = self.alternative.render(context, buf)
-
-        val = buf.getvalue()
-        if self.forced_output or not val.isspace():
-            buffer.write(val)
-
+        buf, mark = context.get_block_buffer(buffer)
+        try:
+            if not self.condition.evaluate(context):
+                rendered = self.consequence.render(context, buf)
+            else:
+                rendered = False
+                for alt in self.conditional_alternatives:
+                    if alt.render(context, buf):
+                        rendered = True
+                        break
+
+                if not rendered and self.alternative:
+                    rendered = self.alternative.render(context, buf)
+
+        except BaseException:
+            discard_block(buf, mark)
+            raise
+
+        commit_block(buffer, buf, mark, force=self.forced_output)
         return rendered
 
     async def render_to_output_async(
@@ -117,24 +124,25 @@ class UnlessNode(Node):
     ) -> Optional[bool]:
         # This intermediate buffer is used to detect and possibly suppress blocks that,
         # when rendered, contain only whitespace.
-        buf = context.get_buffer(buffer)
-
-        if not await self.condition.evaluate_async(context):
-            rendered = await self.consequence.render_async(context, buf)
-        else:
-            rendered = False
-            for alt in self.conditional_alternatives:
-                if await alt.render_async(context, buf):
-                    rendered = True
-                    break
-
-            if not rendered and self.alternative:
-                rendered = await self.alternative.render_async(context, buf)
-
-        val = buf.getvalue()
-        if self.forced_output or not val.isspace():
-            buffer.write(val)
-
+        buf, mark = context.get_block_buffer(buffer)
+        try:
+            if not await self.condition.evaluate_async(context):
+                rendered = await self.consequence.render_async(context, buf)
+            else:
+                rendered = False
+                for alt in self.conditional_alternatives:
+                    if await alt.render_async(context, buf):
+                        rendered = True
+                        break
+
+                if not rendered and self.alternative:
+                    rendered = await self.alternative.render_async(context, buf)
+
+        except BaseException:
+            discard_block(buf, mark)
+            raise
+
+        commit_block(buffer, buf, mark, force=self.forced_output)
         return rendered
 
     def children(self) -> List[ChildNode]:
@@ -180,6 +188,9 @@ class UnlessTag(Tag):
     def parse_expression(self, stream: TokenStream) -> Expression:
         """Parse a boolean expression from a stream of tokens."""
         expect(stream, TOKEN_EXPRESSION)
+        lexed = stream.lexed_expression(EXPRESSION_BOOLEAN, stream.current.value)
+        if lexed is not None:
+            return parse_lexed_boolean_expression(lexed)
         return self.env.parse_boolean_expression_value(stream.current.value)
 
     def parse(self, stream: TokenStream) -> Union[UnlessNode, IllegalNode]:
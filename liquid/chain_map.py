@@ -6,23 +6,30 @@ https://code.activestate.com/recipes/305268/
 from collections import deque
 from itertools import chain
 from typing import Any
+from typing import ClassVar
 from typing import Iterator
 from typing import Mapping
+from typing import Set
+
+_MISSING = object()
 
 
 class ReadOnlyChainMap(Mapping[str, object]):
     """Combine multiple mappings for sequential lookup."""
 
+    # Mapping types with a `get` method that agrees with `__getitem__`, without
+    # raising and catching a `KeyError` for every missing key. Mappings of other
+    # types, like `defaultdict`, are searched with `__getitem__`.
+    get_types: ClassVar[Set[type]] = {dict}
+
     def __init__(self, *maps: Mapping[str, object]):
         self._maps = deque(maps)
 
     def __getitem__(self, key: str) -> object:
-        for mapping in self._maps:
-            try:
-                return mapping[key]
-            except KeyError:
-                pass
-        raise KeyError(key)
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
 
     def __iter__(self) -> Iterator[str]:
         return chain(*self._maps)
@@ -36,10 +43,18 @@ class ReadOnlyChainMap(Mapping[str, object]):
 
     def get(self, key: str, default: object = None) -> object:
         """Return the value for key if key is in the dictionary, else default."""
-        try:
-            return self[key]
-        except KeyError:
-            return default
+        for mapping in self._maps:
+            # Other mappings might implement `__getitem__` and `get` differently.
+            if type(mapping) in self.get_types:
+                value = mapping.get(key, _MISSING)
+                if value is not _MISSING:
+                    return value
+            else:
+                try:
+                    return mapping[key]
+                except KeyError:
+                    pass
+        return default
 
     def push(self, namespace: Mapping[Any, Any]) -> None:
         """Add a mapping to the front of the chain map."""
@@ -48,3 +63,6 @@ class ReadOnlyChainMap(Mapping[str, object]):
     def pop(self) -> Mapping[Any, Any]:
         """Remove a mapping from the front of the chain map."""
         return self._maps.popleft()
+
+
+ReadOnlyChainMap.get_types.add(ReadOnlyChainMap)
@@ -0,0 +1,381 @@
+"""Compile a template's parse tree to a Python function.
+
+The tree-walking renderer calls `Node.render` for every node, which checks for
+disabled tags before dispatching to `render_to_output`, which, for output statements,
+dispatches again to `Expression.evaluate`. Block tags render each of their blocks
+through another `BlockNode.render` call. The compiler generates the source of a single
+Python function per template, unrolling the top-level node loop found in
+`BoundTemplate.render_with_context`, and the bodies of built-in block tags.
+
+Template literals are written directly from string constants, and output statements
+evaluate their expression and write to the output buffer without an intermediate
+`Node.render` call. The built-in `if`, `unless`, `case`, `for` and `capture` tags
+are compiled to equivalent Python statements, including their blocks, whitespace
+suppression, `break` and `continue` handling and disabled tag checks.
+
+All other nodes, including other block tags like `tablerow`, subclasses of built-in
+nodes, and tags nested too deeply to be compiled, are bound to the generated
+function's namespace and rendered by calling `Node.render`. Behavior, including error
+handling, is the same as the tree-walker.
+
+Enable compilation by setting `Environment.compile_templates` to `True`.
+"""
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import TextIO
+from typing import Tuple
+from typing import Union
+
+from liquid.ast import BlockNode
+from liquid.ast import ConditionalBlockNode
+from liquid.ast import Node
+from liquid.builtin.literal import LiteralNode
+from liquid.builtin.statement import StatementNode
+from liquid.builtin.tags.capture_tag import CaptureNode
+from liquid.builtin.tags.case_tag import CaseNode
+from liquid.builtin.tags.for_tag import BreakNode
+from liquid.builtin.tags.for_tag import ContinueNode
+from liquid.builtin.tags.for_tag import ForLoop
+from liquid.builtin.tags.for_tag import ForNode
+from liquid.builtin.tags.if_tag import IfNode
+from liquid.builtin.tags.unless_tag import UnlessNode
+from liquid.exceptions import BreakLoop
+from liquid.exceptions import ContinueLoop
+from liquid.exceptions import Error
+from liquid.exceptions import LiquidInterrupt
+from liquid.exceptions import LiquidSyntaxError
+from liquid.exceptions import StopRender
+from liquid.expression import FilteredExpression
+from liquid.output import block_value
+from liquid.output import commit_block
+from liquid.output import discard_block
+from liquid.stringify import to_liquid_string
+from liquid.token import TOKEN_TAG
+
+if TYPE_CHECKING:
+    from liquid import Environment
+    from liquid.ast import ParseTree
+    from liquid.context import Context
+
+__all__ = (
+    "CompiledRender",
+    "compile_tree",
+    "generate_source",
+)
+
+CompiledRender = Callable[["Context", TextIO, bool, bool], None]
+
+# Python limits the number of nested `try`, `with` and `for` statements in a single
+# function to 20. Tags that would take us past this limit are rendered with
+# `Node.render` instead.
+MAX_NESTED_BLOCKS = 18
+
+
+def _interrupt(
+    env: Environment,
+    err: LiquidInterrupt,
+    partial: bool,
+    block_scope: bool,
+    linenum: int,
+) -> None:
+    # If this is an "included" template, there could be a for loop in a parent
+    # template. Convert the interrupt to a syntax error if there is no parent.
+    if not partial or block_scope:
+        env.error(LiquidSyntaxError(f"unexpected '{err}'", linenum=linenum))
+    else:
+        raise err
+
+
+def generate_source(tree: ParseTree) -> Tuple[str, Dict[str, object]]:
+    """Return Python source code for rendering _tree_ and its global namespace.
+
+    The generated function is called `render` and has the signature
+    `render(context, buffer, partial, block_scope)`.
+    """
+    gen = _Generator()
+    gen.lines.extend(
+        [
+            "def render(context, buffer, partial, block_scope):",
+            "    write = buffer.write",
+            "    error = env.error",
+        ]
+    )
+
+    for node in tree.statements:
+        linenum = node.token().linenum
+        gen.emit(1, "try:")
+        gen.node(node, "buffer", 2, 1)
+
+        if type(node) is not LiteralNode and type(node) is not StatementNode:  # noqa: E721
+            gen.emit(1, "except LiquidInterrupt as err:")
+            gen.emit(2, f"interrupt(env, err, partial, block_scope, {linenum})")
+            gen.emit(1, "except StopRender:")
+            gen.emit(2, "return")
+
+        gen.emit(1, "except Error as err:")
+        gen.emit(2, f"error(err, linenum={linenum})")
+
+    return "\n".join(gen.lines), gen.namespace
+
+
+class _Generator:
+    """Generate Python source code for rendering nodes.
+
+    Each method takes the name of the output buffer variable to write to, the
+    indentation level of the code to generate, and the number of blocks, like `try`
+    and `for`, enclosing that code in the generated function.
+    """
+
+    def __init__(self) -> None:
+        self.lines: List[str] = []
+        self.namespace: Dict[str, object] = {}
+
+    def emit(self, indent: int, line: str) -> None:
+        self.lines.append("    " * indent + line)
+
+    def bind(self, prefix: str, obj: object) -> str:
+        """Add _obj_ to the generated function's namespace, returning its name."""
+        name = f"{prefix}{len(self.namespace)}"
+        self.namespace[name] = obj
+        return name
+
+    def check_disabled(self, node: Node, indent: int) -> None:
+        """Generate the disabled tag check done by `Node.render`, if needed."""
+        if node.token().type == TOKEN_TAG:
+            name = self.bind("_n", node)
+            self.emit(indent, "if context.disabled_tags:")
+            self.emit(indent + 1, f"{name}.raise_for_disabled(context.disabled_tags)")
+
+    def guard(self, node: Node) -> str:
+        """Return a condition prefix doing the disabled tag check for _node_."""
+        if node.token().type != TOKEN_TAG:
+            return ""
+        name = self.bind("_n", node)
+        return (
+            f"(context.disabled_tags and "
+            f"{name}.raise_for_disabled(context.disabled_tags)) or "
+        )
+
+    def node(self, node: Node, buf: str, indent: int, depth: int) -> None:
+        """Generate code that renders _node_ to _buf_."""
+        write = "write" if buf == "buffer" else f"{buf}.write"
+
+        # Exact type checks. Subclasses of built-in nodes might override
+        # `render_to_output`.
+        if type(node) is LiteralNode:  # noqa: E721
+            self.emit(indent, f"{write}({node.tok.value!r})")
+        elif type(node) is StatementNode:  # noqa: E721
+            expr = node.expression
+            # Skip `FilteredExpression.evaluate` when there are no filters to apply.
+            if type(expr) is FilteredExpression and not expr.filters:  # noqa: E721
+                expr = expr.expression
+            self.emit(
+                indent,
+                f"{write}(to_liquid_string({self.bind('_e', expr)}.evaluate(context), "
+                "context.autoescape))",
+            )
+        elif not _compilable(node, depth):
+            self.emit(indent, f"{self.bind('_n', node)}.render(context, {buf})")
+        elif type(node) is IfNode or type(node) is UnlessNode:  # noqa: E721
+            self.if_node(node, buf, indent, depth)
+        elif type(node) is CaseNode:  # noqa: E721
+            self.case_node(node, buf, indent, depth)
+        elif type(node) is ForNode:  # noqa: E721
+            self.for_node(node, buf, indent, depth)
+        elif type(node) is CaptureNode:  # noqa: E721
+            self.capture_node(node, buf, indent, depth)
+        else:
+            self.check_disabled(node, indent)
+            if type(node) is BreakNode:  # noqa: E721
+                self.emit(indent, "raise BreakLoop('break')")
+            else:
+                self.emit(indent, "raise ContinueLoop('continue')")
+
+    def block(self, block: BlockNode, buf: str, indent: int, depth: int) -> None:
+        """Generate code equivalent to `BlockNode.render`."""
+        self.check_disabled(block, indent)
+        if not block.statements:
+            self.emit(indent, "pass")
+
+        for stmt in block.statements:
+            self.emit(indent, "try:")
+            self.node(stmt, buf, indent + 1, depth + 1)
+            self.emit(indent, "except Error as err:")
+            self.emit(indent + 1, "context.error(err)")
+
+    def open_block_buffer(self, buf: str, indent: int, depth: int) -> str:
+        """Generate a call to `Context.get_block_buffer`, returning the buffer name."""
+        self.emit(indent, f"b{depth}, m{depth} = context.get_block_buffer({buf})")
+        return f"b{depth}"
+
+    def commit_block_buffer(
+        self, node: Node, buf: str, indent: int, depth: int
+    ) -> None:
+        """Generate the discard and commit calls wrapping a block tag's output."""
+        self.emit(indent, "except BaseException:")
+        self.emit(indent + 1, f"discard_block(b{depth}, m{depth})")
+        self.emit(indent + 1, "raise")
+        force = getattr(node, "forced_output", False)
+        self.emit(indent, f"commit_block({buf}, b{depth}, m{depth}, force={force!r})")
+
+    def if_node(
+        self, node: Union[IfNode, UnlessNode], buf: str, indent: int, depth: int
+    ) -> None:
+        """Generate code equivalent to `IfNode.render` or `UnlessNode.render`."""
+        self.check_disabled(node, indent)
+        block_buf = self.open_block_buffer(buf, indent, depth)
+        self.emit(indent, "try:")
+
+        condition = f"{self.bind('_e', node.condition)}.evaluate(context)"
+        if type(node) is UnlessNode:  # noqa: E721
+            condition = f"not {condition}"
+        self.emit(indent + 1, f"if {condition}:")
+        self.block(node.consequence, block_buf, indent + 2, depth + 1)
+
+        for alt in node.conditional_alternatives:
+            self.emit(
+                indent + 1,
+                f"elif {self.guard(alt)}"
+                f"{self.bind('_e', alt.condition)}.evaluate(context):",
+            )
+            self.block(alt.block, block_buf, indent + 2, depth + 1)
+
+        if node.alternative:
+            self.emit(indent + 1, "else:")
+            self.block(node.alternative, block_buf, indent + 2, depth + 1)
+
+        self.commit_block_buffer(node, buf, indent, depth)
+
+    def case_node(self, node: CaseNode, buf: str, indent: int, depth: int) -> None:
+        """Generate code equivalent to `CaseNode.render`."""
+        self.check_disabled(node, indent)
+        block_buf = self.open_block_buffer(buf, indent, depth)
+        rendered = f"r{depth}"
+        self.emit(indent, "try:")
+        self.emit(indent + 1, f"{rendered} = False")
+
+        for when in node.whens:
+            self.emit(
+                indent + 1,
+                f"if {self.guard(when)}"
+                f"{self.bind('_e', when.condition)}.evaluate(context):",
+            )
+            self.block(when.block, block_buf, indent + 2, depth + 1)
+            self.emit(indent + 2, f"{rendered} = True")
+
+        if node.default:
+            self.emit(indent + 1, f"if not {rendered}:")
+            self.block(node.default, block_buf, indent + 2, depth + 1)
+
+        self.commit_block_buffer(node, buf, indent, depth)
+
+    def for_node(self, node: ForNode, buf: str, indent: int, depth: int) -> None:
+        """Generate code equivalent to `ForNode.render`."""
+        self.check_disabled(node, indent)
+        block_buf = self.open_block_buffer(buf, indent, depth)
+        name = node.expression.name
+        forloop = f"forloop{depth}"
+        namespace = f"ns{depth}"
+
+        self.emit(indent, "try:")
+        self.emit(
+            indent + 1,
+            f"it{depth}, length{depth} = "
+            f"{self.bind('_e', node.expression)}.evaluate(context)",
+        )
+        self.emit(indent + 1, f"if length{depth}:")
+        self.emit(
+            indent + 2,
+            f"{forloop} = ForLoop(name={f'{name}-{node.expression.iterable}'!r}, "
+            f"it=it{depth}, length=length{depth}, parentloop=context.parentloop())",
+        )
+        self.emit(indent + 2, f"{namespace} = {{'forloop': {forloop}, {name!r}: None}}")
+        self.emit(indent + 2, f"with context.loop({namespace}, {forloop}):")
+        self.emit(indent + 3, f"for item in {forloop}:")
+        self.emit(indent + 4, f"{namespace}[{name!r}] = item")
+        self.emit(indent + 4, "try:")
+        self.block(node.block, block_buf, indent + 5, depth + 4)
+        self.emit(indent + 4, "except ContinueLoop:")
+        self.emit(indent + 5, "continue")
+        self.emit(indent + 4, "except BreakLoop:")
+        self.emit(indent + 5, "break")
+
+        if node.default:
+            self.emit(indent + 1, "else:")
+            self.block(node.default, block_buf, indent + 2, depth + 1)
+
+        self.commit_block_buffer(node, buf, indent, depth)
+
+    def capture_node(
+        self, node: CaptureNode, buf: str, indent: int, depth: int
+    ) -> None:
+        """Generate code equivalent to `CaptureNode.render`."""
+        self.check_disabled(node, indent)
+        block_buf = self.open_block_buffer(buf, indent, depth)
+        self.emit(indent, "try:")
+        self.block(node.block, block_buf, indent + 1, depth + 1)
+        self.emit(indent + 1, f"value = block_value({block_buf}, m{depth})")
+        self.emit(indent, "finally:")
+        self.emit(indent + 1, f"discard_block({block_buf}, m{depth})")
+        self.emit(indent, f"{self.bind('_n', node)}._assign(context, value)")
+
+
+def _compilable(node: Node, depth: int) -> bool:
+    """Return `True` if _node_ can be compiled inside _depth_ nested blocks."""
+    alternatives: List[ConditionalBlockNode] = []
+    if type(node) is IfNode or type(node) is UnlessNode:  # noqa: E721
+        alternatives = node.conditional_alternatives
+        blocks = [node.consequence, node.alternative]
+        cost = 2
+    elif type(node) is CaseNode:  # noqa: E721
+        alternatives = node.whens
+        blocks = [node.default]
+        cost = 2
+    elif type(node) is ForNode:  # noqa: E721
+        blocks = [node.block, node.default]
+        cost = 5
+    elif type(node) is CaptureNode:  # noqa: E721
+        blocks = [node.block]
+        cost = 2
+    else:
+        return type(node) is BreakNode or type(node) is ContinueNode  # noqa: E721
+
+    return (
+        depth + cost <= MAX_NESTED_BLOCKS
+        and all(type(alt) is ConditionalBlockNode for alt in alternatives)  # noqa: E721
+        and all(
+            block is None or type(block) is BlockNode  # noqa: E721
+            for block in [*blocks, *(alt.block for alt in alternatives)]
+        )
+    )
+
+
+def compile_tree(
+    env: Environment, tree: ParseTree, name: str = "<template>"
+) -> CompiledRender:
+    """Compile _tree_ to a Python function bound to the environment _env_."""
+    source, namespace = generate_source(tree)
+    namespace.update(
+        {
+            "env": env,
+            "BreakLoop": BreakLoop,
+            "ContinueLoop": ContinueLoop,
+            "Error": Error,
+            "ForLoop": ForLoop,
+            "LiquidInterrupt": LiquidInterrupt,
+            "StopRender": StopRender,
+            "interrupt": _interrupt,
+            "block_value": block_value,
+            "commit_block": commit_block,
+            "discard_block": discard_block,
+            "to_liquid_string": to_liquid_string,
+        }
+    )
+    code = compile(source, f"<liquid {name}>", "exec")
+    exec(code, namespace)  # noqa: S102
+    func: CompiledRender = namespace["render"]  # type: ignore
+    return func
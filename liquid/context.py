@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import asyncio
 import collections.abc
 import datetime
 import itertools
@@ -20,6 +21,8 @@ from typing import Any
 from typing import Awaitable
 from typing import Callable
 from typing import Dict
+from typing import Hashable
+from typing import Iterable
 from typing import Iterator
 from typing import List
 from typing import Mapping
@@ -27,6 +30,7 @@ from typing import MutableMapping
 from typing import Optional
 from typing import Sequence
 from typing import TextIO
+from typing import Tuple
 from typing import Union
 
 from liquid import Mode
@@ -44,15 +48,18 @@ from liquid.undefined import StrictDefaultUndefined
 from liquid.undefined import StrictUndefined
 from liquid.undefined import Undefined
 from liquid.undefined import is_undefined
+from liquid.utils import LRUCache
 
 if TYPE_CHECKING:
     from liquid import Environment
     from liquid.builtin.tags.for_tag import ForLoop
+    from liquid.expression import Filter
     from liquid.template import BoundTemplate
 
 # ruff: noqa: D102
 
 __all__ = (
+    "BoundFilter",
     "Context",
     "DebugUndefined",
     "get_item",
@@ -67,6 +74,8 @@ __all__ = (
 ContextPath = Union[str, Sequence[Union[str, int]]]
 Namespace = Mapping[str, object]
 
+_MISSING = object()
+
 
 class BuiltIn(Mapping[str, object]):
     """Mapping-like object for resolving built-in, dynamic objects."""
@@ -83,6 +92,14 @@ class BuiltIn(Mapping[str, object]):
             return datetime.date.today()
         raise KeyError(str(key))
 
+    def get(self, key: str, default: object = None) -> object:
+        """Return the value for _key_, or _default_ if _key_ is not a built-in."""
+        if key == "now":
+            return datetime.datetime.now()
+        if key == "today":
+            return datetime.date.today()
+        return default
+
     def __len__(self) -> int:
         return 2
 
@@ -91,6 +108,18 @@ class BuiltIn(Mapping[str, object]):
 
 
 builtin = BuiltIn()
+ReadOnlyChainMap.get_types.add(BuiltIn)
+
+
+def _is_memoizable(obj: object) -> bool:
+    """Return `True` if paths starting at _obj_ can be memoized for a render.
+
+    Objects that change state while a template is being rendered, like `forloop`,
+    set a class attribute `__liquid_volatile__ = True` to opt out.
+    """
+    return not isinstance(obj, Undefined) and not getattr(
+        type(obj), "__liquid_volatile__", False
+    )
 
 
 def _liquid_size(
@@ -171,6 +200,38 @@ async def _liquid_last_async(
         raise
 
 
+class BoundFilter:
+    """A filter function resolved from an environment's filter register.
+
+    Whether a filter wants the active render context or environment is decided
+    once, when it is bound, rather than every time the filter is called.
+
+    Args:
+        func: The registered filter function.
+    """
+
+    __slots__ = ("func", "filter_async", "with_context", "with_environment", "inject")
+
+    def __init__(self, func: Callable[..., object]):
+        self.func = func
+        self.filter_async: Optional[Callable[..., Awaitable[object]]] = getattr(
+            func, "filter_async", None
+        )
+        self.with_context = bool(getattr(func, "with_context", False))
+        self.with_environment = bool(getattr(func, "with_environment", False))
+        self.inject = self.with_context or self.with_environment
+
+    def injected(self, context: Context) -> Dict[str, object]:
+        """Return the render context and/or environment as keyword arguments."""
+        if self.with_context:
+            if self.with_environment:
+                return {"context": context, "environment": context.env}
+            return {"context": context}
+        if self.with_environment:
+            return {"environment": context.env}
+        return {}
+
+
 class Context:
     """A template render context.
 
@@ -185,12 +246,15 @@ class Context:
         "counters",
         "disabled_tags",
         "env",
+        "filter_cache",
         "globals",
         "local_namespace_size_carry",
         "locals",
         "loop_iteration_carry",
         "loops",
         "parent_context",
+        "path_cache",
+        "prefetched",
         "scope",
         "tag_namespace",
         "template",
@@ -240,6 +304,20 @@ class Context:
             "stopindex": {},
         }
 
+        # Results that filters can reuse for the rest of a render, like the `where`
+        # filter's index of a sequence. Shared with copies of this context. Least
+        # recently used results are discarded after `Environment.filter_cache_size`.
+        self.filter_cache = LRUCache(env.filter_cache_size)
+
+        # Resolved identifier paths, keyed by the id of the path's root object and
+        # the rest of the path. Only used if `Environment.memoize_paths` is `True`.
+        # Shared with copies of this context.
+        self.path_cache: Dict[Hashable, Tuple[object, object]] = {}
+
+        # Drop properties loaded in batches by `prefetch_async`, keyed by the id of
+        # the drop and the property name. Shared with copies of this context.
+        self.prefetched: Dict[Tuple[int, str], Tuple[object, object]] = {}
+
         # As stack of forloop objects. Used for populating forloop.parentloop.
         self.loops: List[ForLoop] = []
 
@@ -306,6 +384,8 @@ class Context:
 
         if items:
             try:
+                if self.env.memoize_paths and _is_memoizable(obj):
+                    return self._get_memoized(obj, items)
                 return reduce(self.getitem, items, obj)
             except (KeyError, IndexError, TypeError) as err:
                 if isinstance(err, KeyError):
@@ -334,9 +414,18 @@ class Context:
         obj = self._resolve(name, default)
 
         if items:
+            rest = items
+            if self.prefetched and type(items[0]) is str:  # noqa: E721
+                entry = self.prefetched.get((id(obj), items[0]))
+                if entry is not None and entry[0] is obj:
+                    obj = entry[1]
+                    rest = items[1:]
+
             _gi = self.getitem_async
             try:
-                for item in items:
+                if rest and self.env.memoize_paths and _is_memoizable(obj):
+                    return await self._get_memoized_async(obj, rest)
+                for item in rest:
                     obj = await _gi(obj, item)
             except (KeyError, IndexError, TypeError) as err:
                 if default == UNDEFINED:
@@ -347,6 +436,81 @@ class Context:
 
         return obj
 
+    def _get_memoized(self, obj: object, items: Sequence[Any]) -> object:
+        try:
+            key = (id(obj), tuple(items))
+            entry = self.path_cache.get(key)
+        except TypeError:
+            # An unhashable path element, like `a[b]` where `b` is an array.
+            return reduce(self.getitem, items, obj)
+
+        # The root object is stored with its result, so its id can't be reused by
+        # another object while the entry exists. A root name bound to a different
+        # object, by `assign` or a `for` loop, misses the cache.
+        if entry is not None and entry[0] is obj:
+            return entry[1]
+
+        value = reduce(self.getitem, items, obj)
+        self.path_cache[key] = (obj, value)
+        return value
+
+    async def _get_memoized_async(self, obj: object, items: Sequence[Any]) -> object:
+        try:
+            key = (id(obj), tuple(items))
+            entry = self.path_cache.get(key)
+        except TypeError:
+            entry = None
+            key = None
+
+        if entry is not None and entry[0] is obj:
+            return entry[1]
+
+        value = obj
+        for item in items:
+            value = await self.getitem_async(value, item)
+
+        if key is not None:
+            self.path_cache[key] = (obj, value)
+        return value
+
+    async def prefetch_async(
+        self, objs: Iterable[object], keys: Iterable[str]
+    ) -> None:
+        """Load properties _keys_ of drops in _objs_, a batch at a time.
+
+        Objects whose class defines an async class method `__getitems_async__` are
+        grouped by class, then `await cls.__getitems_async__(drops, key)` is called
+        once per group and key, concurrently. It must return a sequence of values,
+        one for each drop, in order, or raise a `KeyError` if _key_ can't be loaded
+        in a batch.
+
+        Loaded values are used by `get_async` in place of `__getitem_async__` for
+        the rest of the render. Other objects are ignored.
+        """
+        groups: Dict[type, List[object]] = {}
+        for obj in objs:
+            if hasattr(type(obj), "__getitems_async__"):
+                groups.setdefault(type(obj), []).append(obj)
+
+        if not groups:
+            return
+
+        async def _load(cls: Any, drops: List[object], key: str) -> None:
+            try:
+                values = await cls.__getitems_async__(drops, key)
+            except KeyError:
+                return
+            for obj, value in zip(drops, values):
+                self.prefetched[(id(obj), key)] = (obj, value)
+
+        await asyncio.gather(
+            *(
+                _load(cls, drops, key)
+                for key in keys
+                for cls, drops in groups.items()
+            )
+        )
+
     def resolve(self, name: str, default: object = UNDEFINED) -> Any:
         """Return the object/value at `name` in the current scope.
 
@@ -356,12 +520,12 @@ class Context:
         return self._resolve(name, default)
 
     def _resolve(self, name: str, default: object = UNDEFINED) -> Any:
-        try:
-            return self.scope[name]
-        except KeyError:
+        obj = self.scope.get(name, _MISSING)
+        if obj is _MISSING:
             if default == UNDEFINED:
                 return self.env.undefined(name)
             return default
+        return obj
 
     def filter(self, name: str) -> Callable[..., object]:  # noqa: A003
         """Return the filter function with given name."""
@@ -390,6 +554,27 @@ class Context:
 
         return filter_func
 
+    def bind_filter(self, _filter: Filter) -> BoundFilter:
+        """Return the bound filter function for filter expression _filter_.
+
+        The result is stored on _filter_ and reused for as long as the same
+        function is registered with the environment under the same name.
+
+        Raises:
+            NoSuchFilterFunc: If no filter is registered with the filter's name.
+        """
+        func = self.env.filters.get(_filter.name)
+        bound = _filter.bound
+        if bound is not None and bound.func is func:
+            return bound
+
+        if func is None:
+            raise NoSuchFilterFunc(f"unknown filter '{_filter.name}'")
+
+        bound = BoundFilter(func)
+        _filter.bound = bound
+        return bound
+
     def get_template(self, name: str) -> BoundTemplate:
         """Load a template from the environment."""
         return self.env.get_template(name)
@@ -552,6 +737,9 @@ class Context:
             )
 
         ctx.template = template or self.template
+        ctx.filter_cache = self.filter_cache
+        ctx.path_cache = self.path_cache
+        ctx.prefetched = self.prefetched
         return ctx
 
     def error(self, exc: Error) -> None:
@@ -569,7 +757,24 @@ class Context:
             return StringIO()
 
         carry = buf.size if isinstance(buf, LimitedStringIO) else 0
-        return LimitedStringIO(limit=self.env.output_stream_limit - carry)
+        return LimitedStringIO(
+            limit=self.env.output_stream_limit - carry,
+            unit=self.env.output_stream_limit_unit,
+        )
+
+    def get_block_buffer(self, buf: TextIO) -> Tuple[StringIO, int]:
+        """Return a buffer for the output of a block tag, and the block's start.
+
+        If _buf_ is a `StringIO`, the block is rendered directly to _buf_, starting
+        at its current position, so its output is not copied into each enclosing
+        block. Otherwise the block is rendered to a new buffer, starting at zero.
+
+        Use `liquid.output.commit_block()` or `liquid.output.discard_block()` when
+        the block has been rendered.
+        """
+        if isinstance(buf, StringIO):
+            return buf, buf.tell()
+        return self.get_buffer(buf), 0
 
     @classmethod
     def getitem(cls, obj: Any, key: Any) -> Any:
@@ -688,6 +893,10 @@ class VariableCaptureContext(Context):
         self.root_context.filters.append(name)
         return super().filter(name)
 
+    def bind_filter(self, _filter: Filter) -> BoundFilter:
+        self.root_context.filters.append(_filter.name)
+        return super().bind_filter(_filter)
+
     def _count_reference(self, path: ContextPath, result: object) -> None:
         if isinstance(path, str):
             ref = path
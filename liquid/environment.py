@@ -3,11 +3,13 @@ from __future__ import annotations
 
 import warnings
 from functools import lru_cache
+from functools import partial
 from typing import TYPE_CHECKING
 from typing import Any
 from typing import Callable
 from typing import ClassVar
 from typing import Dict
+from typing import FrozenSet
 from typing import Iterator
 from typing import Mapping
 from typing import MutableMapping
@@ -16,6 +18,8 @@ from typing import Tuple
 from typing import Type
 from typing import Union
 
+from typing_extensions import Literal
+
 from liquid import ast
 from liquid import builtin
 from liquid import loaders
@@ -32,12 +36,17 @@ from liquid.expressions import parse_conditional_expression
 from liquid.expressions import parse_conditional_expression_with_parens
 from liquid.expressions import parse_filtered_expression
 from liquid.expressions import parse_loop_expression
+from liquid.lex import _tokenize_template
 from liquid.lex import get_lexer
 from liquid.mode import Mode
+from liquid.optimizer import optimize
 from liquid.parse import get_parser
+from liquid.preload import preload
+from liquid.preload import preload_async
 from liquid.stream import TokenStream
 from liquid.template import BoundTemplate
 from liquid.utils import LRUCache
+from liquid.utils import SizedCache
 
 if TYPE_CHECKING:
     from pathlib import Path
@@ -46,6 +55,9 @@ if TYPE_CHECKING:
     from liquid.expression import BooleanExpression
     from liquid.expression import FilteredExpression
     from liquid.expression import LoopExpression
+    from liquid.expressions.lexed import LexedExpression
+    from liquid.preload import PreloadReport
+    from liquid.render_cache import RenderCache
     from liquid.tag import Tag
     from liquid.token import Token
 
@@ -109,9 +121,56 @@ class Environment:
         output_stream_limit: Class attribute. The maximum number of bytes that can be
             written to a template's output stream, per render, before an
             `OutputStreamLimitError` exception is raised.
+        output_stream_limit_unit: Class attribute. One of "bytes" or "characters".
+            The unit of `output_stream_limit`. Defaults to "bytes", where output is
+            measured by its UTF-8 encoded length.
         render_whitespace_only_blocks: Class attribute. Indicates if block tags that,
             when rendered, contain whitespace only should be output. Defaults to
             `False`, meaning empty blocks are suppressed.
+        compile_templates: Class attribute. If `True`, templates are compiled to a
+            Python function, once, on first render. See `liquid.compiler`. Async
+            rendering is not affected. Defaults to `False`.
+        cache_max_bytes: Class attribute. If not `None`, the template cache is also
+            bounded by the estimated size of cached templates, in bytes, evicting
+            templates according to `cache_policy`. See `liquid.utils.SizedCache`.
+        cache_policy: Class attribute. The eviction policy used when `cache_max_bytes`
+            is set. One of "lru" or "lfu". Defaults to "lru".
+        render_cache: An optional `liquid.render_cache.RenderCache`, used to reuse the
+            output of partial templates rendered with the built-in `render` tag.
+            Defaults to `None`, meaning partial templates are always rendered.
+        optimize_templates: Class attribute. If `True`, parse trees are simplified
+            before they are rendered. See `liquid.optimizer`. Defaults to `False`.
+        frozen_globals: Class attribute. Names of environment `globals` that never
+            change, whose values can be used to remove unreachable `if`, `unless` and
+            `case` branches when `optimize_templates` is `True`. Frozen globals must
+            never be overridden by template globals or render arguments.
+        memoize_paths: Class attribute. If `True`, the result of resolving a
+            variable path, like `product.variants.first.price`, is reused for the
+            rest of a render whenever the same path is resolved from the same root
+            object. Useful for drops with expensive properties. Objects that change
+            during a render should set `__liquid_volatile__ = True` on their class.
+            Defaults to `False`.
+        filter_cache_size: Class attribute. The maximum number of results, like
+            the `where` filter's index of an array, that filters keep for reuse
+            during a render. See `Context.filter_cache`. Set to `0` to disable.
+            Defaults to `100`.
+        async_batch_size: Class attribute. The number of items a `for` loop reads
+            ahead when rendering asynchronously, so properties of drops that
+            support batch loading can be loaded for all of those items at once. See
+            `Context.prefetch_async`. Defaults to `0`, meaning batch loading is
+            disabled and each item's properties are loaded one at a time.
+        render_concurrency: Class attribute. If greater than zero, consecutive
+            `render` tags are rendered concurrently when rendering asynchronously,
+            with at most this many partial templates rendering at the same time per
+            group of tags. Output is written in template order. Defaults to `0`,
+            meaning partial templates are rendered one after another.
+        lex_expressions: Class attribute. If `True`, the template lexer tokenizes
+            the expressions of output statements and `if`, `elsif`, `unless`, `for`
+            and `tablerow` tags as it finds them, and those tags parse the resulting
+            tokens instead of lexing their expression again. See
+            `liquid.expressions.lexed`. Ignored if `expression_cache_size` is
+            greater than zero or `tokenizer` has been overridden. Defaults to
+            `False`.
         undefined: The undefined type. When an identifier can not be resolved, an
             instance of `undefined` is returned.
         strict_filters: Indicates if an undefined filter should raise an exception or be
@@ -146,6 +205,10 @@ class Environment:
     # raising an OutputStreamLimitError.
     output_stream_limit: ClassVar[Optional[int]] = None
 
+    # Whether `output_stream_limit` is a number of bytes or a number of characters.
+    # Counting characters avoids encoding non-ASCII output to measure it.
+    output_stream_limit_unit: ClassVar[Literal["bytes", "characters"]] = "bytes"
+
     # Instances of `template_class` are returned from `from_string`,
     # `get_template` and `get_template_async`. It should be the `BoundTemplate`
     # class or a subclass of it.
@@ -154,6 +217,41 @@ class Environment:
     # Whether to output blocks that only contain only whitespace when rendered.
     render_whitespace_only_blocks: bool = False
 
+    # Whether to compile parse trees to Python functions before rendering them.
+    compile_templates: bool = False
+
+    # The maximum estimated size of all templates in the template cache, in bytes.
+    cache_max_bytes: Optional[int] = None
+
+    # How to choose templates to evict from a template cache bounded by size.
+    cache_policy: Literal["lru", "lfu"] = "lru"
+
+    # A cache of rendered partial templates, keyed by the values of their inputs.
+    render_cache: Optional[RenderCache] = None
+
+    # Whether to simplify parse trees after parsing.
+    optimize_templates: bool = False
+
+    # Names of environment globals that can be treated as constant by the optimizer.
+    frozen_globals: FrozenSet[str] = frozenset()
+
+    # Whether to reuse resolved variable paths for the rest of a render.
+    memoize_paths: bool = False
+
+    # The maximum number of results filters can reuse during a render.
+    filter_cache_size: int = 100
+
+    # How many `for` loop items to batch load drop properties for, when rendering
+    # asynchronously. Zero disables batch loading.
+    async_batch_size: int = 0
+
+    # How many consecutive partial templates to render concurrently, when rendering
+    # asynchronously.
+    render_concurrency: int = 0
+
+    # Whether the template lexer tokenizes expressions for built-in tags.
+    lex_expressions: bool = False
+
     def __init__(
         self,
         tag_start_string: str = r"{%",
@@ -220,7 +318,13 @@ class Environment:
 
         # Template cache
         if cache_size and cache_size > 0 and not self.loader.caching_loader:
-            self.cache: Optional[MutableMapping[Any, Any]] = LRUCache(cache_size)
+            self.cache: Optional[MutableMapping[Any, Any]] = (
+                SizedCache(
+                    self.cache_max_bytes, capacity=cache_size, policy=self.cache_policy
+                )
+                if self.cache_max_bytes
+                else LRUCache(cache_size)
+            )
             self.auto_reload: bool = auto_reload
         else:
             self.cache = None
@@ -300,8 +404,23 @@ class Environment:
         More often than not you'll want to use `Environment.from_string` instead.
         """
         parser = get_parser(self)
-        token_iter = self.tokenizer()(source)
-        return parser.parse(TokenStream(token_iter))
+        tokenize = self.tokenizer()
+        if (
+            self.lex_expressions
+            and not self.expression_cache_size
+            and isinstance(tokenize, partial)
+            and tokenize.func is _tokenize_template
+        ):
+            expressions: Dict[Tuple[str, str], LexedExpression] = {}
+            stream = TokenStream(
+                tokenize(source, expressions=expressions), expressions=expressions
+            )
+        else:
+            stream = TokenStream(tokenize(source))
+        tree = parser.parse(stream)
+        if self.optimize_templates:
+            return optimize(self, tree)
+        return tree
 
     def from_string(
         self,
@@ -389,6 +508,51 @@ class Environment:
             self.cache[name] = template
         return template
 
+    def preload(
+        self, pattern: str = "*", *, workers: Optional[int] = None
+    ) -> PreloadReport:
+        """Load and parse templates ahead of time, populating the template cache.
+
+        Every template listed by the loader's `list_templates()` method with a name
+        matching the `fnmatch` style _pattern_ is loaded using `get_template`,
+        using a pool of threads. Loaders that can't list their templates, including
+        any of the loaders used by a `ChoiceLoader`, are skipped.
+
+        Partial templates named with a string literal in `render`, `include` and
+        `extends` tags are loaded too, even if they don't match _pattern_. Like
+        those tags, partial templates are loaded with `get_template_with_context`,
+        and each `render` and `include` tag is given the templates it would reuse
+        between renders. Partial templates are not followed if the loader is
+        context aware.
+
+        Templates are cached by the environment's template cache or by a caching
+        loader, like `CachingFileSystemLoader`. If neither is in use, preloading
+        only reports errors.
+
+        Args:
+            pattern: A glob-style pattern that template names must match. Note that
+                `*` matches `/` too.
+            workers: The maximum number of threads to load templates with. Defaults
+                to the `concurrent.futures.ThreadPoolExecutor` default.
+
+        Returns:
+            A `liquid.preload.PreloadReport` with load times for each template and
+            any exceptions raised while loading or parsing templates.
+        """
+        return preload(self, pattern, workers=workers)
+
+    async def preload_async(
+        self, pattern: str = "*", *, workers: Optional[int] = None
+    ) -> PreloadReport:
+        """An async version of `preload`.
+
+        Args:
+            pattern: A glob-style pattern that template names must match.
+            workers: The maximum number of templates to load concurrently. If
+                `None`, there is no limit.
+        """
+        return await preload_async(self, pattern, workers=workers)
+
     def get_template_with_args(
         self,
         name: str,
@@ -22,6 +22,7 @@ from typing import TypeVar
 from typing import Union
 
 from liquid import Markup
+from liquid.context import BoundFilter
 from liquid.context import Context
 from liquid.context import FutureContext
 from liquid.exceptions import Error
@@ -467,7 +468,7 @@ class InfixExpression(Expression):
 
 
 class Filter:
-    __slots__ = ("name", "args", "kwargs")
+    __slots__ = ("name", "args", "kwargs", "bound")
 
     def __init__(
         self,
@@ -479,6 +480,20 @@ class Filter:
         self.args = args
         self.kwargs = kwargs or {}
 
+        # The filter function this filter was last resolved to. See
+        # `Context.bind_filter`.
+        self.bound: Optional[BoundFilter] = None
+
+    def __getstate__(self) -> Tuple[str, List[Expression], Mapping[str, Expression]]:
+        # Bound filter functions are not pickled. They are resolved again on demand.
+        return (self.name, self.args, self.kwargs)
+
+    def __setstate__(
+        self, state: Tuple[str, List[Expression], Mapping[str, Expression]]
+    ) -> None:
+        self.name, self.args, self.kwargs = state
+        self.bound = None
+
     def __eq__(self, other: object) -> bool:
         return (
             isinstance(other, Filter)
@@ -593,7 +608,7 @@ class FilteredExpression(Expression):
         rv = left
         for _filter in filters:
             try:
-                func = context.filter(_filter.name)
+                bound = context.bind_filter(_filter)
             except NoSuchFilterFunc:
                 if context.env.strict_filters:
                     raise
@@ -602,12 +617,18 @@ class FilteredExpression(Expression):
             # Any exception causes us to abort the filter chain and discard the result.
             # Nothing will be rendered.
             try:
-                if not _filter.args and not _filter.kwargs:
-                    rv = func(rv)
+                if bound.inject:
+                    args = _filter.evaluate_args(context) if _filter.args else ()
+                    kwargs = bound.injected(context)
+                    if _filter.kwargs:
+                        kwargs.update(_filter.evaluate_kwargs(context))
+                    rv = bound.func(rv, *args, **kwargs)
+                elif not _filter.args and not _filter.kwargs:
+                    rv = bound.func(rv)
                 elif _filter.args and not _filter.kwargs:
-                    rv = func(rv, *_filter.evaluate_args(context))
+                    rv = bound.func(rv, *_filter.evaluate_args(context))
                 else:
-                    rv = func(
+                    rv = bound.func(
                         rv,
                         *_filter.evaluate_args(context),
                         **_filter.evaluate_kwargs(context),
@@ -634,7 +655,7 @@ class FilteredExpression(Expression):
         rv = left
         for _filter in filters:
             try:
-                func = context.filter(_filter.name)
+                bound = context.bind_filter(_filter)
             except NoSuchFilterFunc:
                 if context.env.strict_filters:
                     raise
@@ -643,12 +664,14 @@ class FilteredExpression(Expression):
             # Any exception causes us to abort the filter chain and discard the result.
             # Nothing will be rendered.
             try:
-                if hasattr(func, "filter_async"):
+                if bound.filter_async is not None:
                     rv = await self._await_filter_async(
-                        rv, _filter, func.filter_async, context
+                        rv, _filter, bound.filter_async, context, bound
                     )
                 else:
-                    rv = await self._call_filter_async(rv, _filter, func, context)
+                    rv = await self._call_filter_async(
+                        rv, _filter, bound.func, context, bound
+                    )
             except FilterValueError:
                 # Pass over filtered expressions who's left value is not allowed.
                 continue
@@ -667,8 +690,14 @@ class FilteredExpression(Expression):
         _filter: Filter,
         func: Callable[..., object],
         context: Context,
+        bound: Optional[BoundFilter] = None,
     ) -> object:
         """Call a filter with async evaluated arguments."""
+        if bound and bound.inject:
+            args = await _filter.evaluate_args_async(context)
+            kwargs = bound.injected(context)
+            kwargs.update(await _filter.evaluate_kwargs_async(context))
+            return func(left, *args, **kwargs)
         if not _filter.args and not _filter.kwargs:
             return func(left)
         if _filter.args and not _filter.kwargs:
@@ -683,10 +712,16 @@ class FilteredExpression(Expression):
         self,
         left: object,
         _filter: Filter,
-        func: Callable[[object], Awaitable[object]],
+        func: Callable[..., Awaitable[object]],
         context: Context,
+        bound: Optional[BoundFilter] = None,
     ) -> object:
         """Await an async filter."""
+        if bound and bound.inject:
+            args = await _filter.evaluate_args_async(context)
+            kwargs = bound.injected(context)
+            kwargs.update(await _filter.evaluate_kwargs_async(context))
+            return await func(left, *args, **kwargs)
         if not _filter.args and not _filter.kwargs:
             return await func(left)
         if _filter.args and not _filter.kwargs:
@@ -1,5 +1,6 @@
 """Tokenize boolean liquid expressions."""
 import re
+from typing import FrozenSet
 from typing import Iterator
 
 from liquid.exceptions import LiquidSyntaxError
@@ -62,7 +63,7 @@ token_rules = (
 
 # Keywords for the standard boolean expression.
 # Excludes `not`.
-keywords = frozenset(
+keywords: FrozenSet[str] = frozenset(
     [
         TOKEN_TRUE,
         TOKEN_FALSE,
@@ -1,6 +1,7 @@
 """Functions for parsing boolean expressions."""
 from typing import Callable
 from typing import Dict
+from typing import Iterator
 
 from liquid.exceptions import LiquidSyntaxError
 from liquid.expression import BooleanExpression
@@ -9,6 +10,7 @@ from liquid.expression import InfixExpression
 from liquid.expression import PrefixExpression
 from liquid.expressions.boolean.lex import tokenize
 from liquid.expressions.boolean.lex import tokenize_with_parens
+from liquid.expressions.common import Token
 from liquid.expressions.common import make_parse_range
 from liquid.expressions.common import parse_blank
 from liquid.expressions.common import parse_boolean
@@ -188,9 +190,14 @@ parse_range = make_parse_range(parse_simple_obj)
 TOKEN_MAP[TOKEN_LPAREN] = parse_range
 
 
+def parse_from_tokens(tokens: Iterator[Token]) -> BooleanExpression:
+    """Parse a "standard" boolean expression from a token iterator."""
+    return BooleanExpression(parse_obj(TokenStream(tokens)))
+
+
 def parse(expr: str, linenum: int = 1) -> BooleanExpression:
     """Parse a string as a "standard" boolean expression."""
-    return BooleanExpression(parse_obj(TokenStream(tokenize(expr, linenum))))
+    return parse_from_tokens(tokenize(expr, linenum))
 
 
 def parse_grouped_expression(stream: TokenStream) -> Expression:
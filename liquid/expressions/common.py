@@ -71,17 +71,19 @@ IDENTIFIER_PATTERN = r"\w[\w\-]*\??"
 ASSIGN_IDENTIFIER_PATTERN = r"\w[\w\-]*"
 
 # ["ident"] or ['ident']
-IDENTSTRING_PATTERN = (
+IDENTSTRING_PATTERN: str = (
     rf"\[\s*(?P<{GROUP_IDENTQUOTE}>[\"'])"
     rf"(?P<{GROUP_IDENTQUOTED}>.*?)"
     rf"(?P={GROUP_IDENTQUOTE})\s*]"
 )
 
 # [0] or [-1]
-IDENTINDEX_PATTERN = rf"\[\s*(?P<{GROUP_IDENTINDEX}>\-?\d+)\s*]"
+IDENTINDEX_PATTERN: str = rf"\[\s*(?P<{GROUP_IDENTINDEX}>\-?\d+)\s*]"
 
 # 'something' or "something"
-STRING_PATTERN = rf"(?P<{GROUP_QUOTE}>[\"'])(?P<{GROUP_QUOTED}>.*?)(?P={GROUP_QUOTE})"
+STRING_PATTERN: str = (
+    rf"(?P<{GROUP_QUOTE}>[\"'])(?P<{GROUP_QUOTED}>.*?)(?P={GROUP_QUOTE})"
+)
 
 # (position, type, value)
 Token = Tuple[int, str, str]
@@ -4,6 +4,7 @@ Filtered expressions are those found in the output statement, the
 `assign` tag and the `echo` tag.
 """
 import re
+from typing import FrozenSet
 from typing import Iterator
 
 from liquid.exceptions import LiquidSyntaxError
@@ -61,7 +62,7 @@ token_rules = (
     (TOKEN_ILLEGAL, r"."),
 )
 
-keywords = frozenset(
+keywords: FrozenSet[str] = frozenset(
     [
         TOKEN_TRUE,
         TOKEN_FALSE,
@@ -86,24 +87,27 @@ def tokenize(source: str, linenum: int = 1) -> Iterator[Token]:
         assert kind is not None
 
         value = match.group()
-        newlines = value.count("\n")
 
-        if kind == TOKEN_IDENTIFIER and value in _keywords:
-            kind = value
+        if kind == TOKEN_SKIP:
+            continue
+        if kind == TOKEN_IDENTIFIER:
+            if value in _keywords:
+                kind = value
         elif kind == TOKEN_IDENTINDEX:
+            # Only bracketed and quoted tokens can span multiple lines.
+            linenum += value.count("\n")
             value = match.group(GROUP_IDENTINDEX)
         elif kind == TOKEN_IDENTSTRING:
+            linenum += value.count("\n")
             kind = TOKEN_IDENTIFIER
             value = match.group(GROUP_IDENTQUOTED)
         elif kind == TOKEN_STRING:
+            linenum += value.count("\n")
             value = match.group(GROUP_QUOTED)
         elif kind == TOKEN_NEWLINE:
             linenum += 1
             continue
-        elif kind == TOKEN_SKIP:
-            continue
         elif kind == TOKEN_ILLEGAL:
             raise LiquidSyntaxError(f"unexpected {value!r}", linenum=linenum)
 
-        linenum += newlines
         yield (linenum, kind, value)
@@ -0,0 +1,226 @@
+"""Expression tokens produced by the template lexer.
+
+When `Environment.lex_expressions` is `True`, the template lexer tokenizes the
+expressions of output statements and some built-in tags as it finds them, with one
+set of rules for every kind of expression. Those expressions are not lexed again by
+their tags. Instead, tags ask the template's token stream for tokens lexed from their
+expression.
+
+Lexing an expression does not raise syntax errors. Tokens up to the first syntax
+error are kept, along with the error, which is raised when a parser reaches it. That
+is the same error, at the same point, as would be raised by lexing the expression
+string with that kind of expression's lexer.
+"""
+import re
+from typing import AbstractSet
+from typing import Dict
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+from liquid.exceptions import LiquidSyntaxError
+from liquid.expression import BooleanExpression
+from liquid.expression import FilteredExpression
+from liquid.expression import LoopExpression
+from liquid.expressions.boolean.lex import keywords as boolean_keywords
+from liquid.expressions.boolean.parse import (
+    parse_from_tokens as parse_boolean_from_tokens,
+)
+from liquid.expressions.common import GROUP_IDENTINDEX
+from liquid.expressions.common import GROUP_IDENTQUOTED
+from liquid.expressions.common import GROUP_QUOTED
+from liquid.expressions.common import IDENTIFIER_PATTERN
+from liquid.expressions.common import IDENTINDEX_PATTERN
+from liquid.expressions.common import IDENTSTRING_PATTERN
+from liquid.expressions.common import STRING_PATTERN
+from liquid.expressions.common import Token
+from liquid.expressions.filtered.lex import keywords as filtered_keywords
+from liquid.expressions.filtered.parse import (
+    parse_from_tokens as parse_filtered_from_tokens,
+)
+from liquid.expressions.loop.lex import keywords as loop_keywords
+from liquid.expressions.loop.parse import parse_from_tokens as parse_loop_from_tokens
+from liquid.token import TOKEN_COLON
+from liquid.token import TOKEN_COMMA
+from liquid.token import TOKEN_DOT
+from liquid.token import TOKEN_DPIPE
+from liquid.token import TOKEN_FLOAT
+from liquid.token import TOKEN_IDENTIFIER
+from liquid.token import TOKEN_IDENTINDEX
+from liquid.token import TOKEN_IDENTSTRING
+from liquid.token import TOKEN_ILLEGAL
+from liquid.token import TOKEN_INTEGER
+from liquid.token import TOKEN_LBRACKET
+from liquid.token import TOKEN_LPAREN
+from liquid.token import TOKEN_NEWLINE
+from liquid.token import TOKEN_PIPE
+from liquid.token import TOKEN_RANGE
+from liquid.token import TOKEN_RBRACKET
+from liquid.token import TOKEN_RPAREN
+from liquid.token import TOKEN_SKIP
+from liquid.token import TOKEN_STRING
+from liquid.token import operators
+
+__all__ = (
+    "EXPRESSION_BOOLEAN",
+    "EXPRESSION_FILTERED",
+    "EXPRESSION_LOOP",
+    "LexedExpression",
+    "lex_expression",
+    "parse_boolean_expression",
+    "parse_filtered_expression",
+    "parse_loop_expression",
+    "tokenize",
+)
+
+# Kinds of expression that can be lexed by the template lexer.
+EXPRESSION_FILTERED = "filtered"
+EXPRESSION_BOOLEAN = "boolean"
+EXPRESSION_LOOP = "loop"
+
+# Tokens and a syntax error message and line number, if the expression is invalid.
+LexedExpression = Tuple[List[Token], Optional[Tuple[str, int]]]
+
+TOKEN_OP = "OP"
+
+# The rules shared by every built-in expression lexer, followed by punctuation used
+# by at least one of them. Where two rules match at the same position, the result is
+# the same as for each expression's own rules.
+token_rules = (
+    (TOKEN_IDENTINDEX, IDENTINDEX_PATTERN),
+    (TOKEN_IDENTSTRING, IDENTSTRING_PATTERN),
+    (TOKEN_STRING, STRING_PATTERN),
+    (TOKEN_RANGE, r"\.\."),
+    (TOKEN_FLOAT, r"-?\d+\.(?!\.)\d*"),
+    (TOKEN_INTEGER, r"-?\d+\b"),
+    (TOKEN_DOT, r"\."),
+    (TOKEN_IDENTIFIER, IDENTIFIER_PATTERN),
+    (TOKEN_LPAREN, r"\("),
+    (TOKEN_RPAREN, r"\)"),
+    (TOKEN_LBRACKET, r"\["),
+    (TOKEN_RBRACKET, r"]"),
+    (TOKEN_COMMA, r","),
+    (TOKEN_COLON, r":"),
+    (TOKEN_DPIPE, r"\|\|"),
+    (TOKEN_PIPE, r"\|"),
+    (TOKEN_OP, r"[!=<>]{1,2}"),
+    (TOKEN_NEWLINE, r"\n"),
+    (TOKEN_SKIP, r"[ \t\r]+"),
+    (TOKEN_ILLEGAL, r"."),
+)
+
+EXPRESSION_RE = re.compile(
+    "|".join(f"(?P<{name}>{pattern})" for name, pattern in token_rules),
+    re.DOTALL,
+)
+
+# Token kinds that some expression lexers don't have a rule for.
+_PUNCTUATION = frozenset(
+    [TOKEN_COMMA, TOKEN_COLON, TOKEN_DPIPE, TOKEN_PIPE, TOKEN_OP, TOKEN_ILLEGAL]
+)
+
+# Keywords and the punctuation allowed in each kind of expression.
+_EXPRESSIONS: Dict[str, Tuple[AbstractSet[str], AbstractSet[str]]] = {
+    EXPRESSION_FILTERED: (
+        filtered_keywords,
+        frozenset([TOKEN_COMMA, TOKEN_COLON, TOKEN_PIPE]),
+    ),
+    EXPRESSION_BOOLEAN: (boolean_keywords, frozenset([TOKEN_OP])),
+    EXPRESSION_LOOP: (
+        loop_keywords,
+        frozenset([TOKEN_COLON, TOKEN_COMMA, TOKEN_PIPE]),
+    ),
+}
+
+
+def lex_expression(  # noqa: PLR0912
+    source: str, start: int, end: int, kind: str
+) -> LexedExpression:
+    """Tokenize the expression from _start_ to _end_ in _source_.
+
+    Args:
+        source: Template source text.
+        start: The index of the start of the expression in _source_.
+        end: The index of the end of the expression in _source_.
+        kind: One of `EXPRESSION_FILTERED`, `EXPRESSION_BOOLEAN` or
+            `EXPRESSION_LOOP`.
+    """
+    keywords, punctuation = _EXPRESSIONS[kind]
+    tokens: List[Token] = []
+    linenum = 1
+
+    for match in EXPRESSION_RE.finditer(source, start, end):
+        token_kind = match.lastgroup
+        assert token_kind is not None
+
+        if token_kind == TOKEN_SKIP:
+            continue
+        if token_kind == TOKEN_NEWLINE:
+            linenum += 1
+            continue
+
+        value = match.group()
+        if token_kind == TOKEN_IDENTIFIER:
+            if value in keywords:
+                token_kind = value
+        elif token_kind == TOKEN_IDENTINDEX:
+            # Only bracketed and quoted tokens can span multiple lines.
+            linenum += value.count("\n")
+            value = match.group(GROUP_IDENTINDEX)
+        elif token_kind == TOKEN_IDENTSTRING:
+            linenum += value.count("\n")
+            token_kind = TOKEN_IDENTIFIER
+            value = match.group(GROUP_IDENTQUOTED)
+        elif token_kind == TOKEN_STRING:
+            linenum += value.count("\n")
+            value = match.group(GROUP_QUOTED)
+        elif token_kind in _PUNCTUATION and token_kind not in punctuation:
+            if token_kind != TOKEN_DPIPE or TOKEN_PIPE not in punctuation:
+                # Each of these characters is illegal on its own.
+                return tokens, (f"unexpected {value[0]!r}", linenum)
+            tokens.append((linenum, TOKEN_PIPE, "|"))
+            token_kind = TOKEN_PIPE
+            value = "|"
+        elif token_kind == TOKEN_OP:
+            if value not in operators:
+                return tokens, (f"unknown operator {value!r}", linenum)
+            token_kind = operators[value]
+
+        tokens.append((linenum, token_kind, value))
+
+    return tokens, None
+
+
+def tokenize(expression: LexedExpression) -> Iterator[Token]:
+    """Return an iterator of tokens from a lexed expression.
+
+    If the expression is invalid, a `LiquidSyntaxError` is raised after its last
+    valid token.
+    """
+    tokens, error = expression
+    if error is None:
+        return iter(tokens)
+    return _tokenize_invalid(tokens, *error)
+
+
+def _tokenize_invalid(
+    tokens: List[Token], message: str, linenum: int
+) -> Iterator[Token]:
+    yield from tokens
+    raise LiquidSyntaxError(message, linenum=linenum)
+
+
+def parse_filtered_expression(expression: LexedExpression) -> FilteredExpression:
+    """Parse a filtered expression from a lexed expression."""
+    return parse_filtered_from_tokens(tokenize(expression))
+
+
+def parse_boolean_expression(expression: LexedExpression) -> BooleanExpression:
+    """Parse a "standard" boolean expression from a lexed expression."""
+    return parse_boolean_from_tokens(tokenize(expression))
+
+
+def parse_loop_expression(expression: LexedExpression) -> LoopExpression:
+    """Parse a loop expression from a lexed expression."""
+    return parse_loop_from_tokens(tokenize(expression))
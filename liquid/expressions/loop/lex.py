@@ -1,5 +1,6 @@
 """Tokenize liquid loop expressions."""
 import re
+from typing import FrozenSet
 from typing import Iterator
 
 from liquid.exceptions import LiquidSyntaxError
@@ -57,7 +58,7 @@ token_rules = (
     (TOKEN_ILLEGAL, r"."),
 )
 
-keywords = frozenset(
+keywords: FrozenSet[str] = frozenset(
     [
         TOKEN_IN,
         TOKEN_OFFSET,
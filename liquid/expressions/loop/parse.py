@@ -4,6 +4,7 @@ Like those found in `for` and `tablerow` tags.
 """
 from typing import Callable
 from typing import Dict
+from typing import Iterator
 from typing import Tuple
 
 from liquid.exceptions import LiquidSyntaxError
@@ -13,6 +14,7 @@ from liquid.expression import IntegerLiteral
 from liquid.expression import LoopArgument
 from liquid.expression import LoopExpression
 from liquid.expression import LoopIterable
+from liquid.expressions.common import Token
 from liquid.expressions.common import make_parse_range
 from liquid.expressions.common import parse_float_literal
 from liquid.expressions.common import parse_identifier
@@ -109,9 +111,9 @@ def parse_loop_arguments(stream: TokenStream) -> Tuple[Dict[str, LoopArgument],
     return arguments, _reversed
 
 
-def parse(expr: str, linenum: int = 1) -> LoopExpression:
-    """Parse a loop expression string."""
-    stream = TokenStream(tokenize(expr, linenum))
+def parse_from_tokens(tokens: Iterator[Token]) -> LoopExpression:
+    """Parse a loop expression from a token iterator."""
+    stream = TokenStream(tokens)
     stream.expect(TOKEN_IDENTIFIER)
     name = next(stream)[2]
 
@@ -133,3 +135,8 @@ def parse(expr: str, linenum: int = 1) -> LoopExpression:
 
     args, reversed_ = parse_loop_arguments(stream)
     return LoopExpression(name=name, iterable=expression, reversed_=reversed_, **args)
+
+
+def parse(expr: str, linenum: int = 1) -> LoopExpression:
+    """Parse a loop expression string."""
+    return parse_from_tokens(tokenize(expr, linenum))
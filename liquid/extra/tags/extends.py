@@ -5,6 +5,7 @@ import sys
 from collections import defaultdict
 from dataclasses import dataclass
 from typing import TYPE_CHECKING
+from typing import Any
 from typing import DefaultDict
 from typing import Iterator
 from typing import List
@@ -19,6 +20,8 @@ from liquid import Markup
 from liquid.ast import BlockNode as TemplateBlockNode
 from liquid.ast import ChildNode
 from liquid.ast import Node
+from liquid.ast import ParseTree
+from liquid.builtin.tags.include_tag import PartialCache
 from liquid.exceptions import LiquidEnvironmentError
 from liquid.exceptions import LiquidSyntaxError
 from liquid.exceptions import RequiredBlockError
@@ -42,6 +45,7 @@ if TYPE_CHECKING:
     from liquid import BoundTemplate
     from liquid import Environment
     from liquid.context import Context
+    from liquid.loaders import BaseLoader
     from liquid.stream import TokenStream
 
 # ruff: noqa: D102
@@ -54,6 +58,10 @@ TAG_ENDBLOCK = sys.intern("endblock")
 class BlockDrop(Mapping[str, object]):
     """A `block` object with a `super` property."""
 
+    # `block.super` is rendered with the current context, so its output can change.
+    # See `Environment.memoize_paths`.
+    __liquid_volatile__ = True
+
     __slots__ = ("buffer", "context", "name", "parent")
 
     def __init__(
@@ -200,12 +208,13 @@ class BlockNode(Node):
 class ExtendsNode(Node):
     """The extra "Extends" node."""
 
-    __slots__ = ("tok", "name")
+    __slots__ = ("tok", "name", "block_stacks")
     tag = TAG_EXTENDS
 
     def __init__(self, tok: Token, name: StringLiteral) -> None:
         self.tok = tok
         self.name = name
+        self.block_stacks = BlockStackCache()
 
     def render_to_output(self, context: Context, buffer: TextIO) -> Optional[bool]:
         if not context.template:
@@ -215,7 +224,7 @@ class ExtendsNode(Node):
                 linenum=self.tok.linenum,
             )
 
-        base_template = build_block_stacks(
+        base_template = self.block_stacks.build(
             context,
             context.template,
             self.name.evaluate(context),
@@ -236,7 +245,7 @@ class ExtendsNode(Node):
                 linenum=self.tok.linenum,
             )
 
-        base_template = await build_block_stacks_async(
+        base_template = await self.block_stacks.build_async(
             context,
             context.template,
             self.name.evaluate(context),
@@ -258,6 +267,148 @@ class ExtendsNode(Node):
         ]
 
 
+_BlockStacks = DefaultDict[str, List[_BlockStackItem]]
+
+
+class BlockStackCache:
+    """Block stacks built by one `extends` tag, reused across renders.
+
+    Building block stacks loads every template in the inheritance chain and
+    searches each of them for `block` tags. When templates can be reused, as
+    described by `PartialCache`, the resulting stacks are kept, along with the
+    templates they came from, and copied into the render context on subsequent
+    renders. With `auto_reload` enabled, the chain is built again if any of its
+    templates are not up to date.
+    """
+
+    __slots__ = ("entry",)
+
+    def __init__(self) -> None:
+        # (loader, leaf template name, leaf parse tree, ancestors, block stacks)
+        self.entry: Optional[
+            Tuple[BaseLoader, str, ParseTree, List[BoundTemplate], _BlockStacks]
+        ] = None
+
+    def __reduce__(self) -> Tuple[type, Tuple[Any, ...]]:
+        # Cached templates are not pickled with the parse tree.
+        return (self.__class__, ())
+
+    def build(
+        self,
+        context: Context,
+        template: BoundTemplate,
+        parent_name: str,
+        tag: str = TAG_EXTENDS,
+    ) -> BoundTemplate:
+        """Build block stacks in _context_ and return the base template.
+
+        See `build_block_stacks`.
+        """
+        if not self._enabled(context):
+            return build_block_stacks(context, template, parent_name, tag)
+
+        ancestors = self._get(context, template)
+        if ancestors is not None and (
+            not PartialCache.validate(context)
+            or all(ancestor.is_up_to_date for ancestor in ancestors)
+        ):
+            return self._restore(context)
+
+        ancestors = []
+        base_template = build_block_stacks(
+            context, template, parent_name, tag, ancestors=ancestors
+        )
+        self._set(context, template, ancestors)
+        return base_template
+
+    async def build_async(
+        self,
+        context: Context,
+        template: BoundTemplate,
+        parent_name: str,
+        tag: str = TAG_EXTENDS,
+    ) -> BoundTemplate:
+        """An async version of `build`."""
+        if not self._enabled(context):
+            return await build_block_stacks_async(context, template, parent_name, tag)
+
+        ancestors = self._get(context, template)
+        if ancestors is not None and (
+            not PartialCache.validate(context)
+            or all([await ancestor.is_up_to_date_async() for ancestor in ancestors])
+        ):
+            return self._restore(context)
+
+        ancestors = []
+        base_template = await build_block_stacks_async(
+            context, template, parent_name, tag, ancestors=ancestors
+        )
+        self._set(context, template, ancestors)
+        return base_template
+
+    @staticmethod
+    def _enabled(context: Context) -> bool:
+        # Block stacks from an enclosing `extends` tag, rendering an `include` of a
+        # template that extends another, are extended rather than replaced.
+        return not context.tag_namespace.get("extends") and PartialCache.enabled(
+            context
+        )
+
+    def _get(
+        self, context: Context, template: BoundTemplate
+    ) -> Optional[List[BoundTemplate]]:
+        entry = self.entry
+        if (
+            entry is not None
+            and entry[0] is context.env.loader
+            and entry[1] == str(template.path or template.name)
+            and entry[2] is template.tree
+        ):
+            return entry[3]
+        return None
+
+    def _set(
+        self,
+        context: Context,
+        template: BoundTemplate,
+        ancestors: List[BoundTemplate],
+    ) -> None:
+        self.entry = (
+            context.env.loader,
+            str(template.path or template.name),
+            template.tree,
+            ancestors,
+            copy_block_stacks(context.tag_namespace["extends"]),
+        )
+
+    def _restore(self, context: Context) -> BoundTemplate:
+        assert self.entry is not None
+        _, _, _, ancestors, block_stacks = self.entry
+        context.tag_namespace["extends"] = copy_block_stacks(block_stacks)
+        return ancestors[-1]
+
+
+def copy_block_stacks(
+    block_stacks: Mapping[str, List[_BlockStackItem]],
+) -> _BlockStacks:
+    """Return a copy of _block_stacks_ that can be extended independently."""
+    copied: _BlockStacks = defaultdict(list)
+    for name, stack in block_stacks.items():
+        parent: Optional[_BlockStackItem] = None
+        items: List[_BlockStackItem] = []
+        for item in reversed(stack):
+            parent = _BlockStackItem(
+                block=item.block,
+                required=item.required,
+                source_name=item.source_name,
+                parent=parent,
+            )
+            items.append(parent)
+        items.reverse()
+        copied[name] = items
+    return copied
+
+
 class BlockTag(Tag):
     """The extra "Block" tag."""
 
@@ -346,6 +497,7 @@ def build_block_stacks(
     template: BoundTemplate,
     parent_name: str,
     tag: str = TAG_EXTENDS,
+    ancestors: Optional[List[BoundTemplate]] = None,
 ) -> BoundTemplate:
     """Build a stack for each `{% block %}` in the inheritance chain.
 
@@ -356,6 +508,8 @@ def build_block_stacks(
         template: A leaf template with an `extends` tag.
         parent_name: The name of the immediate parent template as a string.
         tag: The name of the `extends` tag, if it is overridden.
+        ancestors: If given, templates loaded while building block stacks are
+            appended to this list, starting with the immediate parent.
     """
     if "extends" not in context.tag_namespace:
         context.tag_namespace["extends"] = defaultdict(list)
@@ -365,6 +519,8 @@ def build_block_stacks(
 
     extends_node, _ = stack_blocks(context, template)
     parent = context.get_template_with_context(parent_name, tag=tag)
+    if ancestors is not None:
+        ancestors.append(parent)
     assert extends_node
     seen.add(extends_node.name.evaluate(context))
 
@@ -385,6 +541,8 @@ def build_block_stacks(
 
     while parent_template_name:
         parent = context.get_template_with_context(parent_template_name, tag=tag)
+        if ancestors is not None:
+            ancestors.append(parent)
         extends_node, _ = stack_blocks(context, parent)
 
         if extends_node:
@@ -408,6 +566,7 @@ async def build_block_stacks_async(
     template: BoundTemplate,
     parent_name: str,
     tag: str = TAG_EXTENDS,
+    ancestors: Optional[List[BoundTemplate]] = None,
 ) -> BoundTemplate:
     """Build a stack for each `{% block %}` in the inheritance chain.
 
@@ -418,6 +577,8 @@ async def build_block_stacks_async(
         template: A leaf template with an `extends` tag.
         parent_name: The name of the immediate parent template as a string.
         tag: The name of the `extends` tag, if it is overridden.
+        ancestors: If given, templates loaded while building block stacks are
+            appended to this list, starting with the immediate parent.
     """
     if "extends" not in context.tag_namespace:
         context.tag_namespace["extends"] = defaultdict(list)
@@ -427,6 +588,8 @@ async def build_block_stacks_async(
 
     extends_node, _ = stack_blocks(context, template)
     parent = await context.get_template_with_context_async(parent_name, tag=tag)
+    if ancestors is not None:
+        ancestors.append(parent)
     assert extends_node
     seen.add(extends_node.name.evaluate(context))
 
@@ -449,6 +612,8 @@ async def build_block_stacks_async(
         parent = await context.get_template_with_context_async(
             parent_template_name, tag=tag
         )
+        if ancestors is not None:
+            ancestors.append(parent)
         extends_node, _ = stack_blocks(context, parent)
 
         if extends_node:
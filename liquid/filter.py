@@ -49,6 +49,19 @@ def with_environment(_filter: FilterT) -> FilterT:
     return _filter
 
 
+def impure(_filter: FilterT) -> FilterT:
+    """Mark decorated filter functions as impure.
+
+    An impure filter might return a different result given the same arguments, so
+    templates using it are never cached by `liquid.render_cache.RenderCache`.
+
+    Args:
+        _filter: The filter function to decorate.
+    """
+    _filter.impure = True  # type: ignore
+    return _filter
+
+
 def string_filter(_filter: FilterT) -> FilterT:
     """A filter function decorator that converts the first argument to a string."""
 
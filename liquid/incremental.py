@@ -0,0 +1,360 @@
+"""Parse a template again after its source has been edited.
+
+`parse()` parses template source text, like `Environment.parse()`, and remembers
+where each of the resulting tree's top-level statements starts. Given that tree and
+an edit to its source, `reparse()` lexes and parses the top-level statements touched
+by the edit, and reuses the tree's other nodes.
+
+    tree = parse(env, source)
+    tree = reparse(env, tree, TextEdit(offset=120, removed=3, inserted="product"))
+    template = env.template_class(env, tree)
+
+Nodes following an edit that adds or removes lines are copied with new line
+numbers. The whole template is parsed again if the edited statements can't be
+parsed on their own, like when an edit removes a block's end tag, or if:
+
+- the environment's tolerance mode is not `Mode.STRICT`;
+- `Environment.optimize_templates` is `True`; or
+- `Environment.tokenizer()` has been overridden.
+"""
+from __future__ import annotations
+
+from bisect import bisect_left
+from bisect import bisect_right
+from functools import partial
+from typing import TYPE_CHECKING
+from typing import Callable
+from typing import Dict
+from typing import Iterator
+from typing import List
+from typing import NamedTuple
+from typing import Optional
+from typing import Pattern
+from typing import Tuple
+
+from liquid.ast import Node
+from liquid.ast import ParseTree
+from liquid.exceptions import Error
+from liquid.lex import _tokenize_template
+from liquid.mode import Mode
+from liquid.parse import get_parser
+from liquid.stream import TokenStream
+from liquid.token import TOKEN_EOF
+from liquid.token import Token
+
+if TYPE_CHECKING:
+    from liquid import Environment
+
+__all__ = (
+    "SourceMap",
+    "TextEdit",
+    "parse",
+    "reparse",
+)
+
+# (token, start index of the lexer match it came from, lexer whitespace control state)
+_LexedToken = Tuple[Token, int, bool]
+
+
+class TextEdit(NamedTuple):
+    """A change to template source text.
+
+    Attributes:
+        offset: The index of the first character to be replaced.
+        removed: The number of characters to remove, starting at _offset_.
+        inserted: The text to insert at _offset_.
+    """
+
+    offset: int
+    removed: int
+    inserted: str
+
+    def apply(self, source: str) -> str:
+        """Return _source_ with this edit applied."""
+        end = self.offset + self.removed
+        return source[: self.offset] + self.inserted + source[end:]
+
+
+class SourceMap(NamedTuple):
+    """The source text of a parse tree and the location of its statements.
+
+    Attributes:
+        source: The source text the tree was parsed from.
+        starts: The index of the first character of each top-level statement, or
+            `None` if the tree's nodes can't be reused.
+        lstrips: For each top-level statement, `True` if the lexer was stripping
+            leading whitespace when it reached that statement.
+    """
+
+    source: str
+    starts: Optional[List[int]]
+    lstrips: List[bool]
+
+
+def parse(env: Environment, source: str) -> ParseTree:
+    """Parse _source_ as a Liquid template, ready to be reparsed after an edit.
+
+    Errors are handled according to the environment's tolerance mode, like
+    `Environment.parse()`.
+    """
+    rules = _lexer_rules(env)
+    if rules is None:
+        tree = env.parse(source)
+        tree.source_map = SourceMap(source, None, [])
+        return tree
+
+    tokens: List[_LexedToken] = []
+    stream = TokenStream(_tokenize(source, rules, tokens))
+    statements, starts, lstrips = _parse_statements(env, stream, tokens)
+
+    tree = ParseTree()
+    tree.statements = statements
+    tree.source_map = SourceMap(source, starts, lstrips)
+    return tree
+
+
+def reparse(env: Environment, tree: ParseTree, edit: TextEdit) -> ParseTree:
+    """Return a parse tree for _tree_'s source text with _edit_ applied.
+
+    Top-level statements touched by the edit are lexed and parsed again. Other
+    nodes are reused, so _tree_ should not be modified after calling `reparse()`.
+
+    Args:
+        env: The environment used to parse _tree_.
+        tree: A parse tree returned from `parse()` or `reparse()`.
+        edit: The change to _tree_'s source text.
+
+    Raises:
+        ValueError: If _tree_ was not parsed with `parse()` or `reparse()`, or if
+            _edit_ is out of range.
+    """
+    source_map = tree.source_map
+    if source_map is None:
+        raise ValueError("can't reparse a tree without a source map")
+
+    old = source_map.source
+    offset, removed, inserted = edit
+    end = offset + removed
+    if offset < 0 or removed < 0 or end > len(old):
+        raise ValueError(f"edit {edit!r} is out of range")
+
+    source = edit.apply(old)
+    rules = _lexer_rules(env)
+    starts = source_map.starts
+    if rules is None or starts is None or not starts:
+        return parse(env, source)
+
+    lstrips = source_map.lstrips
+    delta = len(inserted) - removed
+
+    # Start from the statement before the one being edited, so the lexer picks up
+    # changes to whitespace control at the start of the edited statement.
+    first = max(bisect_right(starts, offset) - 2, 0)
+    pos, lstrip = (starts[first], lstrips[first]) if first else (0, False)
+
+    # Stop parsing when we reach an unchanged statement, with the lexer in the same
+    # state it was in last time. If we never do, no statements are reused from
+    # after the edit.
+    resume = bisect_left(starts, end)
+    resumed = False
+
+    def unchanged(start: int, state: bool) -> bool:  # noqa: FBT001
+        nonlocal resume, resumed
+        while resume < len(starts) and starts[resume] + delta < start:
+            resume += 1
+        resumed = (
+            resume < len(starts)
+            and starts[resume] + delta == start
+            and lstrips[resume] == state
+        )
+        return resumed
+
+    tokens: List[_LexedToken] = []
+    try:
+        stream = TokenStream(
+            _tokenize(
+                source,
+                rules,
+                tokens,
+                pos=pos,
+                line_count=source.count("\n", 0, pos) + 1,
+                lstrip=lstrip,
+            )
+        )
+        statements, new_starts, new_lstrips = _parse_statements(
+            env, stream, tokens, until=unchanged
+        )
+    except Error:
+        # Maybe a block tag has been opened or closed, so statements following
+        # the edit are now part of a different block.
+        return parse(env, source)
+
+    if new_starts is None:
+        return parse(env, source)
+
+    if not resumed:
+        resume = len(starts)
+
+    following = tree.statements[resume:]
+    lines = inserted.count("\n") - old.count("\n", offset, end)
+    if lines:
+        following = [_relocate_node(node, lines) for node in following]
+
+    new_tree = ParseTree()
+    new_tree.statements = tree.statements[:first] + statements + following
+    new_tree.source_map = SourceMap(
+        source,
+        starts[:first] + new_starts + [start + delta for start in starts[resume:]],
+        lstrips[:first] + new_lstrips + lstrips[resume:],
+    )
+    return new_tree
+
+
+def _relocate_node(node: Node, lines: int) -> Node:
+    """Return a copy of _node_ and its descendants, moved down by _lines_ lines.
+
+    Tokens are replaced with tokens that have new line numbers. Expressions and
+    other objects referenced by _node_ are shared with the copy.
+    """
+    clone = _relocate(node, lines)
+    assert isinstance(clone, Node)
+    return clone
+
+
+def _relocate(obj: object, lines: int) -> object:
+    cls = type(obj)
+    if cls is Token:
+        tok: Token = obj  # type: ignore
+        return Token(tok.linenum + lines, tok.type, tok.value)
+
+    if cls is list or cls is tuple:
+        return cls(_relocate(item, lines) for item in obj)  # type: ignore
+
+    slots = _node_slots(cls)
+    if slots is None:
+        return obj
+
+    clone = cls.__new__(cls)
+    for name in slots:
+        try:
+            value = getattr(obj, name)
+        except AttributeError:
+            continue
+        setattr(clone, name, _relocate(value, lines))
+
+    attrs = getattr(obj, "__dict__", None)
+    if attrs is not None:
+        clone.__dict__.update(
+            {key: _relocate(value, lines) for key, value in attrs.items()}
+        )
+    return clone
+
+
+# Slot names for each subclass of `Node`, or `None` for other types.
+_NODE_SLOTS: Dict[type, Optional[Tuple[str, ...]]] = {}
+
+
+def _node_slots(cls: type) -> Optional[Tuple[str, ...]]:
+    try:
+        return _NODE_SLOTS[cls]
+    except KeyError:
+        pass
+
+    names: Optional[Dict[str, None]] = None
+    if issubclass(cls, Node):
+        names = {}
+        for klass in cls.__mro__:
+            slots = klass.__dict__.get("__slots__", ())
+            for name in (slots,) if isinstance(slots, str) else slots:
+                if name not in ("__dict__", "__weakref__"):
+                    names[name] = None
+
+    _NODE_SLOTS[cls] = None if names is None else tuple(names)
+    return _NODE_SLOTS[cls]
+
+
+def _lexer_rules(env: Environment) -> Optional[Pattern[str]]:
+    """Return the rules used by _env_'s template lexer, if its nodes can be reused."""
+    if env.mode != Mode.STRICT or env.optimize_templates:
+        return None
+
+    tokenizer = env.tokenizer()
+    if isinstance(tokenizer, partial) and tokenizer.func is _tokenize_template:
+        rules: Pattern[str] = tokenizer.keywords["rules"]
+        return rules
+    return None
+
+
+def _tokenize(
+    source: str,
+    rules: Pattern[str],
+    tokens: List[_LexedToken],
+    *,
+    pos: int = 0,
+    line_count: int = 1,
+    lstrip: bool = False,
+) -> Iterator[Token]:
+    """Tokenize _source_, recording each token and where it came from in _tokens_.
+
+    The start index of a token is `-1` if it is not the first token from its match,
+    like the expression following a tag name.
+    """
+    spans: List[Tuple[int, bool]] = []
+    previous: Optional[Tuple[int, bool]] = None
+    for token in _tokenize_template(
+        source, rules, pos=pos, line_count=line_count, lstrip=lstrip, spans=spans
+    ):
+        span = spans[-1]
+        tokens.append((token, span[0] if span is not previous else -1, span[1]))
+        previous = span
+        yield token
+
+
+def _parse_statements(
+    env: Environment,
+    stream: TokenStream,
+    tokens: List[_LexedToken],
+    until: Optional[Callable[[int, bool], bool]] = None,
+) -> Tuple[List[Node], Optional[List[int]], List[bool]]:
+    """Parse top-level statements from _stream_, like `Parser.parse()` in strict mode.
+
+    If _until_ returns `True` for the start index and lexer state of a statement,
+    that statement and those following it are not parsed.
+
+    Returns:
+        A list of statements, the start index of each of those statements, or
+        `None` if a statement does not start at the start of a lexer match, and
+        for each statement, the state of the lexer's whitespace control.
+    """
+    parser = get_parser(env)
+    statements: List[Node] = []
+    starts: Optional[List[int]] = []
+    lstrips: List[bool] = []
+    index = 0
+
+    while stream.current.type != TOKEN_EOF:
+        if starts is not None:
+            # Tokens are consumed in order, so we can search forward from the
+            # previous statement.
+            while index < len(tokens) and tokens[index][0] is not stream.current:
+                index += 1
+
+            if index < len(tokens) and tokens[index][1] >= 0:
+                _, start, lstrip = tokens[index]
+                if until is not None and until(start, lstrip):
+                    break
+                starts.append(start)
+                lstrips.append(lstrip)
+            else:
+                starts = None
+
+        try:
+            statements.append(parser.parse_statement(stream))
+        except Error as err:
+            if not err.linenum:
+                err.linenum = stream.current.linenum
+            raise
+
+        stream.next_token()
+
+    return statements, starts, lstrips
@@ -20,12 +20,20 @@ from functools import lru_cache
 from functools import partial
 from typing import Callable
 from typing import Collection
+from typing import Dict
 from typing import Iterable
 from typing import Iterator
+from typing import List
+from typing import Optional
 from typing import Pattern
 from typing import Tuple
 
 from liquid.exceptions import LiquidSyntaxError
+from liquid.expressions.lexed import EXPRESSION_BOOLEAN
+from liquid.expressions.lexed import EXPRESSION_FILTERED
+from liquid.expressions.lexed import EXPRESSION_LOOP
+from liquid.expressions.lexed import LexedExpression
+from liquid.expressions.lexed import lex_expression
 from liquid.token import TOKEN_AND
 from liquid.token import TOKEN_AS
 from liquid.token import TOKEN_ASSIGN
@@ -247,19 +255,26 @@ def compile_liquid_rules(
         r"(?P<raw>.*?)"
         rf"{tag_s}-?\s*endraw\s*(?P<rsr_e>-?){tag_e}"
     )
-    statement_pattern = rf"{stmt_s}-?\s*(?P<stmt>.*?)\s*(?P<rss>-?){stmt_e}"
+    statement_pattern = (
+        rf"{stmt_s}-?\s*(?P<stmt>{_expression_chunks(statement_end_string)})"
+        rf"\s*(?P<rss>-?){stmt_e}"
+    )
 
     # The "name" group is zero or more characters so that a malformed tag (one
     # with no name) does not get treated as a literal.
     #
     # The `#` in the `name` group is specifically for the inline comment tag.
     tag_pattern = (
-        rf"{tag_s}-?(?P<pre>\s*(?P<name>#|\w*)\s*)(?P<expr>.*?)\s*(?P<rst>-?){tag_e}"
+        rf"{tag_s}-?(?P<pre>\s*(?P<name>#|\w*)\s*)"
+        rf"(?P<expr>{_expression_chunks(tag_end_string)})\s*(?P<rst>-?){tag_e}"
     )
 
     if not comment_start_string:
         # Do not support shorthand comment syntax
-        literal_pattern = rf".+?(?=(({tag_s}|{stmt_s})(?P<rstrip>-?))|$)"
+        literal_pattern = (
+            rf"{_literal_chunks(tag_start_string, statement_start_string)}"
+            rf"(?=(({tag_s}|{stmt_s})(?P<rstrip>-?))|$)"
+        )
 
         liquid_rules = [
             ("RAW", raw_pattern),
@@ -268,7 +283,12 @@ def compile_liquid_rules(
             (TOKEN_LITERAL, literal_pattern),
         ]
     else:
-        literal_pattern = rf".+?(?=(({tag_s}|{stmt_s}|{comment_s})(?P<rstrip>-?))|$)"
+        chunks = _literal_chunks(
+            tag_start_string, statement_start_string, comment_start_string
+        )
+        literal_pattern = (
+            rf"{chunks}(?=(({tag_s}|{stmt_s}|{comment_s})(?P<rstrip>-?))|$)"
+        )
         comment_pattern = rf"{comment_s}(?P<comment>.*?)(?P<rsc>-?){comment_e}"
 
         liquid_rules = [
@@ -282,6 +302,32 @@ def compile_liquid_rules(
     return _compile_rules(liquid_rules)
 
 
+def _literal_chunks(*delimiters: str) -> str:
+    """Return a pattern matching template literal text up to a possible delimiter.
+
+    Equivalent to `.+?` followed by a lookahead for one of _delimiters_ or `$`, but
+    runs of characters that can't start a delimiter, or match `$`, are consumed in
+    one step rather than testing the lookahead at every character. Each character
+    that can start a delimiter starts a new chunk, so a failed match does not
+    backtrack through different ways of splitting the same text.
+    """
+    stops = "".join(sorted({re.escape(d[0]) for d in delimiters if d} | {r"\n"}))
+    ends = "|".join(re.escape(d) for d in delimiters if d)
+    return rf".[^{stops}]*(?:(?!{ends}|$)[{stops}][^{stops}]*)*"
+
+
+def _expression_chunks(end_string: str) -> str:
+    """Return a pattern matching tag or output statement expression text.
+
+    Equivalent to `.*?` when followed by optional whitespace, an optional whitespace
+    control character and _end_string_. Like `_literal_chunks()`, each character
+    that could start the end of the expression starts a new chunk.
+    """
+    stops = "".join(sorted({re.escape(end_string[0]), r"\s", r"\-"}))
+    end = re.escape(end_string)
+    return rf"[^{stops}]*(?:(?!\s*-?{end})[{stops}][^{stops}]*)*"
+
+
 def _compile_rules(rules: Iterable[Tuple[str, str]]) -> Pattern[str]:
     """Compile the given rules into a single regular expression."""
     pattern = "|".join(f"(?P<{name}>{pattern})" for name, pattern in rules)
@@ -445,11 +491,38 @@ tokenize_paginate_expression = partial(
 )
 
 
-def _tokenize_template(source: str, rules: Pattern[str]) -> Iterator[Token]:
-    line_count = 1
-    lstrip = False
+# Tags whose expressions are tokenized by the template lexer, if it is asked to, and
+# the kind of expression each of them expects. See `liquid.expressions.lexed`.
+LEXED_EXPRESSION_TAGS = {
+    "if": EXPRESSION_BOOLEAN,
+    "elsif": EXPRESSION_BOOLEAN,
+    "unless": EXPRESSION_BOOLEAN,
+    "for": EXPRESSION_LOOP,
+    "tablerow": EXPRESSION_LOOP,
+}
+
+
+def _tokenize_template(  # noqa: PLR0912
+    source: str,
+    rules: Pattern[str],
+    *,
+    pos: int = 0,
+    line_count: int = 1,
+    lstrip: bool = False,
+    spans: Optional[List[Tuple[int, bool]]] = None,
+    expressions: Optional[Dict[Tuple[str, str], LexedExpression]] = None,
+) -> Iterator[Token]:
+    # If given, _spans_ gets the start index of each match, and whether leading
+    # whitespace is to be stripped from it, before that match's tokens are yielded.
+    #
+    # If given, _expressions_ gets tokens for each distinct output statement
+    # expression, and each distinct expression of a tag named in
+    # `LEXED_EXPRESSION_TAGS`, keyed by kind of expression and expression, before
+    # that expression's token is yielded.
+    for match in rules.finditer(source, pos):
+        if spans is not None:
+            spans.append((match.start(), lstrip))
 
-    for match in rules.finditer(source):
         kind = match.lastgroup
         assert kind is not None
 
@@ -461,6 +534,13 @@ def _tokenize_template(source: str, rules: Pattern[str]) -> Iterator[Token]:
             value = match.group("stmt")
             lstrip = bool(match.group("rss"))
 
+            if expressions is not None:
+                key = (EXPRESSION_FILTERED, value)
+                if key not in expressions:
+                    expressions[key] = lex_expression(
+                        source, *match.span("stmt"), EXPRESSION_FILTERED
+                    )
+
         elif kind == "TAG":
             name = match.group("name")
             yield Token(line_num, TOKEN_TAG, name)
@@ -474,6 +554,13 @@ def _tokenize_template(source: str, rules: Pattern[str]) -> Iterator[Token]:
             if not value:
                 continue
 
+            if expressions is not None and name in LEXED_EXPRESSION_TAGS:
+                key = (LEXED_EXPRESSION_TAGS[name], value)
+                if key not in expressions:
+                    expressions[key] = lex_expression(
+                        source, *match.span("expr"), key[0]
+                    )
+
         elif kind == "COMMENT":
             lstrip = bool(match.group("rsc"))
             continue
@@ -5,6 +5,9 @@ from .builtin.loaders import ChoiceLoader
 from .builtin.loaders import DictLoader
 from .builtin.loaders import FileExtensionLoader
 from .builtin.loaders import FileSystemLoader
+from .builtin.loaders import FileSystemParseTreeCache
+from .builtin.loaders import FileWatcher
+from .builtin.loaders import ParseTreeCache
 from .builtin.loaders import TemplateNamespace
 from .builtin.loaders import TemplateSource
 from .builtin.loaders import UpToDate
@@ -16,6 +19,9 @@ __all__ = (
     "DictLoader",
     "FileExtensionLoader",
     "FileSystemLoader",
+    "FileSystemParseTreeCache",
+    "FileWatcher",
+    "ParseTreeCache",
     "TemplateNamespace",
     "TemplateSource",
     "UpToDate",
@@ -0,0 +1,412 @@
+"""Simplify a template's parse tree before it is rendered.
+
+The optimizer rewrites a parse tree in place, reducing the number of nodes visited on
+every render. It is run by `Environment.parse` when `Environment.optimize_templates` is
+`True`.
+
+- Output statements containing only literals and pure, built-in filters, like
+  `{{ "foo" | upcase }}`, are evaluated once and replaced with a template literal.
+- Adjacent template literals are merged into a single node.
+- `if`, `unless` and `case` branches that can never be taken are removed, and those
+  that will always be taken are replaced with the contents of the branch. A condition
+  can be evaluated ahead of time if it consists of literals and names listed in
+  `Environment.frozen_globals` only.
+
+Frozen globals are read from `Environment.globals` at parse time. It is up to you to
+make sure those names are never overridden by template globals or render arguments,
+and that their values don't change for the lifetime of the environment. Pruning is
+disabled entirely for templates that use the `include` tag, and frozen names that are
+assigned or captured by the template itself are never treated as constant.
+
+Whitespace-only output suppression is preserved. A branch is only replaced with its
+contents if it is known to produce output that won't be suppressed, and if it does not
+contain a `break` or `continue` tag, an `include` tag or a tag that is not built in, at
+any depth. Output rendered before a loop is interrupted, or before rendering is
+stopped, is discarded by the branch's block.
+"""
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+from typing import Iterable
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Set
+from typing import Tuple
+from typing import Union
+
+from liquid.ast import BlockNode
+from liquid.ast import ConditionalBlockNode
+from liquid.ast import Node
+from liquid.builtin.filters import array
+from liquid.builtin.filters import math
+from liquid.builtin.filters import misc
+from liquid.builtin.filters import string
+from liquid.builtin.literal import LiteralNode
+from liquid.builtin.statement import StatementNode
+from liquid.builtin.tags.case_tag import CaseNode
+from liquid.builtin.tags.for_tag import BreakNode
+from liquid.builtin.tags.for_tag import ContinueNode
+from liquid.builtin.tags.if_tag import IfNode
+from liquid.builtin.tags.unless_tag import UnlessNode
+from liquid.expression import Blank
+from liquid.expression import Boolean
+from liquid.expression import BooleanExpression
+from liquid.expression import Empty
+from liquid.expression import Expression
+from liquid.expression import FilteredExpression
+from liquid.expression import FloatLiteral
+from liquid.expression import Identifier
+from liquid.expression import IdentifierPathElement
+from liquid.expression import InfixExpression
+from liquid.expression import IntegerLiteral
+from liquid.expression import Nil
+from liquid.expression import PrefixExpression
+from liquid.expression import RangeLiteral
+from liquid.expression import StringLiteral
+from liquid.stringify import to_liquid_string
+from liquid.token import TOKEN_LITERAL
+from liquid.token import Token
+
+if TYPE_CHECKING:
+    from liquid import Environment
+    from liquid.ast import ParseTree
+
+__all__ = ("optimize",)
+
+# Built-in filters that always return the same result given the same arguments, and
+# have no side effects. The `date` filter is not pure, it understands "now".
+PURE_FILTERS = frozenset(
+    (
+        array.compact,
+        array.concat,
+        array.first,
+        array.join,
+        array.last,
+        array.map_,
+        array.reverse,
+        array.sort,
+        array.sort_natural,
+        array.sum_,
+        array.uniq,
+        array.where,
+        math.abs_,
+        math.at_least,
+        math.at_most,
+        math.ceil,
+        math.divided_by,
+        math.floor,
+        math.minus,
+        math.modulo,
+        math.plus,
+        math.round_,
+        math.times,
+        misc.default,
+        misc.size,
+        string.append,
+        string.base64_decode,
+        string.base64_encode,
+        string.base64_url_safe_decode,
+        string.base64_url_safe_encode,
+        string.capitalize,
+        string.downcase,
+        string.escape,
+        string.escape_once,
+        string.lstrip,
+        string.newline_to_br,
+        string.prepend,
+        string.remove,
+        string.remove_first,
+        string.remove_last,
+        string.replace,
+        string.replace_first,
+        string.replace_last,
+        string.rstrip,
+        string.slice_,
+        string.split,
+        string.strip,
+        string.strip_html,
+        string.strip_newlines,
+        string.truncate,
+        string.truncatewords,
+        string.upcase,
+        string.url_decode,
+        string.url_encode,
+    )
+)
+
+# Expression types that can be evaluated without a render context, given their
+# children can be evaluated without a render context too.
+CONSTANT_EXPRESSIONS = frozenset(
+    (
+        Blank,
+        Boolean,
+        BooleanExpression,
+        Empty,
+        FloatLiteral,
+        IdentifierPathElement,
+        InfixExpression,
+        IntegerLiteral,
+        Nil,
+        PrefixExpression,
+        RangeLiteral,
+        StringLiteral,
+    )
+)
+
+
+class _Unknown:
+    """The value of an expression that can't be evaluated ahead of time."""
+
+
+UNKNOWN = _Unknown()
+
+
+def optimize(env: Environment, tree: ParseTree) -> ParseTree:
+    """Simplify parse tree _tree_ in place, returning the same tree.
+
+    Args:
+        env: The environment that parsed _tree_.
+        tree: The parse tree to optimize.
+    """
+    _Optimizer(env, tree).optimize()
+    return tree
+
+
+class _Optimizer:
+    def __init__(self, env: Environment, tree: ParseTree):
+        self.env = env
+        self.tree = tree
+        self.context = env.template_class.context_class(
+            env,
+            globals={
+                name: env.globals[name]
+                for name in _frozen_names(env, tree)
+                if name in env.globals
+            },
+        )
+        self.frozen = frozenset(self.context.globals)
+
+    def optimize(self) -> None:
+        self.tree.statements = self._optimize_statements(self.tree.statements)
+
+    def _optimize_statements(self, statements: List[Node]) -> List[Node]:
+        optimized: List[Node] = []
+        for node in statements:
+            for block in _child_blocks(node):
+                block.statements = self._optimize_statements(block.statements)
+
+            for new_node in self._prune(node):
+                _append(optimized, self._fold(new_node))
+
+        return optimized
+
+    def _fold(self, node: Node) -> Node:
+        """Replace a constant output statement with a template literal."""
+        if type(node) is not StatementNode or self.env.autoescape:  # noqa: E721
+            return node
+
+        expr = node.expression
+        if type(expr) is not FilteredExpression or not self._is_constant(  # noqa: E721
+            expr.expression
+        ):
+            return node
+
+        for _filter in expr.filters:
+            if self.env.filters.get(_filter.name) not in PURE_FILTERS or not all(
+                self._is_constant(arg)
+                for arg in (*_filter.args, *_filter.kwargs.values())
+            ):
+                return node
+
+        try:
+            value = expr.evaluate(self.context)
+        except Exception:  # noqa: BLE001
+            return node
+
+        return LiteralNode(
+            Token(node.tok.linenum, TOKEN_LITERAL, to_liquid_string(value, False))
+        )
+
+    def _prune(self, node: Node) -> List[Node]:
+        """Return a list of nodes to replace _node_ with."""
+        if type(node) is IfNode or type(node) is UnlessNode:  # noqa: E721
+            return self._prune_if(node)
+        if type(node) is CaseNode:  # noqa: E721
+            return self._prune_case(node)
+        return [node]
+
+    def _prune_if(self, node: Union[IfNode, UnlessNode]) -> List[Node]:
+        branches: List[Tuple[Optional[Expression], BlockNode]] = [
+            (node.condition, node.consequence),
+            *((alt.condition, alt.block) for alt in node.conditional_alternatives),
+        ]
+        if node.alternative:
+            branches.append((None, node.alternative))
+
+        for i, (condition, block) in enumerate(branches):
+            if condition is None:
+                return self._replace(node, [block])
+
+            value = self._evaluate(condition)
+            if value is UNKNOWN:
+                return [node]
+
+            if i == 0 and type(node) is UnlessNode:  # noqa: E721
+                value = not value
+
+            if value:
+                return self._replace(node, [block])
+
+        return []
+
+    def _prune_case(self, node: CaseNode) -> List[Node]:
+        values = [self._evaluate(when.condition) for when in node.whens]
+        if any(value is UNKNOWN for value in values):
+            return [node]
+
+        # Every matching `when` block is rendered, not just the first.
+        blocks = [when.block for when, value in zip(node.whens, values) if value]
+        if not blocks and node.default:
+            blocks = [node.default]
+        return self._replace(node, blocks)
+
+    def _replace(self, node: Node, blocks: List[BlockNode]) -> List[Node]:
+        """Return the statements in _blocks_ if it's safe to replace _node_ with them.
+
+        A block is safe to inline if the node it came from will never suppress its
+        output, or if it contains a template literal that is not whitespace, so the
+        output would not have been suppressed anyway. Blocks that might be interrupted
+        are never inlined, as they discard their output when that happens.
+        """
+        if not blocks:
+            return []
+
+        if _may_interrupt(stmt for block in blocks for stmt in block.statements):
+            return [node]
+
+        if getattr(node, "forced_output", False) or any(
+            type(stmt) is LiteralNode and not stmt.tok.value.isspace()  # noqa: E721
+            for block in blocks
+            for stmt in block.statements
+        ):
+            return [stmt for block in blocks for stmt in block.statements]
+
+        return [node]
+
+    def _evaluate(self, expr: Expression) -> object:
+        if not self._is_constant(expr):
+            return UNKNOWN
+
+        try:
+            return expr.evaluate(self.context)
+        except Exception:  # noqa: BLE001
+            # Leave it until render time, where errors are handled according to the
+            # current tolerance mode.
+            return UNKNOWN
+
+    def _is_constant(self, expr: Expression) -> bool:
+        if type(expr) is Identifier:  # noqa: E721
+            root = expr.path[0]
+            if (
+                not isinstance(root, IdentifierPathElement)
+                or root.value not in self.frozen
+            ):
+                return False
+        elif type(expr) is FilteredExpression:  # noqa: E721
+            if expr.filters:
+                return False
+        elif type(expr) not in CONSTANT_EXPRESSIONS:
+            return False
+        return all(self._is_constant(child) for child in expr.children())
+
+
+def _append(statements: List[Node], node: Node) -> None:
+    """Append _node_ to _statements_, merging adjacent template literals."""
+    if (
+        statements
+        and type(node) is LiteralNode  # noqa: E721
+        and type(statements[-1]) is LiteralNode  # noqa: E721
+    ):
+        prev = statements[-1]
+        assert isinstance(prev, LiteralNode)
+        statements[-1] = LiteralNode(
+            prev.tok._replace(value=prev.tok.value + node.tok.value)
+        )
+    else:
+        statements.append(node)
+
+
+def _child_blocks(node: Node) -> Iterator[BlockNode]:
+    """Yield block nodes that are direct descendants of _node_."""
+    try:
+        children = node.children()
+    except NotImplementedError:
+        return
+
+    for child in children:
+        if isinstance(child.node, BlockNode):
+            yield child.node
+        elif isinstance(child.node, ConditionalBlockNode):
+            yield child.node.block
+        elif child.node is not None:
+            yield from _child_blocks(child.node)
+
+
+def _may_interrupt(nodes: Iterable[Node]) -> bool:
+    """Return `True` if rendering _nodes_ might interrupt a loop or stop rendering.
+
+    Nodes that are not built in, and those that include other templates, are assumed
+    to be able to do either.
+    """
+    for node in nodes:
+        if type(node) is BreakNode or type(node) is ContinueNode:  # noqa: E721
+            return True
+
+        if not type(node).__module__.startswith(("liquid.ast", "liquid.builtin.")):
+            return True
+
+        try:
+            children = node.children()
+        except NotImplementedError:
+            return True
+
+        if any(child.load_mode == "include" for child in children) or _may_interrupt(
+            child.node for child in children if child.node is not None
+        ):
+            return True
+
+    return False
+
+
+def _frozen_names(env: Environment, tree: ParseTree) -> Set[str]:
+    """Return frozen global names that can't be shadowed when rendering _tree_."""
+    if not env.frozen_globals:
+        return set()
+
+    shadowed: Set[str] = set()
+    for node in _walk(tree.statements):
+        try:
+            children = node.children()
+        except NotImplementedError:
+            # We can't tell what names this node might assign to.
+            return set()
+
+        for child in children:
+            if child.load_mode == "include":
+                # Included templates can assign to the including template's scope.
+                return set()
+            shadowed.update(child.template_scope or ())
+            shadowed.update(child.block_scope or ())
+
+    return set(env.frozen_globals) - shadowed
+
+
+def _walk(nodes: Iterable[Node]) -> Iterator[Node]:
+    for node in nodes:
+        yield node
+        try:
+            children = node.children()
+        except NotImplementedError:
+            continue
+        yield from _walk(child.node for child in children if child.node is not None)
@@ -1,26 +1,130 @@
 """Template output streams."""
 from io import StringIO
 from typing import Optional
+from typing import TextIO
+
+from typing_extensions import Literal
 
 from liquid.exceptions import OutputStreamLimitError
 
 
 class LimitedStringIO(StringIO):
-    """A StringIO subclass that limits the number of bytes that can be written."""
+    """A StringIO subclass that limits the number of bytes that can be written.
+
+    If _unit_ is "characters", the limit is a number of characters instead.
+    """
 
     def __init__(
         self,
         limit: int,
         initial_value: Optional[str] = None,
         newline: Optional[str] = None,
+        *,
+        unit: Literal["bytes", "characters"] = "bytes",
     ) -> None:
         super().__init__(initial_value, newline)
         self.limit = limit
+        self.unit = unit
         self.size = 0
 
     def write(self, __s: str) -> int:  # noqa: D102
         if __s:
-            self.size += len(__s.encode("utf-8"))
+            # For ASCII strings, which are most strings, the number of bytes is the
+            # number of characters. `str.isascii()` does not scan the string.
+            if __s.isascii() or self.unit == "characters":
+                self.size += len(__s)
+            else:
+                self.size += len(__s.encode("utf-8"))
             if self.size > self.limit:
                 raise OutputStreamLimitError("output stream limit reached")
         return super().write(__s)
+
+    def sizeof(self, s: str) -> int:
+        """Return the size of _s_ in this stream's unit."""
+        if s.isascii() or self.unit == "characters":
+            return len(s)
+        return len(s.encode("utf-8"))
+
+    def write_buffer(self, buf: StringIO) -> None:
+        """Write the contents of _buf_ to this stream.
+
+        If _buf_ is a `LimitedStringIO` with the same unit, its output has been
+        counted already, and is not counted again.
+        """
+        if isinstance(buf, LimitedStringIO) and buf.unit == self.unit:
+            self.size += buf.size
+            if self.size > self.limit:
+                raise OutputStreamLimitError("output stream limit reached")
+            super().write(buf.getvalue())
+        else:
+            self.write(buf.getvalue())
+
+
+def write_buffer(buffer: TextIO, buf: StringIO) -> None:
+    """Write the contents of intermediate buffer _buf_ to _buffer_.
+
+    Output stream limits are charged once, not once for each buffer.
+    """
+    if isinstance(buffer, LimitedStringIO):
+        buffer.write_buffer(buf)
+    else:
+        buffer.write(buf.getvalue())
+
+
+# Block tags, like `for` and `if`, render to an intermediate buffer, then inspect
+# their output before writing it to the enclosing buffer, or discarding it if it
+# contains only whitespace. When the enclosing buffer is a `StringIO`, that
+# intermediate buffer is the enclosing buffer itself, starting at a marked position,
+# so nested blocks don't copy their output at every level. See
+# `Context.get_block_buffer()`.
+
+
+def block_value(buf: StringIO, mark: int) -> str:
+    """Return the output written to _buf_ since position _mark_."""
+    end = buf.tell()
+    buf.seek(mark)
+    value = buf.read(end - mark)
+    buf.seek(end)
+    return value
+
+
+def block_isspace(buf: StringIO, mark: int) -> bool:
+    """Return `True` if output written to _buf_ since _mark_ is only whitespace."""
+    end = buf.tell()
+    pos = buf.seek(mark)
+    try:
+        while pos < end:
+            # Usually the first chunk contains something other than whitespace.
+            chunk = buf.read(min(256, end - pos))
+            if not chunk.isspace():
+                return False
+            pos += len(chunk)
+        return True
+    finally:
+        buf.seek(end)
+
+
+def commit_block(
+    parent: TextIO,
+    buf: StringIO,
+    mark: int,
+    *,
+    force: bool = False,
+) -> None:
+    """Keep a block's output, writing it to _parent_ if _buf_ is not _parent_.
+
+    Unless _force_ is `True`, output containing only whitespace is discarded.
+    """
+    if not force and block_isspace(buf, mark):
+        discard_block(buf, mark)
+    elif buf is not parent:
+        parent.write(buf.getvalue())
+
+
+def discard_block(buf: StringIO, mark: int) -> None:
+    """Remove output written to _buf_ since position _mark_."""
+    if isinstance(buf, LimitedStringIO):
+        # Discarded output does not count towards the limit.
+        buf.size -= buf.sizeof(block_value(buf, mark))
+    buf.seek(mark)
+    buf.truncate()
@@ -0,0 +1,255 @@
+"""Load and parse many templates ahead of time.
+
+See `Environment.preload` and `Environment.preload_async`.
+"""
+from __future__ import annotations
+
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from fnmatch import fnmatchcase
+from typing import TYPE_CHECKING
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import Optional
+from typing import Set
+from typing import Tuple
+from typing import Union
+
+from liquid.builtin.loaders.choice_loader import ChoiceLoader
+from liquid.builtin.tags.include_tag import PartialCache
+from liquid.expression import StringLiteral
+
+if TYPE_CHECKING:
+    from liquid import BoundTemplate
+    from liquid import Environment
+    from liquid.ast import Node
+    from liquid.builtin.loaders.base_loader import BaseLoader
+    from liquid.context import Context
+
+__all__ = (
+    "PreloadReport",
+    "preload",
+    "preload_async",
+)
+
+# (template name, tag loading the template or `None` if it is not a partial)
+_Request = Tuple[str, Optional[str]]
+
+# (request, template or exception, seconds taken)
+_Result = Tuple[_Request, Union["BoundTemplate", Exception], float]
+
+
+class PreloadReport:
+    """The outcome of preloading templates.
+
+    Attributes:
+        loaded: A mapping of template names to the number of seconds it took to
+            load and parse each template.
+        failed: A mapping of template names to the exception raised when loading
+            or parsing each template.
+        elapsed: The total number of seconds taken to preload templates.
+    """
+
+    __slots__ = ("loaded", "failed", "elapsed")
+
+    def __init__(self) -> None:
+        self.loaded: Dict[str, float] = {}
+        self.failed: Dict[str, Exception] = {}
+        self.elapsed = 0.0
+
+    def __repr__(self) -> str:  # pragma: no cover
+        return (
+            f"PreloadReport(loaded={len(self.loaded)}, failed={len(self.failed)}, "
+            f"elapsed={self.elapsed:.3f})"
+        )
+
+
+def preload(
+    env: Environment, pattern: str = "*", *, workers: Optional[int] = None
+) -> PreloadReport:
+    """Load and parse templates matching _pattern_, and the partials they use.
+
+    See `Environment.preload`.
+    """
+    report = PreloadReport()
+    start = time.perf_counter()
+    context = _preload_context(env)
+
+    def _load(request: _Request) -> _Result:
+        name, tag = request
+        _start = time.perf_counter()
+        try:
+            if tag is None:
+                template: Union[BoundTemplate, Exception] = env.get_template(name)
+            else:
+                template = context.get_template_with_context(name, tag=tag)
+        except Exception as err:  # noqa: BLE001
+            template = err
+        return (request, template, time.perf_counter() - _start)
+
+    partials = _Partials(context)
+    pending = partials.new_requests(_matching(env, pattern))
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        while pending:
+            results = list(executor.map(_load, pending))
+            pending = partials.new_requests(_record(report, results, partials))
+
+    report.elapsed = time.perf_counter() - start
+    return report
+
+
+async def preload_async(
+    env: Environment, pattern: str = "*", *, workers: Optional[int] = None
+) -> PreloadReport:
+    """An async version of `preload`.
+
+    See `Environment.preload_async`.
+    """
+    report = PreloadReport()
+    start = time.perf_counter()
+    semaphore = asyncio.Semaphore(workers) if workers and workers > 0 else None
+    context = _preload_context(env)
+
+    async def _get_template(name: str, tag: Optional[str]) -> BoundTemplate:
+        if tag is None:
+            return await env.get_template_async(name)
+        return await context.get_template_with_context_async(name, tag=tag)
+
+    async def _load(request: _Request) -> _Result:
+        _start = time.perf_counter()
+        try:
+            if semaphore is None:
+                template: Union[BoundTemplate, Exception] = await _get_template(
+                    *request
+                )
+            else:
+                async with semaphore:
+                    template = await _get_template(*request)
+        except Exception as err:  # noqa: BLE001
+            template = err
+        return (request, template, time.perf_counter() - _start)
+
+    partials = _Partials(context)
+    pending = partials.new_requests(_matching(env, pattern))
+
+    while pending:
+        results = await asyncio.gather(*(_load(request) for request in pending))
+        pending = partials.new_requests(_record(report, results, partials))
+
+    report.elapsed = time.perf_counter() - start
+    return report
+
+
+def _preload_context(env: Environment) -> Context:
+    """Return a render context for loading partial templates like tags do."""
+    return env.template_class.context_class(env, globals=env.make_globals())
+
+
+class _Partials:
+    """Track which templates have been requested, and which tags use them.
+
+    Templates are loaded once for each name and tag. Loaded partial templates are
+    added to the `PartialCache` of each `include` or `render` tag that uses them,
+    if that tag would reuse them.
+    """
+
+    def __init__(self, context: Context):
+        self.context = context
+        self.seen: Set[_Request] = set()
+        self.caches: Dict[_Request, List[PartialCache]] = {}
+        # Partial templates loaded with a context-aware loader depend on the render
+        # context, so we don't know which ones will be loaded.
+        self.follow = not context.env.loader.context_aware
+        self.reuse = self.follow and PartialCache.enabled(context)
+
+    def new_requests(self, requests: Iterable[_Request]) -> List[_Request]:
+        """Return _requests_ that have not been seen before."""
+        new_requests: List[_Request] = []
+        for request in requests:
+            if request not in self.seen:
+                self.seen.add(request)
+                new_requests.append(request)
+        return new_requests
+
+    def find(self, nodes: Iterable[Node]) -> List[_Request]:
+        """Return requests for templates loaded by tags in _nodes_.
+
+        Partial templates are loaded by tags like `render`, `include` and `extends`.
+        Like `liquid.static_analysis`, we use the `load_mode` of each child node, and
+        only follow partial templates that are named with a string literal.
+        """
+        requests: List[_Request] = []
+        if not self.follow:
+            return requests
+
+        for node in nodes:
+            try:
+                children = node.children()
+            except NotImplementedError:
+                continue
+
+            cache = getattr(node, "partials", None)
+            for child in children:
+                if child.load_mode is not None and isinstance(
+                    child.expression, StringLiteral
+                ):
+                    request = (
+                        child.expression.value,
+                        (child.load_context or {}).get("tag", child.load_mode),
+                    )
+                    requests.append(request)
+                    if isinstance(cache, PartialCache):
+                        self.caches.setdefault(request, []).append(cache)
+                if child.node is not None:
+                    requests.extend(self.find([child.node]))
+
+        return requests
+
+    def loaded(self, request: _Request, template: BoundTemplate) -> None:
+        """Add _template_ to the partial caches of tags that requested it."""
+        if self.reuse:
+            for cache in self.caches.pop(request, ()):
+                cache.add(self.context, request[0], template)
+
+
+def _record(
+    report: PreloadReport, results: Iterable[_Result], partials: _Partials
+) -> List[_Request]:
+    """Add _results_ to _report_ and return requests for partial templates they use."""
+    requests: List[_Request] = []
+    for request, result, seconds in results:
+        name = request[0]
+        if isinstance(result, Exception):
+            report.failed.setdefault(name, result)
+        else:
+            report.loaded.setdefault(name, seconds)
+            partials.loaded(request, result)
+            requests.extend(partials.find(result.tree.statements))
+    return requests
+
+
+def _matching(env: Environment, pattern: str) -> List[_Request]:
+    return [
+        (name, None)
+        for name in _list_templates(env.loader)
+        if fnmatchcase(name, pattern)
+    ]
+
+
+def _list_templates(loader: BaseLoader) -> List[str]:
+    """Return names of templates listed by _loader_.
+
+    Loaders that can't list their templates, including those chosen from by a
+    `ChoiceLoader`, are skipped.
+    """
+    if isinstance(loader, ChoiceLoader):
+        names = (_list_templates(_loader) for _loader in loader.loaders)
+        return sorted(set().union(*names))
+
+    try:
+        return loader.list_templates()
+    except NotImplementedError:
+        return []
@@ -0,0 +1,293 @@
+"""A cache of rendered template output.
+
+A `RenderCache` reuses the output of a previous render when a template is rendered
+again with the same input. A template's input is the set of variables it references
+but does not assign, as reported by `BoundTemplate.analyze()`, and the cache key is
+built from the values of those variables at render time.
+
+Assign a `RenderCache` to `Environment.render_cache` to cache the output of partial
+templates rendered with the built-in `render` tag, or use `RenderCache.render()` to
+render whole templates.
+
+A template's output is not cached if:
+
+- it, or any template it renders or includes, uses a filter that has been marked as
+  impure with `liquid.filter.impure`, or a non-built-in filter that needs the render
+  context;
+- static analysis fails for any node or partial template; or
+- a referenced variable's value is not a string, number, boolean, `None`, date,
+  undefined, or a list or dictionary of those types. Drops and other custom objects
+  might change between renders without us knowing.
+
+Templates are analyzed once, on first use, so partial templates should be loaded
+with a caching loader, like `CachingFileSystemLoader`. If a partial template is
+modified, call `RenderCache.clear()` or set a `ttl` so stale output expires.
+"""
+from __future__ import annotations
+
+import datetime as dt
+import itertools
+import sys
+import time
+import weakref
+from decimal import Decimal
+from typing import TYPE_CHECKING
+from typing import Any
+from typing import Hashable
+from typing import MutableMapping
+from typing import Optional
+from typing import TextIO
+from typing import Tuple
+
+from liquid.context import Undefined
+from liquid.optimizer import PURE_FILTERS
+from liquid.utils import LRUCache
+from liquid.utils import SizedCache
+
+if TYPE_CHECKING:
+    from liquid import BoundTemplate
+    from liquid import Context
+    from liquid import Environment
+    from liquid.static_analysis import TemplateAnalysis
+
+__all__ = ("RenderCache",)
+
+# (plan identifier, names of variables the template depends on)
+_Plan = Tuple[int, Tuple[str, ...]]
+
+_MISSING = object()
+_UNDEFINED = object()
+
+# Immutable, hashable types whose values can be used directly in cache keys.
+_SCALARS = (str, int, float, bool, type(None), Decimal, dt.date)
+
+
+class _Unhashable(Exception):  # noqa: N818
+    """A variable's value can't be used as part of a cache key."""
+
+
+class RenderCache:
+    """A cache of rendered output, keyed by template and the values of its inputs.
+
+    Args:
+        capacity: The maximum number of rendered outputs to keep.
+        max_bytes: If not `None`, the cache is also bounded by the size, in bytes,
+            of cached output.
+        ttl: If not `None`, the number of seconds for which rendered output can be
+            reused.
+    """
+
+    def __init__(
+        self,
+        capacity: int = 1000,
+        *,
+        max_bytes: Optional[int] = None,
+        ttl: Optional[float] = None,
+    ):
+        self.ttl = ttl
+        self.cache: MutableMapping[Hashable, Tuple[float, str]] = (
+            SizedCache(max_bytes, capacity=capacity, sizeof=_sizeof_entry)
+            if max_bytes
+            else LRUCache(capacity)
+        )
+
+        # Analysis results per template. Templates are weakly referenced, so a
+        # replaced template gets a new plan, and a new range of cache keys.
+        self._plans: weakref.WeakKeyDictionary[BoundTemplate, Optional[_Plan]] = (
+            weakref.WeakKeyDictionary()
+        )
+        self._plan_ids = itertools.count()
+
+    def clear(self) -> None:
+        """Remove all cached output and template analysis results."""
+        self.cache.clear()
+        self._plans.clear()
+
+    def render(self, template: BoundTemplate, *args: Any, **kwargs: Any) -> str:
+        """Render _template_, reusing previously rendered output if possible.
+
+        Accepts the same arguments as `BoundTemplate.render`.
+        """
+        context = template.context_class(
+            template.env,
+            globals=template.make_globals(dict(*args, **kwargs)),
+            template=template,
+        )
+        buf = template._get_buffer()  # noqa: SLF001
+        self.render_with_context(template, context, buf)
+        return buf.getvalue()
+
+    async def render_async(
+        self, template: BoundTemplate, *args: Any, **kwargs: Any
+    ) -> str:
+        """An async version of `render`."""
+        context = template.context_class(
+            template.env,
+            globals=template.make_globals(dict(*args, **kwargs)),
+            template=template,
+        )
+        buf = template._get_buffer()  # noqa: SLF001
+        await self.render_with_context_async(template, context, buf)
+        return buf.getvalue()
+
+    def render_with_context(
+        self,
+        template: BoundTemplate,
+        context: Context,
+        buffer: TextIO,
+        *,
+        partial: bool = False,
+        block_scope: bool = False,
+    ) -> None:
+        """Render _template_ with _context_, or write cached output to _buffer_."""
+        key = self._key(self._plan(template), context, partial, block_scope)
+        if key is None:
+            template.render_with_context(
+                context, buffer, partial=partial, block_scope=block_scope
+            )
+            return
+
+        output = self._get(key)
+        if output is None:
+            buf = context.get_buffer(buffer)
+            template.render_with_context(
+                context, buf, partial=partial, block_scope=block_scope
+            )
+            output = buf.getvalue()
+            self._set(key, output)
+
+        buffer.write(output)
+
+    async def render_with_context_async(
+        self,
+        template: BoundTemplate,
+        context: Context,
+        buffer: TextIO,
+        *,
+        partial: bool = False,
+        block_scope: bool = False,
+    ) -> None:
+        """An async version of `render_with_context`."""
+        key = self._key(await self._plan_async(template), context, partial, block_scope)
+        if key is None:
+            await template.render_with_context_async(
+                context, buffer, partial=partial, block_scope=block_scope
+            )
+            return
+
+        output = self._get(key)
+        if output is None:
+            buf = context.get_buffer(buffer)
+            await template.render_with_context_async(
+                context, buf, partial=partial, block_scope=block_scope
+            )
+            output = buf.getvalue()
+            self._set(key, output)
+
+        buffer.write(output)
+
+    def _get(self, key: Hashable) -> Optional[str]:
+        entry = self.cache.get(key)
+        if entry is None:
+            return None
+
+        expires, output = entry
+        if expires and expires < time.monotonic():
+            self.cache.pop(key, None)
+            return None
+        return output
+
+    def _set(self, key: Hashable, output: str) -> None:
+        expires = time.monotonic() + self.ttl if self.ttl else 0.0
+        self.cache[key] = (expires, output)
+
+    def _plan(self, template: BoundTemplate) -> Optional[_Plan]:
+        try:
+            return self._plans[template]
+        except KeyError:
+            plan = self._make_plan(
+                template.env,
+                template.analyze(follow_partials=True, raise_for_failures=False),
+            )
+            self._plans[template] = plan
+            return plan
+
+    async def _plan_async(self, template: BoundTemplate) -> Optional[_Plan]:
+        try:
+            return self._plans[template]
+        except KeyError:
+            plan = self._make_plan(
+                template.env,
+                await template.analyze_async(
+                    follow_partials=True, raise_for_failures=False
+                ),
+            )
+            self._plans[template] = plan
+            return plan
+
+    def _make_plan(
+        self, env: Environment, analysis: TemplateAnalysis
+    ) -> Optional[_Plan]:
+        if analysis.failed_visits or analysis.unloadable_partials:
+            return None
+
+        for name in analysis.filters:
+            func = env.filters.get(name)
+            if func is None or _is_impure(func):
+                return None
+
+        names = set()
+        for var in analysis.global_variables:
+            root = var.parts[0]
+            if not isinstance(root, str):
+                return None
+            names.add(root)
+
+        return (next(self._plan_ids), tuple(sorted(names)))
+
+    def _key(
+        self,
+        plan: Optional[_Plan],
+        context: Context,
+        partial: bool,  # noqa: FBT001
+        block_scope: bool,  # noqa: FBT001
+    ) -> Optional[Hashable]:
+        if plan is None:
+            return None
+
+        plan_id, names = plan
+        try:
+            values = tuple(_freeze(context.resolve(name, _MISSING)) for name in names)
+        except _Unhashable:
+            return None
+
+        return (plan_id, context.autoescape, partial, block_scope, values)
+
+
+def _is_impure(func: object) -> bool:
+    if func in PURE_FILTERS:
+        # Some built-in filters use the render context for caching only.
+        return False
+    return bool(getattr(func, "impure", False) or getattr(func, "with_context", False))
+
+
+def _freeze(obj: object) -> Hashable:
+    """Return a hashable representation of _obj_ for use in a cache key."""
+    if obj is _MISSING or isinstance(obj, Undefined):
+        return _UNDEFINED
+
+    if isinstance(obj, _SCALARS):
+        # Include the type, so `1`, `1.0`, `True` and `Markup("1")` are different.
+        return (type(obj), obj)
+
+    if isinstance(obj, dict):
+        return (dict, tuple((_freeze(k), _freeze(v)) for k, v in obj.items()))
+
+    if isinstance(obj, (list, tuple)):
+        return (list, tuple(_freeze(item) for item in obj))
+
+    raise _Unhashable
+
+
+def _sizeof_entry(entry: Tuple[float, str]) -> int:
+    return sys.getsizeof(entry[1])
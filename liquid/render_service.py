@@ -0,0 +1,221 @@
+"""Render templates in a pool of worker processes.
+
+Rendering is CPU bound, so threads won't use more than one core. A `RenderService`
+loads and parses templates in the current process, then starts a pool of worker
+processes that render those templates by name. Where the "fork" start method is
+available, workers inherit the parent's environment and parse trees without
+parsing or unpickling them again.
+
+A forked process gets a copy of every lock in its parent, held or not, but only the
+thread that forked it. Workers are forked when the service is created, so create
+it before starting other threads that use the environment. Workers that are
+replaced after `max_jobs_per_worker` jobs are started by a thread belonging to the
+pool, while other threads might be rendering, so they are never forked. They are
+started with the "forkserver" or "spawn" start method instead, and receive a
+pickled copy of the environment and its templates.
+
+If the environment's `auto_reload` is `True`, the service checks whether a template
+is up to date once per job, in the parent process, and tells workers to reload
+templates that have changed. Workers don't check templates themselves.
+"""
+from __future__ import annotations
+
+import itertools
+import multiprocessing
+import pickle
+import threading
+from typing import TYPE_CHECKING
+from typing import Any
+from typing import Dict
+from typing import Iterable
+from typing import Optional
+from typing import Tuple
+
+if TYPE_CHECKING:
+    from multiprocessing.context import BaseContext
+    from multiprocessing.pool import AsyncResult
+    from types import TracebackType
+
+    from liquid import BoundTemplate
+    from liquid import Environment
+
+__all__ = ("RenderService",)
+
+# Template name -> (version, template)
+_Templates = Dict[str, Tuple[int, "BoundTemplate"]]
+
+
+class RenderService:
+    """A pool of worker processes rendering templates from one environment.
+
+    Args:
+        env: The environment to load templates from.
+        templates: Names of templates to load and parse before starting workers.
+            Other templates are loaded on first use, by this process and by each
+            worker.
+        processes: The number of worker processes. Defaults to `os.cpu_count()`.
+        max_jobs_per_worker: If not `None`, the number of jobs each worker process
+            completes before it is replaced with a new one. Workers are then
+            started without forking, so the environment and its templates must be
+            picklable. New workers reload templates that have changed since the
+            service was created on first use.
+    """
+
+    def __init__(
+        self,
+        env: Environment,
+        templates: Iterable[str] = (),
+        *,
+        processes: Optional[int] = None,
+        max_jobs_per_worker: Optional[int] = None,
+    ):
+        self.env = env
+        self._lock = threading.Lock()
+        self._versions = itertools.count(1)
+
+        self._templates: _Templates = {
+            name: (next(self._versions), env.get_template(name)) for name in templates
+        }
+
+        if max_jobs_per_worker is None:
+            self._pool = _mp_context().Pool(
+                processes,
+                initializer=_init_worker,
+                initargs=(env, dict(self._templates)),
+            )
+        else:
+            # Pickled once, here, rather than by the pool's handler thread every
+            # time it starts a worker.
+            data = pickle.dumps((env, self._templates), pickle.HIGHEST_PROTOCOL)
+            self._pool = _spawn_context().Pool(
+                processes,
+                initializer=_init_pickled_worker,
+                initargs=(data,),
+                maxtasksperchild=max_jobs_per_worker,
+            )
+
+    def __enter__(self) -> RenderService:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[type],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.close()
+
+    def render(self, name: str, *args: Any, **kwargs: Any) -> str:
+        """Render template _name_ in a worker process and return its output.
+
+        Accepts the same render arguments as `BoundTemplate.render`. Render arguments
+        must be picklable. Exceptions raised while rendering are raised here too.
+        """
+        return self.submit(name, *args, **kwargs).get()
+
+    def submit(self, name: str, *args: Any, **kwargs: Any) -> AsyncResult[str]:
+        """Submit a render job without waiting for it to complete.
+
+        Returns:
+            A `multiprocessing.pool.AsyncResult`. Call its `get()` method to wait
+            for the rendered output.
+        """
+        return self._pool.apply_async(
+            _render, (name, self._version(name), dict(*args, **kwargs))
+        )
+
+    def invalidate(self, name: Optional[str] = None) -> None:
+        """Reload template _name_, or all templates, here and in every worker.
+
+        Workers reload invalidated templates the next time they're used.
+        """
+        with self._lock:
+            names = [name] if name is not None else list(self._templates)
+            for _name in names:
+                if _name in self._templates:
+                    self._load(_name)
+
+    def close(self) -> None:
+        """Wait for outstanding jobs to complete, then stop all worker processes."""
+        self._pool.close()
+        self._pool.join()
+
+    def terminate(self) -> None:
+        """Stop all worker processes without waiting for outstanding jobs."""
+        self._pool.terminate()
+        self._pool.join()
+
+    def _version(self, name: str) -> int:
+        with self._lock:
+            entry = self._templates.get(name)
+            if entry is None:
+                return self._load(name)
+
+            version, template = entry
+            if self.env.auto_reload and not template.is_up_to_date:
+                return self._load(name)
+            return version
+
+    def _load(self, name: str) -> int:
+        _forget(self.env, name)
+        version = next(self._versions)
+        self._templates[name] = (version, self.env.get_template(name))
+        return version
+
+
+def _mp_context() -> BaseContext:
+    # Forked workers share the parent's parse trees, copy-on-write.
+    if "fork" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("fork")
+    return multiprocessing.get_context()  # pragma: no cover
+
+
+def _spawn_context() -> BaseContext:
+    # A context that doesn't fork from this process, which might have other threads.
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("forkserver")
+    return multiprocessing.get_context("spawn")  # pragma: no cover
+
+
+class _Worker:
+    def __init__(self, env: Environment, templates: _Templates):
+        self.env = env
+        self.templates = dict(templates)
+
+    def get_template(self, name: str, version: int) -> BoundTemplate:
+        entry = self.templates.get(name)
+        if entry is not None and entry[0] == version:
+            return entry[1]
+
+        # A new version from the parent process means the template has changed.
+        _forget(self.env, name)
+        template = self.env.get_template(name)
+        self.templates[name] = (version, template)
+        return template
+
+
+def _forget(env: Environment, name: str) -> None:
+    """Remove template _name_ from _env_'s template cache and its loader's cache."""
+    if env.cache is not None:
+        env.cache.pop(name, None)
+    if env.loader.caching_loader:
+        cache = getattr(env.loader, "cache", None)
+        if cache is not None:
+            cache.pop(name, None)
+
+
+_worker: Optional[_Worker] = None
+
+
+def _init_worker(env: Environment, templates: _Templates) -> None:
+    global _worker  # noqa: PLW0603
+    _worker = _Worker(env, templates)
+
+
+def _init_pickled_worker(data: bytes) -> None:
+    _init_worker(*pickle.loads(data))  # noqa: S301
+
+
+def _render(name: str, version: int, render_args: Dict[str, object]) -> str:
+    assert _worker is not None
+    return _worker.get_template(name, version).render(render_args)
@@ -3,20 +3,38 @@
 from __future__ import annotations
 
 from collections import deque
+from typing import TYPE_CHECKING
 from typing import Deque
+from typing import Dict
 from typing import Iterator
 from typing import List
+from typing import Optional
+from typing import Tuple
 
 from liquid.token import TOKEN_EOF
 from liquid.token import TOKEN_INITIAL
 from liquid.token import Token
 
+if TYPE_CHECKING:
+    from liquid.expressions.lexed import LexedExpression
 
-class TokenStream:
-    """Step through or iterate a stream of tokens."""
 
-    def __init__(self, tokeniter: Iterator[Token]):
+class TokenStream:
+    """Step through or iterate a stream of tokens.
+
+    Args:
+        tokeniter: An iterator of template tokens.
+        expressions: Expressions lexed by the template lexer, keyed by kind of
+            expression and expression. See `liquid.expressions.lexed`.
+    """
+
+    def __init__(
+        self,
+        tokeniter: Iterator[Token],
+        expressions: Optional[Dict[Tuple[str, str], LexedExpression]] = None,
+    ):
         self.iter = tokeniter
+        self.expressions = expressions
 
         # Queue of peeked tokens
         self._pushed: Deque[Token] = deque()
@@ -82,6 +100,16 @@ class TokenStream:
         self._pushed.append(self.current)
         self.current = tok
 
+    def lexed_expression(self, kind: str, expression: str) -> Optional[LexedExpression]:
+        """Return _expression_ as lexed by the template lexer.
+
+        Returns `None` if the template lexer did not tokenize _expression_ as an
+        expression of type _kind_, in which case it should be lexed as a string.
+        """
+        if self.expressions is None:
+            return None
+        return self.expressions.get((kind, expression))
+
     def close(self) -> None:
         """Close the stream."""
         self.current = Token(0, TOKEN_EOF, "")
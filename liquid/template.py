@@ -7,14 +7,24 @@ from io import StringIO
 from pathlib import Path
 from typing import TYPE_CHECKING
 from typing import Any
+from typing import AsyncIterator
 from typing import Awaitable
 from typing import Dict
+from typing import Iterable
 from typing import Iterator
+from typing import List
 from typing import Mapping
 from typing import Optional
 from typing import TextIO
+from typing import Tuple
 from typing import Union
 
+from liquid.ast import estimate_size
+from liquid.ast import group_isolated
+from liquid.ast import render_concurrently_async
+from liquid.batch import render_many
+from liquid.batch import render_many_async
+from liquid.compiler import compile_tree
 from liquid.context import Context
 from liquid.context import FutureContext
 from liquid.context import FutureVariableCaptureContext
@@ -33,8 +43,12 @@ from liquid.static_analysis import TemplateAnalysis
 from liquid.static_analysis import _TemplateCounter
 
 if TYPE_CHECKING:
+    from concurrent.futures import Executor
+
     from liquid import Environment
+    from liquid.ast import Node
     from liquid.ast import ParseTree
+    from liquid.compiler import CompiledRender
     from liquid.loaders import UpToDate
 
 
@@ -94,6 +108,21 @@ class BoundTemplate:
         self.path = path
         self.uptodate = uptodate
 
+        # A compiled render function, paired with the parse tree it was compiled
+        # from. See `Environment.compile_templates`.
+        self._compiled: Optional[Tuple[ParseTree, CompiledRender]] = None
+
+    def __getstate__(self) -> Dict[str, object]:
+        # Compiled render functions can't be pickled. They are rebuilt on demand.
+        state = self.__dict__.copy()
+        state["_compiled"] = None
+        return state
+
+    def __sizeof__(self) -> int:
+        # An estimate of the memory used by this template's parse tree. Globals are
+        # not included, they are usually shared with the environment.
+        return object.__sizeof__(self) + estimate_size(self.tree)
+
     def render(self, *args: Any, **kwargs: Any) -> str:
         """Render the template with `args` and `kwargs` included in the render context.
 
@@ -119,10 +148,130 @@ class BoundTemplate:
         await self.render_with_context_async(context, buf)
         return buf.getvalue()
 
+    def render_iter(self, *args: Any, **kwargs: Any) -> Iterator[str]:
+        """Render the template, yielding output as each top-level node is rendered.
+
+        Accepts the same arguments as `render`. Unlike `render`, output is not
+        accumulated in a single buffer, so the first chunk is available as soon as
+        the first top-level node has been rendered. Block tags are still rendered
+        in full before any of their output is yielded, as they might need to
+        suppress whitespace-only output.
+        """
+        context = self.context_class(
+            self.env,
+            globals=self.make_globals(dict(*args, **kwargs)),
+            template=self,
+        )
+        buf = self._get_buffer()
+        namespace = self.make_partial_namespace(False, {})
+
+        with context.extend(namespace=namespace):
+            for _ in self._render_nodes(context, buf):
+                if buf.tell():
+                    yield self._flush(buf)
+
+        if buf.tell():
+            yield self._flush(buf)
+
+    async def render_async_iter(self, *args: Any, **kwargs: Any) -> AsyncIterator[str]:
+        """An async version of `render_iter`."""
+        context = self.context_class(
+            self.env,
+            globals=self.make_globals(dict(*args, **kwargs)),
+            template=self,
+        )
+        buf = self._get_buffer()
+        namespace = self.make_partial_namespace(False, {})
+
+        with context.extend(namespace=namespace):
+            async for _ in self._render_nodes_async(context, buf):
+                if buf.tell():
+                    yield self._flush(buf)
+
+        if buf.tell():
+            yield self._flush(buf)
+
+    def render_many(
+        self,
+        contexts: Iterable[Mapping[str, object]],
+        *,
+        workers: Optional[int] = None,
+        processes: bool = False,
+        executor: Optional[Executor] = None,
+        chunksize: Optional[int] = None,
+    ) -> List[Union[str, Error]]:
+        """Render the template once for each mapping of render arguments.
+
+        The same parse tree is used for every render, and each worker reuses a
+        single output buffer. Results are returned in the same order as
+        _contexts_.
+
+        An error that would be raised by `render` does not stop the batch. Instead,
+        the exception is returned in place of that item's output. Whether an error
+        is raised in the first place depends on the environment's tolerance mode.
+
+        Args:
+            contexts: An iterable of mappings, each of which is added to the render
+                context for one render of the template.
+            workers: The maximum number of threads or processes to render with. If
+                `None` or `1`, and neither _processes_ nor _executor_ is given,
+                templates are rendered in the current thread.
+            processes: If `True`, render with a new `ProcessPoolExecutor` of at
+                most _workers_ processes, instead of threads. The template is
+                pickled once and sent to each worker process once, when it starts.
+                Render arguments must be picklable too.
+            executor: An optional `concurrent.futures.Executor` to render with,
+                like a `ThreadPoolExecutor`. The template is passed to the executor
+                with every task, so executors that don't share memory with this
+                process should be avoided in favour of _processes_.
+            chunksize: The number of renders to submit to the executor as a single
+                task. Defaults to a chunk size that gives about four tasks per
+                worker.
+
+        Returns:
+            A list of rendered strings or `liquid.exceptions.Error`s, one for each
+            item in _contexts_.
+        """
+        return render_many(
+            self,
+            contexts,
+            workers=workers,
+            processes=processes,
+            executor=executor,
+            chunksize=chunksize,
+        )
+
+    async def render_many_async(
+        self,
+        contexts: Iterable[Mapping[str, object]],
+        *,
+        workers: Optional[int] = None,
+    ) -> List[Union[str, Error]]:
+        """An async version of `render_many`.
+
+        Args:
+            contexts: An iterable of mappings, each of which is added to the render
+                context for one render of the template.
+            workers: The maximum number of renders to await concurrently. If `None`,
+                there is no limit.
+        """
+        return await render_many_async(self, contexts, workers=workers)
+
+    @staticmethod
+    def _flush(buf: StringIO) -> str:
+        # Empty the buffer for reuse. The running total of a `LimitedStringIO` is not
+        # reset, so output stream limits still apply to the whole render.
+        chunk = buf.getvalue()
+        buf.seek(0)
+        buf.truncate()
+        return chunk
+
     def _get_buffer(self) -> StringIO:
         if self.env.output_stream_limit is None:
             return StringIO()
-        return LimitedStringIO(limit=self.env.output_stream_limit)
+        return LimitedStringIO(
+            limit=self.env.output_stream_limit, unit=self.env.output_stream_limit_unit
+        )
 
     def render_with_context(
         self,
@@ -152,28 +301,14 @@ class BoundTemplate:
         namespace = self.make_partial_namespace(partial, dict(*args, **kwargs))
 
         with context.extend(namespace=namespace):
-            for node in self.tree.statements:
-                try:
-                    node.render(context, buffer)
-                except LiquidInterrupt as err:
-                    # If this is an "included" template, there could be a for loop
-                    # in a parent template. A for loop that could be interrupted
-                    # from an included template.
-                    #
-                    # Convert the interrupt to a syntax error if there is no parent.
-                    if not partial or block_scope:
-                        self.env.error(
-                            LiquidSyntaxError(
-                                f"unexpected '{err}'", linenum=node.token().linenum
-                            )
-                        )
-                    else:
-                        raise
-                except StopRender:
-                    break
-                except Error as err:
-                    # Raise or warn according to the current mode.
-                    self.env.error(err, linenum=node.token().linenum)
+            if self.env.compile_templates:
+                self.compiled()(context, buffer, partial, block_scope)
+                return
+
+            for _ in self._render_nodes(
+                context, buffer, partial=partial, block_scope=block_scope
+            ):
+                pass
 
     async def render_with_context_async(
         self,
@@ -189,28 +324,110 @@ class BoundTemplate:
         namespace = self.make_partial_namespace(partial, dict(*args, **kwargs))
 
         with context.extend(namespace=namespace):
-            for node in self.tree.statements:
-                try:
-                    await node.render_async(context, buffer)
-                except LiquidInterrupt as err:
-                    # If this is an "included" template, there could be a for loop
-                    # in a parent template. A for loop that could be interrupted
-                    # from an included template.
-                    #
-                    # Convert the interrupt to a syntax error if there is no parent.
-                    if not partial or block_scope:
-                        self.env.error(
-                            LiquidSyntaxError(
-                                f"unexpected '{err}'", linenum=node.token().linenum
-                            )
-                        )
-                    else:
-                        raise
-                except StopRender:
-                    break
-                except Error as err:
-                    # Raise or warn according to the current mode.
-                    self.env.error(err, linenum=node.token().linenum)
+            if self.env.render_concurrency > 0:
+                await self._render_concurrently_async(
+                    context, buffer, partial=partial, block_scope=block_scope
+                )
+                return
+
+            async for _ in self._render_nodes_async(
+                context, buffer, partial=partial, block_scope=block_scope
+            ):
+                pass
+
+    def _render_nodes(
+        self,
+        context: Context,
+        buffer: TextIO,
+        *,
+        partial: bool = False,
+        block_scope: bool = False,
+    ) -> Iterator[None]:
+        """Render each top-level node to _buffer_, yielding after each one.
+
+        Rendering stops early if a node raises `StopRender`. See
+        `render_with_context` for a description of _partial_ and _block_scope_.
+        """
+        for node in self.tree.statements:
+            try:
+                node.render(context, buffer)
+            except StopRender:
+                return
+            except (LiquidInterrupt, Error) as err:
+                self._handle_error(node, err, partial=partial, block_scope=block_scope)
+            yield None
+
+    async def _render_nodes_async(
+        self,
+        context: Context,
+        buffer: TextIO,
+        *,
+        partial: bool = False,
+        block_scope: bool = False,
+    ) -> AsyncIterator[None]:
+        """An async version of `_render_nodes`."""
+        for node in self.tree.statements:
+            try:
+                await node.render_async(context, buffer)
+            except StopRender:
+                return
+            except (LiquidInterrupt, Error) as err:
+                self._handle_error(node, err, partial=partial, block_scope=block_scope)
+            yield None
+
+    def _handle_error(
+        self,
+        node: Node,
+        err: Union[LiquidInterrupt, Error],
+        *,
+        partial: bool,
+        block_scope: bool,
+    ) -> None:
+        """Raise or warn about _err_, raised while rendering top-level _node_."""
+        if isinstance(err, LiquidInterrupt):
+            # If this is an "included" template, there could be a for loop in a
+            # parent template. A for loop that could be interrupted from an
+            # included template.
+            #
+            # Convert the interrupt to a syntax error if there is no parent.
+            if partial and not block_scope:
+                raise err
+            self.env.error(
+                LiquidSyntaxError(f"unexpected '{err}'", linenum=node.token().linenum)
+            )
+        else:
+            # Raise or warn according to the current mode.
+            self.env.error(err, linenum=node.token().linenum)
+
+    async def _render_concurrently_async(
+        self, context: Context, buffer: TextIO, *, partial: bool, block_scope: bool
+    ) -> None:
+        def _on_error(node: Node, err: Error) -> None:
+            self.env.error(err, linenum=node.token().linenum)
+
+        for nodes in group_isolated(self.tree.statements):
+            try:
+                await render_concurrently_async(nodes, context, buffer, _on_error)
+            except LiquidInterrupt as err:
+                # Only a group containing one node can be interrupted.
+                self._handle_error(
+                    nodes[0], err, partial=partial, block_scope=block_scope
+                )
+            except StopRender:
+                break
+
+    def compiled(self) -> CompiledRender:
+        """Return a Python function that renders this template's parse tree.
+
+        The parse tree is compiled once, then reused for subsequent renders, unless
+        `tree` is replaced.
+        """
+        if self._compiled is None or self._compiled[0] is not self.tree:
+            self._compiled = (
+                self.tree,
+                compile_tree(self.env, self.tree, name=self.name or "<string>"),
+            )
+        return self._compiled[1]
 
     @property
     def is_up_to_date(self) -> bool:
@@ -1,10 +1,16 @@
-from .cache import LRUCache  # noqa: D104
+from .cache import CacheInfo  # noqa: D104
+from .cache import LRUCache
+from .cache import SizedCache
+from .cache import SizedCacheInfo
 from .html import strip_tags
 from .text import truncate_chars
 from .text import truncate_words
 
 __all__ = (
+    "CacheInfo",
     "LRUCache",
+    "SizedCache",
+    "SizedCacheInfo",
     "strip_tags",
     "truncate_chars",
     "truncate_words",
@@ -1,6 +1,7 @@
-"""A simple LRU Cache implementation.
+"""A thread safe LRU cache implementation.
 
-Copied from https://github.com/pallets/jinja/blob/master/src/jinja2/utils.py
+The public interface is that of the LRU cache found in Jinja, from
+https://github.com/pallets/jinja/blob/master/src/jinja2/utils.py
 BSD-3-Clause License
 
 Copyright 2007 Pallets
@@ -32,37 +33,89 @@ OF THE POSSIBILITY OF SUCH DAMAGE.
 """
 
 import contextlib
+import sys
+from collections import OrderedDict
 from collections import abc
-from collections import deque
+from collections import defaultdict
 from threading import Lock
+from typing import NamedTuple
+from typing import Optional
+
+_MISSING = object()
+
+
+class CacheInfo(NamedTuple):
+    """Cache statistics, as returned by `LRUCache.cache_info()`.
+
+    Attributes:
+        hits: The number of successful lookups.
+        misses: The number of lookups for keys that were not in the cache.
+        evictions: The number of items removed to make room for new items.
+        capacity: The maximum number of items the cache can hold.
+        size: The current number of items in the cache.
+    """
+
+    hits: int
+    misses: int
+    evictions: int
+    capacity: int
+    size: int
+
+
+class SizedCacheInfo(NamedTuple):
+    """Cache statistics, as returned by `SizedCache.cache_info()`.
+
+    Attributes:
+        hits: The number of successful lookups.
+        misses: The number of lookups for keys that were not in the cache.
+        evictions: The number of items removed to make room for new items.
+        capacity: The maximum number of items the cache can hold, or `None` if the
+            number of items is not limited.
+        size: The current number of items in the cache.
+        max_bytes: The maximum estimated number of bytes the cache can hold.
+        nbytes: The current estimated size of all items in the cache, in bytes.
+    """
+
+    hits: int
+    misses: int
+    evictions: int
+    capacity: Optional[int]
+    size: int
+    max_bytes: int
+    nbytes: int
 
 
 class LRUCache(abc.MutableMapping):
-    """A simple LRU Cache implementation."""
+    """A least recently used cache with constant time lookups and updates.
+
+    Items are kept in an `OrderedDict`, least recently used first, so a cache hit
+    moves an item to the end of the dictionary instead of searching a queue.
 
-    # this is fast for small capacities (something below 1000) but doesn't
-    # scale.  But as long as it's only used as storage for templates this
-    # won't do any harm.
+    Reading from the cache does not acquire its lock. Looking up a key and moving
+    it to the end of the dictionary are each a single `OrderedDict` operation, and
+    a key that is evicted by another thread in between is still a hit. Updates and
+    evictions are serialized by the lock. Hit and miss counts are not, so they can
+    be slightly low when many threads read from the cache at once.
+    """
 
     def __init__(self, capacity: int):
         self.capacity = capacity
-        self._mapping = {}
-        self._queue = deque()
+        self._mapping = OrderedDict()
         self._postinit()
 
     def _postinit(self):
-        # alias all queue methods for faster lookup
-        self._popleft = self._queue.popleft
-        self._pop = self._queue.pop
-        self._remove = self._queue.remove
+        # alias methods for faster lookup
+        self._move_to_end = self._mapping.move_to_end
+        self._popitem = self._mapping.popitem
         self._wlock = Lock()
-        self._append = self._queue.append
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
 
     def __getstate__(self):  # pragma: no cover
         return {
             "capacity": self.capacity,
             "_mapping": self._mapping,
-            "_queue": self._queue,
         }
 
     def __setstate__(self, d):  # pragma: no cover
@@ -75,17 +128,26 @@ class LRUCache(abc.MutableMapping):
     def copy(self):
         """Return a shallow copy of the instance."""
         rv = self.__class__(self.capacity)
-        rv._mapping.update(self._mapping)  # noqa: SLF001
-        rv._queue.extend(self._queue)  # noqa: SLF001
+        with self._wlock:
+            rv._mapping.update(self._mapping)  # noqa: SLF001
         return rv
 
     def get(self, key: str, default: object = None):
         """Return an item from the cache dict or `default`."""
-        try:
-            return self[key]
-        except KeyError:
+        rv = self._mapping.get(key, _MISSING)
+        if rv is _MISSING:
+            self.misses += 1
             return default
 
+        # Without holding the lock, another thread might have evicted _key_ since
+        # we read its value. `contextlib.suppress` would cost more than the lock.
+        try:  # noqa: SIM105
+            self._move_to_end(key)
+        except KeyError:
+            pass
+        self.hits += 1
+        return rv
+
     def setdefault(self, key, default=None):
         """Set `default` if the key is not in the cache otherwise
         leave unchanged. Return the value of this key.
@@ -98,12 +160,18 @@ class LRUCache(abc.MutableMapping):
 
     def clear(self):
         """Clear the cache."""
-        self._wlock.acquire()
-        try:
+        with self._wlock:
             self._mapping.clear()
-            self._queue.clear()
-        finally:
-            self._wlock.release()
+
+    def cache_info(self) -> CacheInfo:
+        """Return hit, miss and eviction counts, and the size of the cache."""
+        return CacheInfo(
+            hits=self.hits,
+            misses=self.misses,
+            evictions=self.evictions,
+            capacity=self.capacity,
+            size=len(self._mapping),
+        )
 
     def __contains__(self, key):
         """Check if a key exists in this cache."""
@@ -114,7 +182,7 @@ class LRUCache(abc.MutableMapping):
         return len(self._mapping)
 
     def __repr__(self):  # pragma: no cover
-        return f"<{self.__class__.__name__} {self._mapping!r}>"
+        return f"<{self.__class__.__name__} {dict(self._mapping)!r}>"
 
     def __getitem__(self, key):
         """Get an item from the cache.
@@ -122,52 +190,36 @@ class LRUCache(abc.MutableMapping):
         Moves the item up so that it has the highest priority then.
         Raise a `KeyError` if it does not exist.
         """
-        self._wlock.acquire()
-        try:
-            rv = self._mapping[key]
-            if self._queue[-1] != key:
-                # if something removed the key from the container
-                # when we read, ignore the ValueError that we would
-                # get otherwise.
-                with contextlib.suppress(ValueError):
-                    self._remove(key)
-                self._append(key)
-            return rv
-        finally:
-            self._wlock.release()
+        rv = self.get(key, _MISSING)
+        if rv is _MISSING:
+            raise KeyError(key)
+        return rv
 
     def __setitem__(self, key, value):
         """Sets the value for an item.
 
         Moves the item up so that it has the highest priority then.
         """
-        self._wlock.acquire()
-        try:
+        with self._wlock:
             if key in self._mapping:
-                self._remove(key)
-            elif len(self._mapping) == self.capacity:
-                del self._mapping[self._popleft()]
-            self._append(key)
+                self._move_to_end(key)
+            elif len(self._mapping) >= self.capacity:
+                self._popitem(last=False)
+                self.evictions += 1
             self._mapping[key] = value
-        finally:
-            self._wlock.release()
 
     def __delitem__(self, key):
         """Remove an item from the cache dict.
 
         Raise a `KeyError` if it does not exist.
         """
-        self._wlock.acquire()
-        try:
+        with self._wlock:
             del self._mapping[key]
-            with contextlib.suppress(ValueError):
-                self._remove(key)
-        finally:
-            self._wlock.release()
 
     def items(self):
-        """Return a list of items."""
-        result = [(key, self._mapping[key]) for key in list(self._queue)]
+        """Return a list of items, most recently used first."""
+        with self._wlock:
+            result = list(self._mapping.items())
         result.reverse()
         return result
 
@@ -180,10 +232,234 @@ class LRUCache(abc.MutableMapping):
         return list(self)
 
     def __iter__(self):
-        return reversed(tuple(self._queue))
+        with self._wlock:
+            keys = list(self._mapping)
+        return reversed(keys)
 
     def __reversed__(self):
         """Iterate over the keys in the cache dict, oldest items coming first."""
-        return iter(tuple(self._queue))
+        with self._wlock:
+            return iter(list(self._mapping))
+
+    __copy__ = copy
+
+
+class SizedCache(abc.MutableMapping):
+    """A cache bounded by the estimated size of its items, in bytes.
+
+    When adding an item would take the cache over _max_bytes_, or over _capacity_
+    items, items are evicted according to _policy_. With the "lru" policy, the least
+    recently used item is evicted first. With the "lfu" policy, the least frequently
+    used item is evicted first, with ties going to the least recently used item.
+    Items larger than _max_bytes_ are never stored.
+
+    Args:
+        max_bytes: The maximum estimated number of bytes to hold in the cache.
+        capacity: An optional maximum number of items to hold in the cache.
+        policy: The eviction policy, either "lru" or "lfu".
+        sizeof: A function returning the estimated size of a cache value in bytes.
+            Defaults to `sys.getsizeof`.
+    """
+
+    def __init__(self, max_bytes, capacity=None, policy="lru", sizeof=sys.getsizeof):
+        if policy not in ("lru", "lfu"):
+            raise ValueError(f"unknown cache policy {policy!r}")
+
+        self.max_bytes = max_bytes
+        self.capacity = capacity
+        self.policy = policy
+        self.sizeof = sizeof
+        self._mapping = {}
+        self._sizes = {}
+        self._postinit()
+
+    def _postinit(self):
+        self._wlock = Lock()
+        self.nbytes = sum(self._sizes.values())
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        # Keys grouped by use count, least recently used first. With the "lru"
+        # policy, every key has a use count of 1.
+        self._counts = {}
+        self._buckets = defaultdict(OrderedDict)
+        self._min_count = 1
+        for key in self._mapping:
+            self._counts[key] = 1
+            self._buckets[1][key] = None
+
+    def __getstate__(self):  # pragma: no cover
+        return {
+            "max_bytes": self.max_bytes,
+            "capacity": self.capacity,
+            "policy": self.policy,
+            "sizeof": self.sizeof,
+            "_mapping": self._mapping,
+            "_sizes": self._sizes,
+        }
+
+    def __setstate__(self, d):  # pragma: no cover
+        self.__dict__.update(d)
+        self._postinit()
+
+    def copy(self):
+        """Return a shallow copy of the instance, without usage statistics."""
+        rv = self.__class__(self.max_bytes, self.capacity, self.policy, self.sizeof)
+        for key in reversed(self):
+            with contextlib.suppress(KeyError):
+                rv[key] = self._mapping[key]
+        return rv
+
+    def get(self, key, default=None):
+        """Return an item from the cache dict or `default`."""
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def setdefault(self, key, default=None):
+        """Set `default` if the key is not in the cache otherwise
+        leave unchanged. Return the value of this key.
+        """  # noqa: D205
+        try:
+            return self[key]
+        except KeyError:
+            self[key] = default
+            return default
+
+    def clear(self):
+        """Clear the cache."""
+        with self._wlock:
+            self._mapping.clear()
+            self._sizes.clear()
+            self._counts.clear()
+            self._buckets.clear()
+            self._min_count = 1
+            self.nbytes = 0
+
+    def cache_info(self) -> SizedCacheInfo:
+        """Return usage statistics and the current footprint of the cache."""
+        return SizedCacheInfo(
+            hits=self.hits,
+            misses=self.misses,
+            evictions=self.evictions,
+            capacity=self.capacity,
+            size=len(self._mapping),
+            max_bytes=self.max_bytes,
+            nbytes=self.nbytes,
+        )
+
+    def __contains__(self, key):
+        """Check if a key exists in this cache."""
+        return key in self._mapping
+
+    def __len__(self):
+        """Return the current size of the cache."""
+        return len(self._mapping)
+
+    def __repr__(self):  # pragma: no cover
+        return (
+            f"<{self.__class__.__name__} policy={self.policy!r} "
+            f"nbytes={self.nbytes} {self._mapping!r}>"
+        )
+
+    def __getitem__(self, key):
+        """Get an item from the cache, updating its recency and use count.
+
+        Raise a `KeyError` if it does not exist.
+        """
+        with self._wlock:
+            try:
+                rv = self._mapping[key]
+            except KeyError:
+                self.misses += 1
+                raise
+            self._touch(key)
+            self.hits += 1
+            return rv
+
+    def __setitem__(self, key, value):
+        """Set the value for an item, evicting other items if necessary."""
+        size = self.sizeof(value)
+        with self._wlock:
+            if key in self._mapping:
+                self._remove(key)
+
+            if size > self.max_bytes:
+                return
+
+            while self._mapping and (
+                self.nbytes + size > self.max_bytes
+                or (self.capacity is not None and len(self._mapping) >= self.capacity)
+            ):
+                self._remove(next(iter(self._buckets[self._min_count])))
+                self.evictions += 1
+
+            self._mapping[key] = value
+            self._sizes[key] = size
+            self._counts[key] = 1
+            self._buckets[1][key] = None
+            self._min_count = 1
+            self.nbytes += size
+
+    def __delitem__(self, key):
+        """Remove an item from the cache dict.
+
+        Raise a `KeyError` if it does not exist.
+        """
+        with self._wlock:
+            if key not in self._mapping:
+                raise KeyError(key)
+            self._remove(key)
+
+    def _touch(self, key):
+        count = self._counts[key]
+        bucket = self._buckets[count]
+        if self.policy == "lru":
+            bucket.move_to_end(key)
+            return
+
+        del bucket[key]
+        if not bucket:
+            del self._buckets[count]
+            if self._min_count == count:
+                self._min_count = count + 1
+        self._counts[key] = count + 1
+        self._buckets[count + 1][key] = None
+
+    def _remove(self, key):
+        del self._mapping[key]
+        self.nbytes -= self._sizes.pop(key)
+        count = self._counts.pop(key)
+        bucket = self._buckets[count]
+        del bucket[key]
+        if not bucket:
+            del self._buckets[count]
+            if self._buckets and self._min_count == count:
+                self._min_count = min(self._buckets)
+
+    def items(self):
+        """Return a list of items, most valuable first."""
+        return [(key, self._mapping[key]) for key in self]
+
+    def values(self):
+        """Return a list of all values."""
+        return [x[1] for x in self.items()]
+
+    def keys(self):
+        """Return a list of all keys, most valuable first."""
+        return list(self)
+
+    def __iter__(self):
+        return reversed(list(self.__reversed__()))
+
+    def __reversed__(self):
+        """Iterate over the keys in the cache, next to be evicted coming first."""
+        with self._wlock:
+            keys = [
+                key for count in sorted(self._buckets) for key in self._buckets[count]
+            ]
+        return iter(keys)
 
     __copy__ = copy
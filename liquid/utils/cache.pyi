@@ -1,8 +1,24 @@
 from typing import Any  # noqa: D100
+from typing import Callable
 from typing import Iterator
 from typing import MutableMapping
+from typing import NamedTuple
+from typing import Optional
+
+from typing_extensions import Literal
+
+class CacheInfo(NamedTuple):  # noqa: D101
+    hits: int
+    misses: int
+    evictions: int
+    capacity: int
+    size: int
 
 class LRUCache(MutableMapping[Any, Any]):  # noqa: D101
+    capacity: int
+    hits: int
+    misses: int
+    evictions: int
     def __init__(self, capacity: int) -> None: ...
     def __getitem__(self, key: Any) -> Any: ...
     def __iter__(self) -> Iterator[Any]: ...
@@ -10,4 +26,39 @@ class LRUCache(MutableMapping[Any, Any]):  # noqa: D101
     def __setitem__(self, key: Any, value: Any) -> None: ...
     def __delitem__(self, key: Any) -> None: ...
     def copy(self) -> LRUCache: ...  # noqa: D102
+    def cache_info(self) -> CacheInfo: ...  # noqa: D102
+    def __reversed__(self) -> Iterator[Any]: ...
+
+class SizedCacheInfo(NamedTuple):  # noqa: D101
+    hits: int
+    misses: int
+    evictions: int
+    capacity: Optional[int]
+    size: int
+    max_bytes: int
+    nbytes: int
+
+class SizedCache(MutableMapping[Any, Any]):  # noqa: D101
+    max_bytes: int
+    capacity: Optional[int]
+    policy: Literal["lru", "lfu"]
+    sizeof: Callable[[Any], int]
+    nbytes: int
+    hits: int
+    misses: int
+    evictions: int
+    def __init__(
+        self,
+        max_bytes: int,
+        capacity: Optional[int] = ...,
+        policy: Literal["lru", "lfu"] = ...,
+        sizeof: Callable[[Any], int] = ...,
+    ) -> None: ...
+    def __getitem__(self, key: Any) -> Any: ...
+    def __iter__(self) -> Iterator[Any]: ...
+    def __len__(self) -> int: ...
+    def __setitem__(self, key: Any, value: Any) -> None: ...
+    def __delitem__(self, key: Any) -> None: ...
+    def copy(self) -> SizedCache: ...  # noqa: D102
+    def cache_info(self) -> SizedCacheInfo: ...  # noqa: D102
     def __reversed__(self) -> Iterator[Any]: ...
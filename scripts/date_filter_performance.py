@@ -0,0 +1,71 @@
+"""Benchmark the `date` filter with ISO 8601 and other date strings.
+
+Renders a template that formats many timestamps, like a page of order history,
+once with unique timestamps and once with timestamps that repeat across renders.
+"""
+import datetime as dt
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.getcwd())
+
+from liquid import Environment
+
+# ruff: noqa: D103 T201 E402
+
+SOURCE = (
+    "{% for order in orders %}"
+    "{{ order.created_at | date: '%b %d, %Y %H:%M' }}\n"
+    "{% endfor %}"
+)
+
+
+def make_orders(n: int, fmt: str, start: int = 0) -> dict:
+    epoch = dt.datetime(2023, 1, 1, tzinfo=dt.timezone.utc)
+    return {
+        "orders": [
+            {"created_at": (epoch + dt.timedelta(minutes=i * 7)).strftime(fmt)}
+            for i in range(start, start + n)
+        ]
+    }
+
+
+def main(number: int = 10, repeat: int = 5, n_orders: int = 1000) -> None:
+    template = Environment().from_string(SOURCE)
+    formats = {
+        "ISO 8601": "%Y-%m-%dT%H:%M:%S%z",
+        "other": "%B %d, %Y %I:%M %p",
+    }
+
+    print(
+        f"Best of {repeat} rounds with {number} renders per round "
+        f"and {n_orders} dates per render."
+    )
+
+    for name, fmt in formats.items():
+        # A new set of timestamps for every render.
+        datasets = iter(
+            [make_orders(n_orders, fmt, i * n_orders) for i in range(number * repeat)]
+        )
+        unique = timeit.repeat(
+            "template.render(next(datasets))",
+            globals={**globals(), **locals()},
+            number=number,
+            repeat=repeat,
+        )
+
+        data = make_orders(n_orders, fmt)
+        repeated = timeit.repeat(
+            "template.render(data)",
+            globals={**globals(), **locals()},
+            number=number,
+            repeat=repeat,
+        )
+
+        print(f"{name + ' (unique)':>20}: {min(unique) / number * 1000:.1f}ms")
+        print(f"{name + ' (repeated)':>20}: {min(repeated) / number * 1000:.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,7 @@
 import unittest
 from functools import partial
 from inspect import isclass
+from io import StringIO
 from typing import Any
 from typing import Dict
 from typing import Iterable
@@ -20,6 +21,7 @@ from liquid.builtin.filters.array import sort_natural
 from liquid.builtin.filters.array import sum_
 from liquid.builtin.filters.array import uniq
 from liquid.builtin.filters.array import where
+from liquid.context import Context
 from liquid.environment import Environment
 from liquid.exceptions import Error
 from liquid.exceptions import FilterArgumentError
@@ -49,6 +51,8 @@ class ArrayFilterTestCase(unittest.TestCase):
     def _test(self, func, test_cases: Iterable[Case]):
         if getattr(func, "with_environment", False):
             func = partial(func, environment=self.env)
+        if getattr(func, "with_context", False):
+            func = partial(func, context=Context(self.env))
 
         for case in test_cases:
             with self.subTest(msg=case.description):
@@ -615,10 +619,110 @@ class ArrayFilterTestCase(unittest.TestCase):
                 kwargs={},
                 expect=[{"title": "foo"}, {"title": "bar"}],
             ),
+            Case(
+                description="nested lists of objects",
+                val=[[{"title": "foo"}, {"title": "bar"}], [{"title": "bar"}]],
+                args=["title", "bar"],
+                kwargs={},
+                expect=[{"title": "bar"}, {"title": "bar"}],
+            ),
+            Case(
+                description="numeric equality",
+                val=[{"n": 1}, {"n": 1.0}, {"n": "1"}, {"n": 2}],
+                args=["n", 1],
+                kwargs={},
+                expect=[{"n": 1}, {"n": 1.0}],
+            ),
+            Case(
+                description="unhashable values",
+                val=[{"n": [1]}, {"n": [2]}, {"n": 1}],
+                args=["n", 1],
+                kwargs={},
+                expect=[{"n": 1}],
+            ),
         ]
 
         self._test(where, test_cases)
 
+    def test_where_index(self):
+        """Test that `where` reuses its index for the same array in one render."""
+        products = [
+            {"title": "a", "type": "shoe"},
+            {"title": "b", "type": "hat"},
+            {"title": "c", "type": "shoe"},
+        ]
+        context = Context(self.env)
+        self.assertEqual(
+            where(products, "type", "shoe", context=context),
+            [products[0], products[2]],
+        )
+        self.assertEqual(len(context.filter_cache), 1)
+        self.assertEqual(
+            where(products, "type", "hat", context=context),
+            [products[1]],
+        )
+        self.assertEqual(where(products, "type", "sock", context=context), [])
+        self.assertEqual(len(context.filter_cache), 1)
+
+        # The result is a copy, not the indexed list itself.
+        where(products, "type", "hat", context=context).clear()
+        self.assertEqual(
+            where(products, "type", "hat", context=context),
+            [products[1]],
+        )
+
+        template = self.env.from_string(
+            "{% assign shoes = products | where: 'type', 'shoe' %}"
+            "{% assign hats = products | where: 'type', 'hat' %}"
+            "{{ shoes | map: 'title' | join }} {{ hats | map: 'title' | join }}"
+        )
+        self.assertEqual(template.render(products=products), "a c b")
+
+    def test_where_index_is_bounded(self):
+        """Test that `where` keeps a limited number of indexes per render."""
+
+        class MockEnv(Environment):
+            filter_cache_size = 2
+
+        context = Context(MockEnv())
+        arrays = [[{"type": "shoe", "n": i}] for i in range(5)]
+        for array in arrays:
+            self.assertEqual(where(array, "type", "shoe", context=context), array)
+
+        self.assertEqual(len(context.filter_cache), 2)
+        self.assertEqual(context.filter_cache.cache_info().evictions, 3)
+
+        # Evicted indexes are rebuilt.
+        self.assertEqual(where(arrays[0], "type", "shoe", context=context), arrays[0])
+
+    def test_where_index_disabled(self):
+        """Test that we can disable the `where` filter's index."""
+
+        class MockEnv(Environment):
+            filter_cache_size = 0
+
+        context = Context(MockEnv())
+        products = [{"title": "a", "type": "shoe"}, {"title": "b", "type": "hat"}]
+        self.assertEqual(
+            where(products, "type", "hat", context=context),
+            [products[1]],
+        )
+        self.assertEqual(len(context.filter_cache), 0)
+
+    def test_map_is_not_memoized(self):
+        """Test that `map` does not keep its results in the filter cache."""
+        self.assertFalse(getattr(map_, "with_context", False))
+
+        products = [{"title": "a"}, {"title": "b"}]
+        context = Context(self.env, globals={"p": products})
+        buf = StringIO()
+        self.env.from_string("{{ p | map: 'title' | join }}").render_with_context(
+            context, buf
+        )
+        self.assertEqual(buf.getvalue(), "a b")
+        self.assertEqual(len(context.filter_cache), 0)
+        self.assertEqual(map_(products, "title"), ["a", "b"])
+
     def test_uniq(self):
         """Test `uniq` filter function."""
         test_cases = [
@@ -650,6 +754,20 @@ class ArrayFilterTestCase(unittest.TestCase):
                 kwargs={},
                 expect=["a", "b", {}],
             ),
+            Case(
+                description="mixed hashable and unhashable items",
+                val=[{"a": 1}, 1, "1", {"a": 1}, 1.0, True, {"a": 2}],
+                args=[],
+                kwargs={},
+                expect=[{"a": 1}, 1, "1", {"a": 2}],
+            ),
+            Case(
+                description="unhashable keys",
+                val=[{"k": [1]}, {"k": 1}, {"k": [1]}, {"k": [2]}, {"x": 1}, {}],
+                args=["k"],
+                kwargs={},
+                expect=[{"k": [1]}, {"k": 1}, {"k": [2]}, {"x": 1}],
+            ),
             Case(
                 description="unexpected argument",
                 val=["a", "b"],
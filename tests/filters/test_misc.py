@@ -2,6 +2,7 @@
 import datetime
 import decimal
 import platform
+import time
 import unittest
 from functools import partial
 from inspect import isclass
@@ -10,6 +11,8 @@ from typing import Dict
 from typing import List
 from typing import NamedTuple
 
+from dateutil import parser
+
 from liquid.builtin.filters.misc import date
 from liquid.builtin.filters.misc import default
 from liquid.builtin.filters.misc import size
@@ -381,6 +384,43 @@ class MiscFilterTestCase(unittest.TestCase):
 
         self._test(date, test_cases)
 
+    def test_date_iso_8601(self):
+        """Test that we parse ISO 8601 strings like dateutil does."""
+        fmt = r"%Y-%m-%d %H:%M:%S.%f %z %Z"
+        values = [
+            "2023-08-01",
+            "2023-08-01T09:30",
+            "2023-08-01 09:30:15",
+            "2023-08-01T09:30:15.5",
+            "2023-08-01T09:30:15,1234567",
+            "2023-08-01T09:30:15Z",
+            "2023-08-01t09:30:15z",
+            "2023-08-01T09:30:15+00:00",
+            "2023-08-01T09:30:15-00:00",
+            "2023-08-01T09:30:15+05:30",
+            "2023-08-01T09:30:15-0800",
+            "2023-08-01T09:30:15+01",
+        ]
+
+        for value in values:
+            with self.subTest(value=value):
+                self.assertEqual(
+                    date(value, fmt, environment=self.env),
+                    parser.parse(value).strftime(fmt),
+                )
+
+    def test_date_invalid_iso_8601(self):
+        """Test that invalid ISO 8601 strings are returned unchanged."""
+        for value in ("2023-02-30", "2023-08-01T24:00:00", "2023-13-01T09:30"):
+            with self.subTest(value=value):
+                self.assertEqual(date(value, "%Y", environment=self.env), value)
+
+    def test_date_now_is_not_cached(self):
+        """Test that we don't reuse the time for the special 'now' value."""
+        first = date("now", r"%f", environment=self.env)
+        time.sleep(0.01)
+        self.assertNotEqual(date("now", r"%f", environment=self.env), first)
+
     @unittest.skipUnless(platform.system() == "Windows", "windows specific test")
     def test_parse_timestamp_on_windows(self):
         """Test that we can handle parsing timestamps on windows."""
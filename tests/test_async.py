@@ -6,6 +6,7 @@ import unittest
 from collections import abc
 from pathlib import Path
 from typing import Dict
+from typing import List
 from typing import NamedTuple
 
 # assert_awaited* were new in Python 3.8, so we're using the backport.
@@ -13,7 +14,9 @@ from mock import patch
 
 from liquid import Environment
 from liquid import FileSystemLoader
+from liquid import Mode
 from liquid import Template
+from liquid.exceptions import NoSuchFilterFunc
 from liquid.exceptions import TemplateNotFound
 from liquid.loaders import ChoiceLoader
 from liquid.loaders import DictLoader
@@ -326,6 +329,170 @@ class AsyncDropTestCase(unittest.TestCase):
         self.assertEqual(self.drop.call_count, 1)
 
 
+class MockBatchDrop(MockAsyncDrop):
+    batch_calls: List[List[str]] = []
+
+    @classmethod
+    async def __getitems_async__(cls, drops, k):
+        # Do IO for many drops here
+        cls.batch_calls.append([drop.val for drop in drops])
+        if k == "foo":
+            return [drop.val.upper() for drop in drops]
+        raise KeyError(k)
+
+
+class BatchDropTestCase(unittest.TestCase):
+    """Test that loop items can load their properties in batches."""
+
+    def setUp(self) -> None:
+        class MockEnv(Environment):
+            async_batch_size = 50
+
+        MockBatchDrop.batch_calls = []
+        self.drops = [MockBatchDrop(f"d{i}") for i in range(5)]
+        self.env = MockEnv()
+
+    def render(self, env, source, **kwargs):
+        async def coro():
+            return await env.from_string(source).render_async(**kwargs)
+
+        return asyncio.run(coro())
+
+    def test_batch_load(self):
+        """Test that properties are loaded once per batch of loop items."""
+
+        class MockEnv(Environment):
+            async_batch_size = 2
+
+        result = self.render(
+            MockEnv(),
+            "{% for drop in drops %}{{ drop.foo }},{% endfor %}",
+            drops=self.drops,
+        )
+
+        self.assertEqual(result, "D0,D1,D2,D3,D4,")
+        self.assertEqual(
+            MockBatchDrop.batch_calls, [["d0", "d1"], ["d2", "d3"], ["d4"]]
+        )
+        self.assertEqual([drop.await_count for drop in self.drops], [0] * 5)
+
+    def test_break_loop(self):
+        """Test that we don't load batches beyond a `break`."""
+        result = self.render(
+            self.env,
+            "{% for drop in drops %}{{ drop.foo }}{% break %}{% endfor %}",
+            drops=self.drops,
+        )
+        self.assertEqual(result, "D0")
+        self.assertEqual(len(MockBatchDrop.batch_calls), 1)
+
+    def test_key_error_falls_back(self):
+        """Test that a KeyError from a batch loader falls back to single items."""
+        result = self.render(
+            self.env,
+            "{% for drop in drops %}{{ drop.bar }}{% endfor %}",
+            drops=self.drops,
+        )
+        self.assertEqual(result, "")
+        self.assertEqual(len(MockBatchDrop.batch_calls), 1)
+        self.assertEqual([drop.await_count for drop in self.drops], [1] * 5)
+
+    def test_batch_loading_is_disabled_by_default(self):
+        """Test that batch loading is disabled by default."""
+        result = self.render(
+            Environment(),
+            "{% for drop in drops %}{{ drop.foo }}{% endfor %}",
+            drops=self.drops,
+        )
+        self.assertEqual(result, "d0d1d2d3d4")
+        self.assertEqual(MockBatchDrop.batch_calls, [])
+        self.assertEqual([drop.await_count for drop in self.drops], [1] * 5)
+
+    def test_batch_keys(self):
+        """Test that we find properties of the loop variable."""
+        template = Environment().from_string(
+            "{% for drop in drops %}"
+            "{% if drop.a %}{{ drop.b | append: drop.c }}{% endif %}"
+            "{{ other.d }}{{ drop }}{{ drop[0] }}{{ drops.size }}"
+            "{% endfor %}"
+        )
+        self.assertEqual(template.tree.statements[0].batch_keys(), {"a", "b", "c"})
+
+
+class MockSlowDrop(abc.Mapping):
+    def __init__(self):
+        self.active = 0
+        self.max_active = 0
+
+    def __len__(self):  # pragma: no cover
+        return 1
+
+    def __iter__(self):  # pragma: no cover
+        return iter(["slow"])
+
+    def __getitem__(self, k):  # pragma: no cover
+        raise KeyError(k)
+
+    async def __getitem_async__(self, k):
+        self.active += 1
+        self.max_active = max(self.active, self.max_active)
+        await asyncio.sleep(0.01)
+        self.active -= 1
+        return k
+
+
+class ConcurrentRenderTestCase(unittest.TestCase):
+    """Test that consecutive partial templates can be rendered concurrently."""
+
+    def setUp(self) -> None:
+        class MockEnv(Environment):
+            render_concurrency = 2
+
+        self.env = MockEnv(
+            loader=DictLoader(
+                {
+                    "partial": "{{ drop[name] }}",
+                    "bad": "{{ drop[name] | nosuchthing }}",
+                }
+            )
+        )
+        self.drop = MockSlowDrop()
+
+    def render(self, source):
+        async def coro():
+            return await self.env.from_string(source).render_async(drop=self.drop)
+
+        return asyncio.run(coro())
+
+    def test_render_concurrently(self):
+        """Test that output is written in order."""
+        result = self.render(
+            "{% for x in (1..2) %}"
+            "{% render 'partial', drop: drop, name: 'a' %}-"
+            "{% render 'partial', drop: drop, name: 'b' %}-"
+            "{% render 'partial', drop: drop, name: 'c' %}"
+            "{% endfor %}"
+            "{% assign n = 'd' %}{% render 'partial', drop: drop, name: n %}"
+            "{% assign n = 'e' %}{% render 'partial', drop: drop, name: n %}"
+        )
+        self.assertEqual(result, "a-b-ca-b-cde")
+        self.assertEqual(self.drop.max_active, 2)
+
+    def test_errors_in_order(self):
+        """Test that errors are handled in order, according to the mode."""
+        source = (
+            "{% render 'partial', drop: drop, name: 'a' %}"
+            "{% render 'bad', drop: drop, name: 'b' %}"
+            "{% render 'partial', drop: drop, name: 'c' %}"
+        )
+
+        with self.assertRaises(NoSuchFilterFunc):
+            self.render(source)
+
+        self.env.mode = Mode.LAX
+        self.assertEqual(self.render(source), "ac")
+
+
 class AsyncMatterDictLoader(DictLoader):
     def __init__(
         self,
@@ -3,6 +3,7 @@ import tempfile
 import time
 import unittest
 from pathlib import Path
+from unittest import mock
 
 from liquid import BoundTemplate
 from liquid import CachingFileSystemLoader
@@ -155,6 +156,58 @@ class CachingFileSystemLoaderTestCase(unittest.TestCase):
             self.assertFalse(updated_template.is_up_to_date)
             self.assertEqual(template.tree, updated_template.tree)
 
+    def test_auto_reload_with_check_interval(self):
+        """Test that we can limit how often a cached template is checked."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            template_path = Path(tmpdir) / "somefile.txt"
+            template_path.write_text("hello there\n", encoding="UTF-8")
+
+            env = Environment(
+                loader=CachingFileSystemLoader(search_path=tmpdir, check_interval=0.2)
+            )
+            template = env.get_template(name="somefile.txt")
+            time.sleep(0.01)  # Make sure some time has passed.
+            template_path.write_text("goodbye\n", encoding="UTF-8")
+
+            # Within the check interval, the file system is not consulted.
+            with mock.patch.object(Path, "stat", side_effect=AssertionError("stat")):
+                self.assertTrue(template.is_up_to_date)
+                self.assertIs(env.get_template(name="somefile.txt"), template)
+
+            time.sleep(0.2)
+            self.assertFalse(template.is_up_to_date)
+            updated_template = env.get_template(name="somefile.txt")
+            self.assertEqual(updated_template.render(), "goodbye\n")
+
+            # Once out of date, always out of date.
+            self.assertFalse(template.is_up_to_date)
+
+    def test_auto_reload_with_check_interval_async(self):
+        """Test that we can limit how often a cached template is checked."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            template_path = Path(tmpdir) / "somefile.txt"
+            template_path.write_text("hello there\n", encoding="UTF-8")
+
+            env = Environment(
+                loader=CachingFileSystemLoader(search_path=tmpdir, check_interval=0.2)
+            )
+
+            async def coro() -> str:
+                template = await env.get_template_async(name="somefile.txt")
+                await asyncio.sleep(0.01)
+                template_path.write_text("goodbye\n", encoding="UTF-8")
+
+                self.assertTrue(await template.is_up_to_date_async())
+                same_template = await env.get_template_async(name="somefile.txt")
+                self.assertIs(same_template, template)
+
+                await asyncio.sleep(0.2)
+                self.assertFalse(await template.is_up_to_date_async())
+                template = await env.get_template_async(name="somefile.txt")
+                return await template.render_async()
+
+            self.assertEqual(asyncio.run(coro()), "goodbye\n")
+
     def test_load_with_args(self):
         """Test that we default to an empty namespace, ignoring extra args."""
         loader = CachingFileSystemLoader(search_path="tests/fixtures/")
@@ -0,0 +1,129 @@
+"""Compiled template test cases."""
+import pickle
+import unittest
+
+from liquid import golden
+from liquid.compiler import generate_source
+from liquid.environment import Environment
+from liquid.exceptions import Error
+from liquid.exceptions import LiquidSyntaxError
+from liquid.loaders import DictLoader
+from liquid.loaders import FileSystemLoader
+from liquid.mode import Mode
+from liquid.template import AwareBoundTemplate
+
+
+class CompilingEnvironment(Environment):
+    compile_templates = True
+    template_class = AwareBoundTemplate
+
+
+class CompiledTemplateTestCase(unittest.TestCase):
+    def test_golden(self):
+        """Test that compiled templates pass the golden test suite."""
+        for test_case in golden.test_cases:
+            for case in test_case.cases:
+                if case.future:
+                    continue
+
+                with self.subTest(msg=case.description):
+                    env = CompilingEnvironment(loader=DictLoader(case.partials))
+                    if case.error:
+                        with self.assertRaises(Error):
+                            template = env.from_string(
+                                case.template, globals=case.globals
+                            )
+                            template.render()
+                    else:
+                        template = env.from_string(case.template, globals=case.globals)
+                        self.assertEqual(template.render(), case.expect)
+
+    def test_compile_once(self):
+        """Test that templates are compiled once and reused."""
+        env = CompilingEnvironment()
+        template = env.from_string("Hello, {{ you }}!")
+        self.assertEqual(template.render(you="World"), "Hello, World!")
+        compiled = template.compiled()
+        self.assertEqual(template.render(you="Liquid"), "Hello, Liquid!")
+        self.assertIs(template.compiled(), compiled)
+
+    def test_recompile_replaced_tree(self):
+        """Test that we recompile a template if its parse tree is replaced."""
+        env = CompilingEnvironment()
+        template = env.from_string("Hello, {{ you }}!")
+        self.assertEqual(template.render(you="World"), "Hello, World!")
+        template.tree = env.parse("Goodbye, {{ you }}!")
+        self.assertEqual(template.render(you="World"), "Goodbye, World!")
+
+    def test_literals_and_statements_are_inlined(self):
+        """Test that literals and output statements are not rendered via nodes."""
+        env = Environment()
+        tree = env.parse("Hello, {{ you }}!{% increment x %}")
+        source, namespace = generate_source(tree)
+        self.assertIn("write('Hello, ')", source)
+        self.assertEqual(sorted(namespace), ["_e0", "_n1"])
+
+    def test_block_tags_are_inlined(self):
+        """Test that the blocks of built-in block tags are compiled."""
+        env = CompilingEnvironment()
+        template = env.from_string(
+            "{% for x in (1..3) %}"
+            "{% if x == 1 %}a{% elsif x == 2 %}{% continue %}{% else %}c{% endif %}"
+            "{% unless false %}{% case x %}{% when 1 %}d{% else %}e{% endcase %}"
+            "{% endunless %}"
+            "{% capture y %}{{ x }}{% endcapture %}{{ y }}"
+            "{% endfor %}"
+        )
+        source, _ = generate_source(template.tree)
+        self.assertNotIn(".render(", source)
+        self.assertEqual(template.render(), "ad1ce3")
+
+    def test_deeply_nested_blocks(self):
+        """Test that we fall back to rendering nodes nested too deeply to compile."""
+        source = "{% for i in (1..2) %}{% if true %}" * 12 + "x"
+        source += "{% endif %}{% endfor %}" * 12
+        template = CompilingEnvironment().from_string(source)
+        self.assertEqual(template.render(), "x" * 2**12)
+
+    def test_disabled_tags_in_blocks(self):
+        """Test that we check for disabled tags in compiled blocks."""
+        partials = {
+            "a": "{% if true %}{% include 'b' %}x{% endif %}y",
+            "b": "b",
+        }
+        for mode in (Mode.LAX, Mode.STRICT):
+            with self.subTest(mode=mode):
+                env = Environment(loader=DictLoader(partials), tolerance=mode)
+                compiling_env = CompilingEnvironment(
+                    loader=DictLoader(partials), tolerance=mode
+                )
+                template = "{% render 'a' %}"
+                try:
+                    expect = env.from_string(template).render()
+                except Error as err:
+                    with self.assertRaises(type(err)):
+                        compiling_env.from_string(template).render()
+                else:
+                    self.assertEqual(
+                        compiling_env.from_string(template).render(), expect
+                    )
+
+    def test_lax_errors_resume(self):
+        """Test that we resume rendering after errors in lax mode."""
+        env = CompilingEnvironment(tolerance=Mode.LAX)
+        template = env.from_string("a{{ 1 | nosuchthing }}b{% break %}c")
+        self.assertEqual(template.render(), "abc")
+
+    def test_unexpected_interrupt(self):
+        """Test that break outside a loop is a syntax error."""
+        env = CompilingEnvironment()
+        template = env.from_string("a{% break %}c")
+        with self.assertRaises(LiquidSyntaxError):
+            template.render()
+
+    def test_pickle_compiled_template(self):
+        """Test that compiled templates can be pickled."""
+        env = CompilingEnvironment(loader=FileSystemLoader("tests/fixtures/"))
+        template = env.get_template("dropify/index.liquid")
+        template.compiled()
+        pickle.dumps(template)
@@ -1,8 +1,13 @@
 """Bad context test cases."""
 
+import asyncio
+from collections import defaultdict
+from typing import Iterator
+from typing import Mapping
 from typing import NamedTuple
 from typing import Type
 from unittest import TestCase
+from unittest.mock import patch
 
 from liquid.context import UNDEFINED
 from liquid.context import ReadOnlyChainMap
@@ -94,6 +99,21 @@ class ReadOnlyChainMapTestCase(TestCase):
                 "maps": ({"bar": 1}, {"bar": 2}),
                 "expect": None,
             },
+            {
+                "description": "nested chain maps",
+                "maps": ({"bar": 1}, ReadOnlyChainMap({"baz": 1}, {"foo": 2})),
+                "expect": 2,
+            },
+            {
+                "description": "values that are None",
+                "maps": ({"foo": None}, {"foo": 2}),
+                "expect": None,
+            },
+            {
+                "description": "mappings with a custom __getitem__",
+                "maps": ({"bar": 1}, defaultdict(lambda: 3)),
+                "expect": 3,
+            },
         ]
 
         for case in test_cases:
@@ -101,6 +121,13 @@ class ReadOnlyChainMapTestCase(TestCase):
                 chain_map = ReadOnlyChainMap(*case["maps"])
                 self.assertEqual(chain_map.get("foo"), case["expect"])
 
+    def test_getitem(self):
+        """Test that missing keys raise a KeyError."""
+        chain_map = ReadOnlyChainMap({"foo": 1}, ReadOnlyChainMap({"bar": 2}))
+        self.assertEqual(chain_map["bar"], 2)
+        with self.assertRaises(KeyError):
+            chain_map["baz"]
+
     def test_iter(self):
         """Test that we can iterate a chain map."""
         chain_map = ReadOnlyChainMap({"foo": 1}, {"bar": 2}, {"foo": 3})
@@ -172,3 +199,101 @@ class BuiltinDynamicScopeTestCase(TestCase):
     def test_builtin_iter(self):
         """Test that builtin has a length."""
         self.assertEqual(list(builtin), ["now", "today"])
+
+    def test_builtin_get(self):
+        """Test that builtin has a get method that does not raise a KeyError."""
+        self.assertIsNotNone(builtin.get("now"))
+        self.assertIsNotNone(builtin.get("today"))
+        self.assertIsNone(builtin.get("foo"))
+        self.assertEqual(builtin.get("foo", 1), 1)
+
+    def test_resolve_without_key_errors(self):
+        """Test that resolving names does not raise a KeyError from any scope."""
+        env = Environment()
+        template = env.from_string(
+            "{% increment a %}{% for x in (1..2) %}{{ a }}{{ nosuchthing }}{% endfor %}"
+        )
+
+        with patch.object(type(builtin), "__getitem__", side_effect=AssertionError):
+            self.assertEqual(template.render(), "011")
+
+
+class MockProductDrop(Mapping[str, object]):
+    """A mock drop counting calls to an expensive property."""
+
+    def __init__(self, price: int):
+        self._price = price
+        self.calls = 0
+
+    def __getitem__(self, key: str) -> object:
+        if key == "price":
+            self.calls += 1
+            return self._price
+        raise KeyError(key)
+
+    async def __getitem_async__(self, key: str) -> object:
+        return self[key]
+
+    def __len__(self) -> int:
+        return 1
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(["price"])
+
+
+class MemoizedPathTestCase(TestCase):
+    """Test cases for memoized identifier paths."""
+
+    def setUp(self) -> None:
+        class MockEnvironment(Environment):
+            memoize_paths = True
+
+        self.env = MockEnvironment()
+
+    def test_memoize_paths(self):
+        """Test that a path is resolved once per render."""
+        product = MockProductDrop(5)
+        template = self.env.from_string(
+            "{{ product.price }}"
+            "{% if product.price > 1 %}{{ product.price }}{% endif %}"
+        )
+        self.assertEqual(template.render(product=product), "55")
+        self.assertEqual(product.calls, 1)
+
+        # Memoized paths are forgotten at the end of a render.
+        template.render(product=product)
+        self.assertEqual(product.calls, 2)
+
+    def test_memoize_paths_async(self):
+        """Test that a path is resolved once per async render."""
+        product = MockProductDrop(5)
+        template = self.env.from_string("{{ product.price }}{{ product.price }}")
+
+        async def coro():
+            return await template.render_async(product=product)
+
+        self.assertEqual(asyncio.run(coro()), "55")
+        self.assertEqual(product.calls, 1)
+
+    def test_rebinding_root_name(self):
+        """Test that paths are resolved again when their root name is rebound."""
+        products = [MockProductDrop(1), MockProductDrop(2)]
+        template = self.env.from_string(
+            "{% assign p = products.first %}{{ p.price }}"
+            "{% assign p = products.last %}{{ p.price }}"
+            "{% for p in products %}{{ p.price }}{{ p.price }}{% endfor %}"
+        )
+        self.assertEqual(template.render(products=products), "121122")
+        self.assertEqual([p.calls for p in products], [1, 1])
+
+    def test_volatile_objects(self):
+        """Test that paths starting at volatile objects are never memoized."""
+        template = self.env.from_string(
+            "{% for x in (1..3) %}{{ forloop.index }}{% endfor %}"
+            "{% tablerow x in (1..2) %}{{ tablerowloop.col }}{% endtablerow %}"
+        )
+        self.assertEqual(
+            template.render(),
+            "123"
+            '<tr class="row1">\n<td class="col1">1</td><td class="col2">2</td></tr>\n',
+        )
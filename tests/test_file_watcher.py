@@ -0,0 +1,183 @@
+"""File system watcher test cases."""
+import asyncio
+import pickle
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from typing import Callable
+from unittest import mock
+
+from liquid import CachingFileSystemLoader
+from liquid import Environment
+from liquid.loaders import FileSystemLoader
+from liquid.loaders import FileWatcher
+
+
+def _inotify_available() -> bool:
+    try:
+        FileWatcher([], backend="inotify").close()
+    except OSError:
+        return False
+    return True
+
+
+BACKENDS = ["poll", "inotify"] if _inotify_available() else ["poll"]
+
+
+def wait_for(func: Callable[[], bool], timeout: float = 5.0) -> bool:
+    """Return `True` as soon as _func_ does, or `False` after _timeout_ seconds."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if func():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+class FileWatcherTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmpdir = tempfile.TemporaryDirectory()
+        self.tmpdir = Path(self._tmpdir.name)
+        self.template_path = self.tmpdir / "somefile.txt"
+        self.template_path.write_text("hello there\n", encoding="utf-8")
+
+    def tearDown(self) -> None:
+        self._tmpdir.cleanup()
+
+    def test_uptodate(self):
+        """Test that a file is up to date until it changes."""
+        for backend in BACKENDS:
+            with self.subTest(backend=backend):
+                watcher = FileWatcher(
+                    [self.tmpdir], poll_interval=0.05, backend=backend
+                )
+                self.assertEqual(watcher.backend, backend)
+
+                uptodate = watcher.uptodate(self.template_path)
+                self.assertTrue(uptodate())
+
+                time.sleep(0.05)  # Give the poller a new modification time.
+                self.template_path.write_text("goodbye\n", encoding="utf-8")
+                self.assertTrue(wait_for(lambda: not uptodate()))  # noqa: B023
+
+                # A new version is up to date.
+                self.assertTrue(watcher.uptodate(self.template_path)())
+                watcher.close()
+
+    def test_new_files_in_new_directories(self):
+        """Test that we watch directories created after the watcher started."""
+        for backend in BACKENDS:
+            with self.subTest(backend=backend):
+                watcher = FileWatcher(
+                    [self.tmpdir], poll_interval=0.05, backend=backend
+                )
+                subdir = self.tmpdir / backend
+                subdir.mkdir()
+                path = subdir / "partial.txt"
+                path.write_text("hello", encoding="utf-8")
+
+                # Creating the directory might invalidate everything.
+                time.sleep(0.2)
+                uptodate = watcher.uptodate(path)
+
+                time.sleep(0.05)
+                path.write_text("goodbye", encoding="utf-8")
+                self.assertTrue(wait_for(lambda: not uptodate()))  # noqa: B023
+                watcher.close()
+
+    def test_closed_watchers_check_modification_times(self):
+        """Test that we stat files after a watcher has been closed."""
+        watcher = FileWatcher([self.tmpdir])
+        uptodate = watcher.uptodate(self.template_path)
+        self.assertTrue(uptodate())
+        watcher.close()
+        self.assertTrue(uptodate())
+
+        time.sleep(0.01)
+        self.template_path.write_text("goodbye\n", encoding="utf-8")
+        self.assertFalse(uptodate())
+
+        missing = watcher.uptodate(self.tmpdir / "nosuchthing.txt")
+        self.assertFalse(missing())
+
+    def test_pickle_watcher(self):
+        """Test that an unpickled watcher starts watching again."""
+        watcher = FileWatcher([self.tmpdir], poll_interval=0.5, backend="poll")
+        other = pickle.loads(pickle.dumps(watcher))  # noqa: S301
+        self.assertIsNot(other, watcher)
+        self.assertEqual(other.paths, watcher.paths)
+        self.assertEqual(other.poll_interval, 0.5)
+        self.assertEqual(other.backend, "poll")
+        watcher.close()
+        other.close()
+
+
+class WatchingLoaderTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmpdir = tempfile.TemporaryDirectory()
+        self.tmpdir = Path(self._tmpdir.name)
+        self.template_path = self.tmpdir / "somefile.txt"
+        self.template_path.write_text("hello there\n", encoding="utf-8")
+
+    def tearDown(self) -> None:
+        self._tmpdir.cleanup()
+
+    def test_watch_without_stat(self):
+        """Test that checking a watched template does not access the file system."""
+        loader = FileSystemLoader(search_path=self.tmpdir, watch=True)
+        self.assertIsNotNone(loader.watcher)
+        template = Environment(loader=loader).get_template("somefile.txt")
+
+        with mock.patch.object(Path, "stat", side_effect=AssertionError("stat")):
+            self.assertTrue(template.is_up_to_date)
+            self.assertTrue(asyncio.run(template.is_up_to_date_async()))
+
+        loader.close()
+
+    def test_auto_reload_watched_template(self):
+        """Test that watched templates are reloaded automatically."""
+        loader = CachingFileSystemLoader(
+            search_path=self.tmpdir, watch=True, auto_reload=True
+        )
+        env = Environment(loader=loader)
+        template = env.get_template("somefile.txt")
+        self.assertIs(env.get_template("somefile.txt"), template)
+        self.assertEqual(template.render(), "hello there\n")
+
+        time.sleep(0.01)
+        self.template_path.write_text("goodbye\n", encoding="utf-8")
+        self.assertTrue(wait_for(lambda: not template.is_up_to_date, timeout=5.0))
+
+        updated_template = env.get_template("somefile.txt")
+        self.assertIsNot(updated_template, template)
+        self.assertEqual(updated_template.render(), "goodbye\n")
+        self.assertTrue(updated_template.is_up_to_date)
+        loader.close()
+
+    def test_auto_reload_watched_template_async(self):
+        """Test that watched templates are reloaded automatically in async mode."""
+        loader = CachingFileSystemLoader(search_path=self.tmpdir, watch=True)
+        env = Environment(loader=loader)
+
+        async def coro() -> str:
+            template = await env.get_template_async("somefile.txt")
+            self.assertTrue(await template.is_up_to_date_async())
+            self.template_path.write_text("goodbye\n", encoding="utf-8")
+
+            deadline = time.monotonic() + 5.0
+            while await template.is_up_to_date_async():
+                self.assertLess(time.monotonic(), deadline)
+                await asyncio.sleep(0.01)
+
+            template = await env.get_template_async("somefile.txt")
+            return await template.render_async()
+
+        self.assertEqual(asyncio.run(coro()), "goodbye\n")
+        loader.close()
+
+    def test_not_watching_by_default(self):
+        """Test that loaders don't watch the file system unless asked to."""
+        loader = FileSystemLoader(search_path=self.tmpdir)
+        self.assertIsNone(loader.watcher)
+        loader.close()
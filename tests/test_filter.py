@@ -1,5 +1,6 @@
 """Test filter decorators and helpers."""
 import asyncio
+import pickle
 from unittest import TestCase
 
 from liquid import Context
@@ -130,3 +131,45 @@ class AsyncFilterTestCase(TestCase):
 
         result = asyncio.run(coro())
         self.assertEqual(result, "Goodbye, World!")
+
+
+class BoundFilterTestCase(TestCase):
+    def test_reuse_bound_filter(self):
+        """Test that filters are resolved once and reused between renders."""
+        env = Environment(strict_filters=True)
+        env.add_filter("some", some_filter)
+        template = env.from_string(r"{{ 'Hello, ' | some: 'you' }}")
+        self.assertEqual(template.render(you="World"), "Hello, World")
+
+        _filter = template.tree.statements[0].expression.filters[0]
+        bound = _filter.bound
+        self.assertIsNotNone(bound)
+        self.assertTrue(bound.with_context)
+
+        self.assertEqual(template.render(you="Liquid"), "Hello, Liquid")
+        self.assertIs(_filter.bound, bound)
+
+    def test_add_filter_replaces_bound_filter(self):
+        """Test that replacing a registered filter rebinds existing templates."""
+        env = Environment(strict_filters=True)
+        env.add_filter("greeting", SomeFilter())
+        template = env.from_string(r"{{ you | greeting }}")
+        self.assertEqual(template.render(you="World"), "Hello, World")
+
+        env.add_filter("greeting", lambda val: "Hi, " + str(val))
+        self.assertEqual(template.render(you="World"), "Hi, World")
+
+        async def coro() -> str:
+            return await template.render_async(you="World")
+
+        self.assertEqual(asyncio.run(coro()), "Hi, World")
+
+    def test_bound_filters_are_not_pickled(self):
+        """Test that we can pickle a template with bound filters."""
+        env = Environment()
+        env.add_filter("greeting", lambda val: "Hi, " + str(val))
+        template = env.from_string(r"{{ you | greeting }}")
+        self.assertEqual(template.render(you="World"), "Hi, World")
+
+        tree = pickle.loads(pickle.dumps(template.tree))  # noqa: S301
+        self.assertIsNone(tree.statements[0].expression.filters[0].bound)
@@ -0,0 +1,256 @@
+"""Test cases for reparsing edited templates."""
+import unittest
+from typing import Iterable
+from typing import Iterator
+from typing import Tuple
+
+from liquid import Environment
+from liquid import Mode
+from liquid import StrictUndefined
+from liquid.ast import Node
+from liquid.ast import ParseTree
+from liquid.exceptions import LiquidSyntaxError
+from liquid.exceptions import UndefinedError
+from liquid.extra import add_inheritance_tags
+from liquid.incremental import TextEdit
+from liquid.incremental import parse
+from liquid.incremental import reparse
+from liquid.loaders import DictLoader
+from liquid.token import Token
+
+SOURCE = """\
+<h1>{{ title }}</h1>
+{%- if products %}
+  <ul>
+  {% for product in products %}
+    <li>{{ product.title | upcase }}</li>
+  {% endfor %}
+  </ul>
+{%- else -%}
+  nothing
+{% endif %}
+{% comment %}{{ not rendered }}{% endcomment %}
+{% assign total = products | size %}
+{{ total }} product{% if total != 1 %}s{% endif %}
+{% raw %}{{ raw }}{% endraw %}
+<p>{{ footer | default: 'bye' }}</p>
+"""
+
+
+def replace(tree: ParseTree, old: str, new: str) -> TextEdit:
+    """Return an edit replacing the first occurrence of _old_ in _tree_'s source."""
+    assert tree.source_map is not None
+    return TextEdit(tree.source_map.source.index(old), len(old), new)
+
+
+def tokens(nodes: Iterable[Node]) -> Iterator[Token]:
+    """Yield the token of each node in _nodes_, and their descendants."""
+    for node in nodes:
+        yield node.token()
+        for child in node.children():
+            if child.node is not None:
+                yield from tokens([child.node])
+
+
+class IncrementalParseTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self.env = Environment(tolerance=Mode.STRICT)
+
+    def assert_reparsed(self, tree: ParseTree, *edits: Tuple[str, str]) -> ParseTree:
+        """Replace text in _tree_'s source, checking each edit against a full parse.
+
+        Each edit is a pair of strings, the first occurrence of which is replaced by
+        the second.
+        """
+        for old, new in edits:
+            tree = reparse(self.env, tree, replace(tree, old, new))
+            assert tree.source_map is not None
+            expect = self.env.parse(tree.source_map.source)
+            self.assertEqual(str(tree), str(expect))
+            self.assertEqual(
+                list(tokens(tree.statements)), list(tokens(expect.statements))
+            )
+            self.assertEqual(
+                tree.source_map, parse(self.env, tree.source_map.source).source_map
+            )
+        return tree
+
+    def test_parse(self) -> None:
+        """Test that we can parse a template ready to be reparsed."""
+        tree = parse(self.env, SOURCE)
+        self.assertEqual(str(tree), str(self.env.parse(SOURCE)))
+        assert tree.source_map is not None
+        self.assertEqual(tree.source_map.source, SOURCE)
+        self.assertEqual(len(tree.source_map.starts or []), len(tree.statements))
+
+    def test_edit_statement(self) -> None:
+        """Test that we reuse statements before and after an edit."""
+        tree = parse(self.env, SOURCE)
+        new_tree = self.assert_reparsed(tree, ("total }}", "count }}"))
+
+        self.assertEqual(len(new_tree.statements), len(tree.statements))
+        changed = [
+            i
+            for i, (old, new) in enumerate(zip(tree.statements, new_tree.statements))
+            if old is not new
+        ]
+        self.assertLessEqual(len(changed), 3)
+        self.assertIs(new_tree.statements[0], tree.statements[0])
+        self.assertIs(new_tree.statements[-1], tree.statements[-1])
+
+    def test_insert_and_remove_lines(self) -> None:
+        """Test that nodes following an edit get new line numbers."""
+        tree = parse(self.env, SOURCE)
+        new_tree = self.assert_reparsed(tree, ("<h1>", "<h1>\n\n"))
+        self.assertIsNot(new_tree.statements[-1], tree.statements[-1])
+        self.assertEqual(
+            new_tree.statements[-1].token().linenum,
+            tree.statements[-1].token().linenum + 2,
+        )
+
+        # The original tree is unchanged.
+        self.assertEqual(tree.statements[-1].token().linenum, 15)
+
+        self.assert_reparsed(new_tree, ("<h1>\n\n", "<h1>"), ("</ul>\n", "</ul>"))
+
+    def test_render_errors_report_new_line_numbers(self) -> None:
+        """Test that render errors from relocated nodes have the right line number."""
+        env = Environment(undefined=StrictUndefined, tolerance=Mode.STRICT)
+        tree = parse(env, "a\n{{ b }}\n{{ nosuchthing }}")
+        tree = reparse(env, tree, TextEdit(0, 1, "a\n\n"))
+        template = env.template_class(env, tree)
+
+        with self.assertRaises(UndefinedError) as raised:
+            template.render(b="b")
+        self.assertEqual(raised.exception.linenum, 5)
+
+    def test_whitespace_control(self) -> None:
+        """Test that we handle edits to whitespace control."""
+        tree = parse(self.env, SOURCE)
+        self.assert_reparsed(
+            tree,
+            ("{% comment %}", "{%- comment %}"),
+            ("{%- else -%}", "{%- else %}"),
+            ("{{ total }}", "{{ total -}}"),
+            ("{{ total -}}", "{{- total }}"),
+            ("<h1>{{", "<h1>{{-"),
+            ("{%- if products %}", "{% if products %}"),
+            ("</p>\n", "</p>\n{%- if x -%} a {%- endif -%}"),
+        )
+
+    def test_change_blocks(self) -> None:
+        """Test that we handle edits that move, add and remove end tags."""
+        tree = parse(self.env, SOURCE)
+        self.assert_reparsed(
+            tree,
+            # The comment includes everything that follows it.
+            ("{% endcomment %}", ""),
+            ("rendered }}", "rendered }}{% endcomment %}"),
+            # The `if` block includes the comment.
+            (
+                "{% endif %}\n{% comment %}{{ not rendered }}{% endcomment %}",
+                "\n{% comment %}{{ not rendered }}{% endcomment %}{% endif %}",
+            ),
+        )
+
+        # An `if` tag without an `endif` tag.
+        source = SOURCE.replace("{% raw %}", "{% if x %}{% raw %}")
+        with self.assertRaises(LiquidSyntaxError) as expected:
+            self.env.parse(source)
+        with self.assertRaises(LiquidSyntaxError) as raised:
+            reparse(self.env, tree, replace(tree, "{% raw %}", "{% if x %}{% raw %}"))
+        self.assertEqual(str(raised.exception), str(expected.exception))
+
+    def test_edit_every_character(self) -> None:
+        """Test that we can delete, replace and insert at every offset."""
+        tree = parse(self.env, SOURCE)
+
+        for offset in range(len(SOURCE)):
+            for edit in (
+                TextEdit(offset, 0, "x"),
+                TextEdit(offset, 0, "\n"),
+                TextEdit(offset, min(1, len(SOURCE) - offset), ""),
+                TextEdit(offset, min(3, len(SOURCE) - offset), "-"),
+            ):
+                with self.subTest(edit=edit):
+                    try:
+                        expect = self.env.parse(edit.apply(SOURCE))
+                    except LiquidSyntaxError as err:
+                        with self.assertRaises(LiquidSyntaxError) as raised:
+                            reparse(self.env, tree, edit)
+                        self.assertEqual(str(raised.exception), str(err))
+                        continue
+
+                    new_tree = reparse(self.env, tree, edit)
+                    self.assertEqual(str(new_tree), str(expect))
+                    self.assertEqual(
+                        list(tokens(new_tree.statements)),
+                        list(tokens(expect.statements)),
+                    )
+
+    def test_custom_delimiters(self) -> None:
+        """Test that we can reparse templates with custom delimiters."""
+        self.env = Environment(
+            tolerance=Mode.STRICT,
+            tag_start_string="[%",
+            tag_end_string="%]",
+            statement_start_string="[[",
+            statement_end_string="]]",
+            comment_start_string="[#",
+            comment_end_string="#]",
+        )
+        source = "a [# b #] [[ c ]]\n[%- if d -%] e [% endif %] [#- f -#] g"
+        tree = parse(self.env, source)
+        self.assert_reparsed(
+            tree,
+            (" e ", "\n[[ e ]]"),
+            (" g", "-#] g"),
+            ("-#] g", " g"),
+            ("[#- f", "[# x #][#- f"),
+            ("[[ c ]]", "[[- c ]]"),
+        )
+
+    def test_fall_back_to_full_parse(self) -> None:
+        """Test that we can reparse templates when nodes can't be reused."""
+        envs = [
+            Environment(tolerance=Mode.LAX),
+            Environment(tolerance=Mode.STRICT),
+        ]
+        envs[1].optimize_templates = True
+
+        for env in envs:
+            with self.subTest(env=env):
+                tree = parse(env, SOURCE)
+                assert tree.source_map is not None
+                self.assertIsNone(tree.source_map.starts)
+
+                offset = SOURCE.index("total }}")
+                new_tree = reparse(env, tree, TextEdit(offset, 5, "count"))
+                expect = env.parse(SOURCE.replace("total }}", "count}}"))
+                self.assertEqual(str(new_tree), str(expect))
+
+    def test_invalid_edits(self) -> None:
+        """Test that we raise a ValueError for edits that are out of range."""
+        tree = parse(self.env, "hello")
+        for edit in (TextEdit(-1, 0, ""), TextEdit(3, 3, ""), TextEdit(0, -1, "")):
+            with self.subTest(edit=edit), self.assertRaises(ValueError):
+                reparse(self.env, tree, edit)
+
+        with self.assertRaises(ValueError):
+            reparse(self.env, self.env.parse("hello"), TextEdit(0, 0, ""))
+
+    def test_edit_extending_template(self) -> None:
+        """Test that block stacks are not reused by edited templates."""
+        env = Environment(
+            loader=DictLoader({"base": "{% block content %}base{% endblock %}"})
+        )
+        add_inheritance_tags(env)
+
+        source = "{% extends 'base' %}\n{% block content %}hello{% endblock %}"
+        tree = parse(env, source)
+        self.assertEqual(env.template_class(env, tree).render(), "hello")
+
+        edit = TextEdit(source.index("hello"), 5, "goodbye")
+        new_tree = reparse(env, tree, edit)
+        self.assertIs(new_tree.statements[0], tree.statements[0])
+        self.assertEqual(env.template_class(env, new_tree).render(), "goodbye")
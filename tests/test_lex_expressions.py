@@ -0,0 +1,244 @@
+"""Test that expressions lexed by the template lexer match those lexed by tags."""
+
+import random
+import re
+import unittest
+from pathlib import Path
+from typing import Callable
+from typing import Iterator
+from typing import List
+from typing import Tuple
+from typing import Union
+from unittest import mock
+
+from liquid import Environment
+from liquid.ast import ParseTree
+from liquid.exceptions import LiquidSyntaxError
+from liquid.expressions.boolean import tokenize as tokenize_boolean
+from liquid.expressions.common import Token
+from liquid.expressions.filtered import tokenize as tokenize_filtered
+from liquid.expressions.lexed import EXPRESSION_BOOLEAN
+from liquid.expressions.lexed import EXPRESSION_FILTERED
+from liquid.expressions.lexed import EXPRESSION_LOOP
+from liquid.expressions.lexed import lex_expression
+from liquid.expressions.lexed import tokenize as tokenize_lexed
+from liquid.expressions.loop import tokenize as tokenize_loop
+from liquid.mode import Mode
+from liquid.token import Token as TemplateToken
+from tests.mocks.tags.form_tag import CommentFormTag
+from tests.mocks.tags.paginate_tag import PaginateTag
+
+Result = Union[List[Token], Tuple[str, int]]
+
+EXPRESSIONS = [
+    "",
+    "x",
+    "'hello' | upcase",
+    "x | default: 'y', allow_false: true",
+    "a.b[0]['c d'].e | join: ', '",
+    "x | t: a: 1, b: 2",
+    "(1..x.size) | sum",
+    "1.5 | plus: -2",
+    "x == 1 and y != 'z' or not w",
+    "x contains 'y'",
+    "x <> y",
+    "x >= y",
+    "x => y",
+    "x =! y",
+    "x = y",
+    "x.size > 0",
+    "item in collection limit:2 offset:continue reversed",
+    "i in (1..5) cols:2",
+    "item in items | sort",
+    "x || y",
+    "x || upcase",
+    "x ||| y",
+    "x, y",
+    "x : y",
+    "x | y",
+    "x @ y",
+    "x\n| upcase\n| append: '\n\n'\n| foo: &",
+    "'multi\nline' == x\n and y\n!",
+    "['a\nb'] | x\n\n,",
+    "[\n0\n] < 1 ;",
+    "true false nil null empty blank",
+    "a-b? with as for if else",
+    "x..y",
+    "1.2.3",
+    "1..",
+    "-",
+    "'unclosed",
+    "x[0",
+    "x\r\n|\tupcase",
+]
+
+ALPHABET = "xy1.-'\"[]()|,:=<>!& \n"
+
+
+def _tokens(tokens: Iterator[Token]) -> Result:
+    try:
+        return list(tokens)
+    except LiquidSyntaxError as err:
+        return (str(err), err.linenum or 0)
+
+
+def _str(tree: ParseTree) -> str:
+    # Some mock tags don't implement `__str__`.
+    return re.sub(r" at 0x[0-9a-f]+", "", str(tree))
+
+
+def _lex(source: str, kind: str) -> Iterator[Token]:
+    # Lex an expression embedded in a template, like the template lexer does.
+    template = "{{ " + source + " }}"
+    return tokenize_lexed(lex_expression(template, 3, 3 + len(source), kind))
+
+
+class LexExpressionsTestCase(unittest.TestCase):
+    """Test cases for expression tokens produced by the template lexer."""
+
+    kinds: List[Tuple[str, Callable[[str], Iterator[Token]]]] = [
+        (EXPRESSION_FILTERED, tokenize_filtered),
+        (EXPRESSION_BOOLEAN, tokenize_boolean),
+        (EXPRESSION_LOOP, tokenize_loop),
+    ]
+
+    def assert_tokens_match(self, source: str) -> None:
+        for kind, tokenize in self.kinds:
+            with self.subTest(kind=kind, source=source):
+                self.assertEqual(_tokens(_lex(source, kind)), _tokens(tokenize(source)))
+
+    def test_expressions(self) -> None:
+        """Test that lexed expressions match string expressions."""
+        for source in EXPRESSIONS:
+            self.assert_tokens_match(source)
+
+    def test_random_expressions(self) -> None:
+        """Test that lexed random expressions match string expressions."""
+        rng = random.Random(8)  # noqa: S311
+        for _ in range(2000):
+            source = "".join(rng.choice(ALPHABET) for _ in range(rng.randint(1, 12)))
+            self.assert_tokens_match(source)
+
+
+class LexExpressionsTemplateTestCase(unittest.TestCase):
+    """Test cases for templates parsed with `Environment.lex_expressions`."""
+
+    def setUp(self) -> None:
+        class LexingEnvironment(Environment):
+            lex_expressions = True
+
+        self.env = Environment(tolerance=Mode.STRICT)
+        self.lexing_env = LexingEnvironment(tolerance=Mode.STRICT)
+
+        for env in (self.env, self.lexing_env):
+            env.add_tag(CommentFormTag)
+            env.add_tag(PaginateTag)
+
+    def assert_parse_matches(self, source: str) -> None:
+        try:
+            expect = _str(self.env.parse(source))
+        except LiquidSyntaxError as err:
+            with self.assertRaises(LiquidSyntaxError) as raised:
+                self.lexing_env.parse(source)
+            self.assertEqual(str(raised.exception), str(err))
+            self.assertEqual(raised.exception.linenum, err.linenum)
+        else:
+            self.assertEqual(_str(self.lexing_env.parse(source)), expect)
+
+    def test_fixtures(self) -> None:
+        """Test that fixture templates parse the same with lexed expressions."""
+        paths = sorted(Path("tests/fixtures").rglob("*.liquid"))
+        self.assertTrue(paths)
+        for path in paths:
+            with self.subTest(path=str(path)):
+                self.assert_parse_matches(path.read_text(encoding="utf-8"))
+
+    def test_templates(self) -> None:
+        """Test that templates parse the same with lexed expressions."""
+        templates = [
+            "{{ x | upcase }}{% if x > 1 %}a{% elsif y %}b{% endif %}",
+            "{% unless x contains 'y' %}{{ x }}{% endunless %}",
+            "{% for x in y limit: 2 %}{{ x }}{% else %}z{% endfor %}",
+            "{% tablerow x in (1..y) cols:2 %}{{ x }}{% endtablerow %}",
+            "{% if x %}{{ x }}{% endif %}{{ x }}",
+            "{% assign x = y | default: 'z' %}{% echo x | upcase %}",
+            "{% liquid\nif x\necho x | upcase\nendif %}",
+            "{% case x %}{% when 1, 2 %}a{% endcase %}",
+        ]
+        for template in templates:
+            with self.subTest(template=template):
+                self.assert_parse_matches(template)
+
+    def test_syntax_errors(self) -> None:
+        """Test that syntax errors match with lexed expressions."""
+        templates = [
+            "{{ x @ y }}",
+            "{{ x || y }}",
+            "{{ x == y }}",
+            "a\n{{ x\n| upcase\n| & }}",
+            "{% if x, y %}a{% endif %}",
+            "{% if x |  y %}a{% endif %}",
+            "{% if x => y %}a{% endif %}",
+            "\n\n{% if x %}a{% elsif\n'y\n' ; %}b{% endif %}",
+            "{% unless x ! %}a{% endunless %}",
+            "{% for x in y == z %}{% endfor %}",
+            "{% for x y %}{% endfor %}",
+            "{% tablerow x in y &  %}{% endtablerow %}",
+        ]
+        for template in templates:
+            with self.subTest(template=template):
+                self.assert_parse_matches(template)
+
+    def test_expressions_are_lexed_once(self) -> None:
+        """Test that built-in tags don't lex lexed expressions again."""
+        source = (
+            "{% for x in y %}{% if x %}{{ x }}{% endif %}{% endfor %}"
+            "{% unless x %}{% tablerow x in y %}{% endtablerow %}{% endunless %}"
+        )
+        lexed_again = AssertionError("expression lexed again")
+
+        with mock.patch.object(
+            self.lexing_env, "parse_boolean_expression_value", side_effect=lexed_again
+        ), mock.patch.object(
+            self.lexing_env, "parse_filtered_expression_value", side_effect=lexed_again
+        ), mock.patch.object(
+            self.lexing_env, "parse_loop_expression_value", side_effect=lexed_again
+        ):
+            template = self.lexing_env.parse(source)
+
+        self.assertEqual(str(template), str(self.env.parse(source)))
+
+    def test_custom_tokenizer(self) -> None:
+        """Test that expressions are lexed by tags when using a custom tokenizer."""
+        source = "{% if x %}{{ x | upcase }}{% endif %}"
+        tokenize = self.lexing_env.tokenizer()
+
+        def custom_tokenizer(source: str) -> Iterator[TemplateToken]:
+            return tokenize(source)
+
+        with mock.patch.object(
+            self.lexing_env, "tokenizer", return_value=custom_tokenizer
+        ), mock.patch(
+            "liquid.lex.lex_expression",
+            side_effect=AssertionError("expression lexed by template lexer"),
+        ):
+            template = self.lexing_env.parse(source)
+
+        self.assertEqual(str(template), str(self.env.parse(source)))
+
+
+    def test_expression_cache(self) -> None:
+        """Test that expressions are lexed by tags when expression caching is on."""
+        source = "{% if x %}{{ x | upcase }}{% endif %}"
+        self.lexing_env.set_expression_cache_size(10)
+
+        with mock.patch(
+            "liquid.lex.lex_expression",
+            side_effect=AssertionError("expression lexed by template lexer"),
+        ):
+            template = self.lexing_env.parse(source)
+
+        self.assertEqual(str(template), str(self.env.parse(source)))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -281,6 +281,18 @@ class LexFilteredExpressionTestCase(unittest.TestCase):
                 Token(1, TOKEN_RPAREN, ")"),
             ],
         ),
+        Case(
+            "multi-line expression",
+            "'foo\nbar'\n| append: a[\n0\n]",
+            [
+                Token(2, TOKEN_STRING, "foo\nbar"),
+                Token(3, TOKEN_PIPE, "|"),
+                Token(3, TOKEN_IDENTIFIER, "append"),
+                Token(3, TOKEN_COLON, ":"),
+                Token(3, TOKEN_IDENTIFIER, "a"),
+                Token(5, TOKEN_IDENTINDEX, "0"),
+            ],
+        ),
     ]
 
     def test_standard_lexer(self) -> None:
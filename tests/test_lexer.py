@@ -1,4 +1,7 @@
 """Test tokenizing of liquid templates and expressions."""
+import random
+import re
+import time
 from typing import Any
 from typing import NamedTuple
 from unittest import TestCase
@@ -8,6 +11,7 @@ from liquid.exceptions import LiquidSyntaxError
 
 # Note: These are the legacy expression lexers.
 # See test_lex_*_expression.py for current, built-in lexer test cases.
+from liquid.lex import compile_liquid_rules
 from liquid.lex import get_lexer
 from liquid.lex import tokenize_boolean_expression
 from liquid.lex import tokenize_filtered_expression
@@ -65,6 +69,47 @@ class Case(NamedTuple):
     expect: Any
 
 
+def reference_liquid_rules(*delimiters: str) -> "re.Pattern[str]":
+    """Compile template lexer rules using lazy dot patterns for comparison.
+
+    _delimiters_ are the same as the arguments to `compile_liquid_rules()`.
+    """
+    tag_s, tag_e, stmt_s, stmt_e, comment_s, comment_e = (
+        re.escape(d) for d in (*delimiters, "", "")[:6]
+    )
+
+    rules = [
+        (
+            "RAW",
+            (
+                rf"{tag_s}-?\s*raw\s*(?P<rsr>-?){tag_e}(?P<raw>.*?)"
+                rf"{tag_s}-?\s*endraw\s*(?P<rsr_e>-?){tag_e}"
+            ),
+        ),
+        ("statement", rf"{stmt_s}-?\s*(?P<stmt>.*?)\s*(?P<rss>-?){stmt_e}"),
+        (
+            "TAG",
+            (
+                rf"{tag_s}-?(?P<pre>\s*(?P<name>#|\w*)\s*)(?P<expr>.*?)\s*"
+                rf"(?P<rst>-?){tag_e}"
+            ),
+        ),
+    ]
+
+    starts = [tag_s, stmt_s]
+    if comment_s:
+        starts.append(comment_s)
+        rules.insert(
+            1, ("COMMENT", rf"{comment_s}(?P<comment>.*?)(?P<rsc>-?){comment_e}")
+        )
+
+    rules.append(
+        ("literal", rf".+?(?=(({'|'.join(starts)})(?P<rstrip>-?))|$)"),
+    )
+    pattern = "|".join(f"(?P<{name}>{pattern})" for name, pattern in rules)
+    return re.compile(pattern, re.DOTALL)
+
+
 class LiquidLexerTestCase(TestCase):
     """Liquid lexer test cases."""
 
@@ -284,10 +329,78 @@ class LiquidLexerTestCase(TestCase):
                     Token(1, TOKEN_EXPRESSION, "this is a comment"),
                 ],
             ),
+            Case(
+                "template literal containing delimiter characters",
+                "a { b % c } d}\n{ {{ x }}",
+                [
+                    Token(1, TOKEN_LITERAL, "a { b % c } d}\n{ "),
+                    Token(2, TOKEN_STATEMENT, "x"),
+                ],
+            ),
+            Case(
+                "expressions containing end delimiter characters",
+                "{{ a - b % c }}{% assign x = '%-}' -%}\n",
+                [
+                    Token(1, TOKEN_STATEMENT, "a - b % c"),
+                    Token(1, TOKEN_TAG, "assign"),
+                    Token(1, TOKEN_EXPRESSION, "x = '%-}'"),
+                ],
+            ),
         ]
 
         self._test(test_cases)
 
+    def test_lex_template_like_lazy_patterns(self):
+        """Test that template lexer rules match the same text as lazy dot patterns."""
+        delimiters = [
+            ("{%", "%}", "{{", "}}"),
+            ("{%", "%}", "{{", "}}", "{#", "#}"),
+            ("[%", "%]", "[[", "]]", "[#", "#]"),
+        ]
+        alphabet = list("ab -{}[]%#\n\t") + [
+            "{{",
+            "}}",
+            "{%",
+            "%}",
+            "-}}",
+            "-%}",
+            "{#",
+            "#}",
+            "raw",
+            "endraw",
+        ]
+        rng = random.Random(8)  # noqa: S311
+
+        for args in delimiters:
+            rules = compile_liquid_rules(*args)
+            reference = reference_liquid_rules(*args)
+            for _ in range(2000):
+                source = "".join(rng.choices(alphabet, k=rng.randint(0, 16)))
+                with self.subTest(delimiters=args, source=source):
+                    self.assertEqual(
+                        [(m.span(), m.groupdict()) for m in rules.finditer(source)],
+                        [(m.span(), m.groupdict()) for m in reference.finditer(source)],
+                    )
+
+    def test_lex_unterminated_template_markup(self):
+        """Test that unterminated tags and output statements are lexed quickly."""
+        rules = compile_liquid_rules("{%", "%}", "{{", "}}", "{#", "#}")
+        sources = [
+            "-{{endrawraw{raw{{commenta bx{%{#",
+            "{{" + "ab{" * 10000,
+            "{{" + "a -}" * 10000,
+            "{%" + "ab%" * 10000,
+            "{%" + " - %" * 10000,
+            "{#" + "ab#" * 10000,
+            "x" + "{a" * 10000,
+        ]
+
+        for source in sources:
+            with self.subTest(source=source[:20]):
+                start = time.perf_counter()
+                list(rules.finditer(source))
+                self.assertLess(time.perf_counter() - start, 1)
+
     def test_lex_liquid_expression(self):
         """Test that the liquid expression lexer can tokenize line delimited
         expressions."""
@@ -377,6 +377,79 @@ class ChoiceLoaderTestCase(unittest.TestCase):
         with self.assertRaises(TemplateNotFound):
             env.get_template("c")
 
+    def test_list_templates(self):
+        """Test that we can list templates from a list of loaders."""
+        loader = ChoiceLoader(
+            loaders=[
+                DictLoader({"b": "", "a": ""}),
+                DictLoader({"a": "", "c": ""}),
+            ]
+        )
+        self.assertEqual(loader.list_templates(), ["a", "b", "c"])
+
+
+class ListTemplatesTestCase(unittest.TestCase):
+    """Test that loaders can list the templates they can load."""
+
+    def test_file_system_loader(self):
+        """Test that we can list files in a search path."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            (root / "snippets").mkdir()
+            (root / "index.liquid").write_text("")
+            (root / "snippets" / "a.liquid").write_text("")
+            (root / "notes.txt").write_text("")
+
+            loader = FileSystemLoader(search_path=root)
+            self.assertEqual(
+                loader.list_templates(),
+                ["index.liquid", "notes.txt", "snippets/a.liquid"],
+            )
+
+            loader = FileSystemLoader(search_path=root, template_pattern="*.liquid")
+            self.assertEqual(
+                loader.list_templates(), ["index.liquid", "snippets/a.liquid"]
+            )
+
+            loader = FileExtensionLoader(search_path=root)
+            self.assertEqual(
+                loader.list_templates(), ["index.liquid", "snippets/a.liquid"]
+            )
+
+    def test_non_template_files(self):
+        """Test that hidden files and files not matching a pattern are not listed."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            (root / "assets").mkdir()
+            (root / ".git").mkdir()
+            (root / "index.liquid").write_text("{{ x }}")
+            (root / ".index.liquid.swp").write_bytes(b"\x00\xff")
+            (root / ".git" / "HEAD.liquid").write_text("")
+            (root / "assets" / "logo.png").write_bytes(b"\x89PNG\xff")
+
+            loader = FileSystemLoader(search_path=root)
+            self.assertEqual(
+                loader.list_templates(), ["assets/logo.png", "index.liquid"]
+            )
+
+            loader = FileSystemLoader(search_path=root, template_pattern="*.liquid")
+            self.assertEqual(loader.list_templates(), ["index.liquid"])
+
+            env = Environment(loader=loader)
+            report = env.preload()
+            self.assertEqual(report.failed, {})
+            self.assertEqual(list(report.loaded), ["index.liquid"])
+
+    def test_loader_can_not_list_templates(self):
+        """Test that loaders raise NotImplementedError by default."""
+
+        class MockLoader(BaseLoader):
+            def get_source(self, _, template_name):  # pragma: no cover
+                return TemplateSource("", template_name, None)
+
+        with self.assertRaises(NotImplementedError):
+            MockLoader().list_templates()
+
 
 class FileExtensionLoaderTestCase(unittest.TestCase):
     """Test loading templates from the file system with automatic extensions."""
@@ -591,3 +664,82 @@ class BootstrapLoaderTestCase(unittest.TestCase):
         env = Environment()
         with self.assertRaises(TemplateNotFound):
             env.get_template_with_args("foo")
+
+
+class CountingLoader(DictLoader):
+    def __init__(self, templates: Dict[str, str]):
+        super().__init__(templates)
+        self.loads: Dict[str, int] = {}
+        self.uptodate = True
+
+    def get_source(self, _: Environment, template_name: str) -> TemplateSource:
+        source = super().get_source(_, template_name)
+        self.loads[template_name] = self.loads.get(template_name, 0) + 1
+        return source._replace(uptodate=lambda: self.uptodate)
+
+
+class PartialCacheTestCase(unittest.TestCase):
+    """Test that include and render tags reuse the partial templates they load."""
+
+    def setUp(self) -> None:
+        self.loader = CountingLoader({"a": "a{{ x }}", "b": "b{{ x }}"})
+        self.source = (
+            "{% for name in names %}{% for x in (1..3) %}"
+            "{% include name %}{% render 'b', x: x %}"
+            "{% endfor %}{% endfor %}"
+        )
+        self.expect = "a1b1a2b2a3b3b1b1b2b2b3b3"
+
+    def test_load_partials_once(self):
+        """Test that partial templates are loaded once, across renders."""
+        template = Environment(loader=self.loader).from_string(self.source)
+        self.assertEqual(template.render(names=["a", "b"]), self.expect)
+        self.assertEqual(template.render(names=["a", "b"]), self.expect)
+        self.assertEqual(self.loader.loads, {"a": 1, "b": 2})
+
+        async def coro():
+            return await template.render_async(names=["a", "b"])
+
+        self.assertEqual(asyncio.run(coro()), self.expect)
+        self.assertEqual(self.loader.loads, {"a": 1, "b": 2})
+
+    def test_reload_partials(self):
+        """Test that partial templates are reloaded if they are not up to date."""
+        env = Environment(loader=self.loader, auto_reload=True)
+        template = env.from_string(self.source)
+        self.assertEqual(template.render(names=["a"]), self.expect[:12])
+        self.assertEqual(self.loader.loads, {"a": 1, "b": 1})
+
+        self.loader.uptodate = False
+        self.loader.templates["a"] = "A"
+        self.assertEqual(template.render(names=["a"]), "Ab1Ab2Ab3")
+
+    def test_uncached_environment(self):
+        """Test that partial templates are not reused if caching is disabled."""
+        env = Environment(loader=self.loader, cache_size=0)
+        template = env.from_string(self.source)
+        self.assertEqual(template.render(names=["a", "b"]), self.expect)
+        self.assertEqual(self.loader.loads, {"a": 3, "b": 9})
+
+    def test_context_aware_loader(self):
+        """Test that partial templates are not reused by context aware loaders."""
+        self.assertFalse(DictLoader.context_aware)
+        self.assertTrue(MockContextLoader.context_aware)
+
+        loader = MockContextLoader({"a": "a{{ x }}"})
+        template = Environment(loader=loader).from_string("{% include 'a' %}")
+        self.assertEqual(template.render(uid=1, x=1), "a1")
+        self.assertEqual(loader.kwargs["uid"], 1)
+        self.assertEqual(template.render(uid=2, x=2), "a2")
+        self.assertEqual(loader.kwargs["uid"], 2)
+
+    def test_pickle_without_partials(self):
+        """Test that loaded partial templates are not pickled with a parse tree."""
+        template = Environment(loader=self.loader).from_string(self.source)
+        template.render(names=["a"])
+        inner_loop = template.tree.statements[0].block.statements[0]
+        self.assertEqual(len(inner_loop.block.statements[0].partials.templates), 1)
+
+        tree = pickle.loads(pickle.dumps(template.tree))  # noqa: S301
+        inner_loop = tree.statements[0].block.statements[0]
+        self.assertEqual(len(inner_loop.block.statements[0].partials.templates), 0)
@@ -0,0 +1,164 @@
+"""Parse tree optimizer test cases."""
+import unittest
+
+from liquid import Environment
+from liquid import golden
+from liquid.builtin.literal import LiteralNode
+from liquid.builtin.statement import StatementNode
+from liquid.builtin.tags.if_tag import IfNode
+from liquid.exceptions import Error
+from liquid.loaders import DictLoader
+from liquid.template import AwareBoundTemplate
+
+
+class OptimizingEnvironment(Environment):
+    optimize_templates = True
+    template_class = AwareBoundTemplate
+
+
+class OptimizerTestCase(unittest.TestCase):
+    def test_golden(self):
+        """Test that optimized templates pass the golden test suite."""
+        for test_case in golden.test_cases:
+            for case in test_case.cases:
+                if case.future:
+                    continue
+
+                with self.subTest(msg=case.description):
+                    env = OptimizingEnvironment(loader=DictLoader(case.partials))
+                    if case.error:
+                        with self.assertRaises(Error):
+                            template = env.from_string(
+                                case.template, globals=case.globals
+                            )
+                            template.render()
+                    else:
+                        template = env.from_string(case.template, globals=case.globals)
+                        self.assertEqual(template.render(), case.expect)
+
+    def test_golden_frozen_globals(self):
+        """Test that the golden test suite passes when all globals are frozen."""
+        for test_case in golden.test_cases:
+            for case in test_case.cases:
+                if case.future or case.error:
+                    continue
+
+                with self.subTest(msg=case.description):
+                    env = OptimizingEnvironment(
+                        loader=DictLoader(case.partials), globals=case.globals
+                    )
+                    env.frozen_globals = frozenset(case.globals)
+                    template = env.from_string(case.template)
+                    self.assertEqual(template.render(), case.expect)
+
+    def test_fold_literal_output(self):
+        """Test that we fold output statements with literals and pure filters."""
+        env = OptimizingEnvironment()
+        template = env.from_string("a{{ 'foo' | upcase }}b{{ 'x,y' | split: ',' }}c")
+        self.assertEqual(len(template.tree.statements), 1)
+        self.assertIsInstance(template.tree.statements[0], LiteralNode)
+        self.assertEqual(template.render(), "aFOObxyc")
+
+    def test_do_not_fold_impure_filters(self):
+        """Test that we don't fold filters that are not known to be pure."""
+        env = OptimizingEnvironment()
+        env.add_filter("upcase", lambda s: s + "!")
+        template = env.from_string("{{ 'foo' | upcase }}{{ 'now' | date: '%Y' }}")
+        self.assertEqual(len(template.tree.statements), 2)
+        self.assertTrue(
+            all(isinstance(n, StatementNode) for n in template.tree.statements)
+        )
+
+    def test_do_not_fold_with_autoescape(self):
+        """Test that we don't fold output statements when autoescape is enabled."""
+        env = OptimizingEnvironment(autoescape=True)
+        template = env.from_string("{{ '<br>' | upcase }}")
+        self.assertIsInstance(template.tree.statements[0], StatementNode)
+
+    def test_do_not_fold_errors(self):
+        """Test that errors are left until render time."""
+        env = OptimizingEnvironment()
+        template = env.from_string("{{ 1 | divided_by: 0 }}")
+        self.assertIsInstance(template.tree.statements[0], StatementNode)
+        with self.assertRaises(Error):
+            template.render()
+
+    def test_prune_frozen_globals(self):
+        """Test that we prune branches using frozen globals."""
+        env = OptimizingEnvironment(globals={"settings": {"a": True, "b": False}})
+        env.frozen_globals = frozenset(["settings"])
+        template = env.from_string(
+            "{% if settings.a %}A{% endif %}"
+            "{% unless settings.b %}B{% endunless %}"
+            "{% if settings.b %}C{% elsif settings.a %}D{% else %}E{% endif %}"
+            "{% case settings.a %}{% when false %}F{% else %}G{% endcase %}"
+        )
+        self.assertEqual(len(template.tree.statements), 1)
+        self.assertEqual(template.render(), "ABDG")
+
+    def test_do_not_prune_unknown_names(self):
+        """Test that we don't prune branches using names that are not frozen."""
+        env = OptimizingEnvironment(globals={"settings": {"a": True}})
+        template = env.from_string("{% if settings.a %}A{% endif %}")
+        self.assertIsInstance(template.tree.statements[0], IfNode)
+
+    def test_do_not_prune_assigned_names(self):
+        """Test that frozen names assigned to by a template are not constant."""
+        env = OptimizingEnvironment(globals={"settings": True})
+        env.frozen_globals = frozenset(["settings"])
+        template = env.from_string(
+            "{% assign settings = false %}{% if settings %}A{% endif %}"
+        )
+        self.assertEqual(template.render(), "")
+
+    def test_do_not_prune_with_include(self):
+        """Test that we don't use frozen names in templates that include others."""
+        env = OptimizingEnvironment(
+            globals={"settings": True},
+            loader=DictLoader({"a": "{% assign settings = false %}"}),
+        )
+        env.frozen_globals = frozenset(["settings"])
+        template = env.from_string("{% include 'a' %}{% if settings %}A{% endif %}")
+        self.assertEqual(template.render(), "")
+
+    def test_preserve_whitespace_suppression(self):
+        """Test that we don't inline branches that would have been suppressed."""
+        env = OptimizingEnvironment()
+        template = env.from_string(
+            "{% if true %} {% assign x = 1 %} {% endif %}{% if true %} a {% endif %}"
+        )
+        self.assertIsInstance(template.tree.statements[0], IfNode)
+        self.assertEqual(template.render(), " a ")
+
+    def test_do_not_inline_interrupted_blocks(self):
+        """Test that we don't inline branches that might be interrupted."""
+        env = Environment()
+        optimizing_env = OptimizingEnvironment()
+        loop = "{% for i in (1..3) %}{0}{% endfor %}"
+        sources = [
+            (loop.replace("{0}", "a{% if true %}x{% break %}{% endif %}"), "a"),
+            (loop.replace("{0}", "{% if true %}x{% continue %}{% endif %}y"), ""),
+            (
+                loop.replace(
+                    "{0}",
+                    "{% case 1 %}{% when 1 %}"
+                    "{% unless false %}x{% break %}{% endunless %}{% endcase %}",
+                ),
+                "",
+            ),
+        ]
+
+        for source, expect in sources:
+            with self.subTest(source=source):
+                template = optimizing_env.from_string(source)
+                self.assertEqual(template.render(), expect)
+                self.assertEqual(template.render(), env.from_string(source).render())
+
+    def test_inline_blocks_without_interrupts(self):
+        """Test that we still inline branches containing loops."""
+        env = OptimizingEnvironment()
+        template = env.from_string(
+            "{% if true %}a{% for i in (1..3) %}{{ i }}{% endfor %}{% endif %}"
+        )
+        self.assertIsInstance(template.tree.statements[0], LiteralNode)
+        self.assertEqual(template.render(), "a123")
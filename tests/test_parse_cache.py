@@ -0,0 +1,108 @@
+"""Persistent parse tree cache test cases."""
+import asyncio
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from liquid import CachingFileSystemLoader
+from liquid import Environment
+from liquid import FileSystemLoader
+from liquid.loaders import FileSystemParseTreeCache
+from liquid.tag import Tag
+
+
+class ParseTreeCacheTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache_dir = Path(self.tmp.name)
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def test_reuse_parse_tree_across_environments(self):
+        """Test that a new environment can reuse a previously parsed template."""
+        env = Environment(
+            loader=FileSystemLoader(
+                "tests/fixtures/",
+                parse_cache=FileSystemParseTreeCache(self.cache_dir),
+            )
+        )
+        template = env.get_template("dropify/index.liquid")
+        self.assertEqual(len(list(self.cache_dir.iterdir())), 1)
+
+        # A fresh environment, as if the process had restarted.
+        env = Environment(
+            loader=FileSystemLoader(
+                "tests/fixtures/",
+                parse_cache=FileSystemParseTreeCache(self.cache_dir),
+            )
+        )
+
+        with mock.patch.object(env, "parse") as parse:
+            cached = env.get_template("dropify/index.liquid")
+            parse.assert_not_called()
+
+        self.assertEqual(str(cached.tree), str(template.tree))
+        self.assertEqual(cached.name, "dropify/index.liquid")
+        self.assertTrue(cached.is_up_to_date)
+
+    def test_reuse_parse_tree_async(self):
+        """Test that we reuse cached parse trees when loading asynchronously."""
+        loader = CachingFileSystemLoader(
+            "tests/fixtures/", parse_cache=FileSystemParseTreeCache(self.cache_dir)
+        )
+        env = Environment(loader=loader)
+        template = env.get_template("dropify/index")
+        loader.cache.clear()
+
+        async def coro():
+            return await env.get_template_async("dropify/index")
+
+        with mock.patch.object(env, "parse") as parse:
+            cached = asyncio.run(coro())
+            parse.assert_not_called()
+
+        self.assertEqual(str(cached.tree), str(template.tree))
+
+    def test_delimiters_change_key(self):
+        """Test that environments with different delimiters don't share trees."""
+        cache = FileSystemParseTreeCache(self.cache_dir)
+        env = Environment()
+        other = Environment(statement_start_string="[[", statement_end_string="]]")
+        self.assertNotEqual(cache.key(env, "{{ a }}"), cache.key(other, "{{ a }}"))
+
+    def test_registered_tags_change_key(self):
+        """Test that registering a tag changes the cache key."""
+
+        class MockTag(Tag):
+            name = "mock"
+            block = False
+
+            def parse(self, stream):  # pragma: no cover
+                raise NotImplementedError
+
+        cache = FileSystemParseTreeCache(self.cache_dir)
+        env = Environment()
+        key = cache.key(env, "{{ a }}")
+        env.add_tag(MockTag)
+        self.assertNotEqual(cache.key(env, "{{ a }}"), key)
+
+    def test_liquid_version_changes_key(self):
+        """Test that upgrading Python Liquid invalidates cached parse trees."""
+        cache = FileSystemParseTreeCache(self.cache_dir)
+        env = Environment()
+        key = cache.key(env, "{{ a }}")
+        with mock.patch("liquid.__version__", "999.0.0"):
+            self.assertNotEqual(cache.key(env, "{{ a }}"), key)
+
+    def test_corrupt_cache_file(self):
+        """Test that corrupt cache files are ignored."""
+        cache = FileSystemParseTreeCache(self.cache_dir)
+        env = Environment()
+        cache.path(cache.key(env, "{{ a }}")).write_bytes(b"not a parse tree")
+        self.assertIsNone(cache.get(env, "{{ a }}"))
+
+        tree = env.parse("{{ a }}")
+        cache.set(env, "{{ a }}", tree)
+        self.assertEqual(str(cache.get(env, "{{ a }}")), str(tree))
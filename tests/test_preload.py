@@ -0,0 +1,110 @@
+"""Template preloading test cases."""
+import asyncio
+import unittest
+from typing import Dict
+
+from liquid import Environment
+from liquid.exceptions import LiquidSyntaxError
+from liquid.exceptions import TemplateNotFound
+from liquid.extra import add_inheritance_tags
+from liquid.loaders import BaseLoader
+from liquid.loaders import ChoiceLoader
+from liquid.loaders import DictLoader
+from liquid.loaders import FileExtensionLoader
+
+
+class MockCountingLoader(DictLoader):
+    def __init__(self, templates: Dict[str, str]):
+        super().__init__(templates)
+        self.loaded: Dict[str, int] = {}
+
+    def get_source(self, env, template_name):
+        self.loaded[template_name] = self.loaded.get(template_name, 0) + 1
+        return super().get_source(env, template_name)
+
+
+class PreloadTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self.loader = MockCountingLoader(
+            {
+                "pages/index": "{% render 'snippets/header' %}{% include 'footer' %}",
+                "pages/product": "{% extends 'layouts/base' %}",
+                "pages/broken": "{% if %}",
+                "pages/missing": "{% render 'nosuchthing' %}{% include name %}",
+                "layouts/base": "{% block content %}{% endblock %}",
+                "snippets/header": (
+                    "{% if true %}{% render 'snippets/logo' %}{% endif %}"
+                ),
+                "snippets/logo": "logo",
+                "snippets/unused": "unused",
+                "footer": "footer",
+            }
+        )
+        self.env = Environment(loader=self.loader)
+        add_inheritance_tags(self.env)
+
+    def assert_report(self, report):
+        self.assertEqual(
+            sorted(report.loaded),
+            [
+                "footer",
+                "layouts/base",
+                "pages/index",
+                "pages/missing",
+                "pages/product",
+                "snippets/header",
+                "snippets/logo",
+            ],
+        )
+        self.assertEqual(sorted(report.failed), ["nosuchthing", "pages/broken"])
+        self.assertIsInstance(report.failed["pages/broken"], LiquidSyntaxError)
+        self.assertIsInstance(report.failed["nosuchthing"], TemplateNotFound)
+        self.assertGreater(report.elapsed, 0)
+
+        # Preloaded templates are cached, and partial templates are reused by the
+        # tags that render them.
+        self.assertEqual(self.env.get_template("pages/index").render(), "logofooter")
+        self.assertEqual(self.loader.loaded["pages/index"], 1)
+        self.assertEqual(self.loader.loaded["snippets/header"], 1)
+        self.assertEqual(self.loader.loaded["snippets/logo"], 1)
+        self.assertEqual(self.loader.loaded["footer"], 1)
+        self.assertNotIn("snippets/unused", self.loader.loaded)
+
+    def test_preload(self):
+        """Test that we can preload templates and their dependencies."""
+        self.assert_report(self.env.preload("pages/*", workers=2))
+
+    def test_preload_async(self):
+        """Test that we can preload templates asynchronously."""
+
+        async def coro():
+            return await self.env.preload_async("pages/*", workers=2)
+
+        self.assert_report(asyncio.run(coro()))
+
+    def test_preload_file_system(self):
+        """Test that we can preload templates from the file system."""
+        env = Environment(loader=FileExtensionLoader(search_path="tests/fixtures/"))
+        report = env.preload("vogue/*")
+        self.assertIn("vogue/index.liquid", report.loaded)
+        self.assertIn("vogue/index.liquid", env.cache)
+        # Some fixtures use tags that are not registered with this environment.
+        self.assertIsInstance(report.failed["vogue/blog.liquid"], LiquidSyntaxError)
+
+    def test_preload_unlisted_templates(self):
+        """Test that we skip loaders that can't list their templates."""
+
+        class MockUnlistedLoader(BaseLoader):
+            def get_source(self, env, template_name):  # noqa: ARG002
+                raise TemplateNotFound(template_name)
+
+        env = Environment(loader=MockUnlistedLoader())
+        report = env.preload()
+        self.assertEqual(report.loaded, {})
+        self.assertEqual(report.failed, {})
+
+        env = Environment(
+            loader=ChoiceLoader([MockUnlistedLoader(), DictLoader({"a": "a"})])
+        )
+        report = env.preload()
+        self.assertEqual(list(report.loaded), ["a"])
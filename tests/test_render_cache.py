@@ -0,0 +1,136 @@
+"""Render cache test cases."""
+import asyncio
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from liquid import CachingFileSystemLoader
+from liquid import Environment
+from liquid.filter import impure
+from liquid.render_cache import RenderCache
+
+PARTIALS = {
+    "product": "{{ product.title | upcase }} {{ site }}",
+    "greeting": "Hello, {{ you }}!",
+    "now": "{{ 'now' | date: '%Y' }}",
+    "loop": "{{ forloop.index }}",
+}
+
+
+class RenderCacheTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        for name, source in PARTIALS.items():
+            Path(self.tmp.name, name + ".liquid").write_text(source)
+
+        # Partial templates are loaded once when using a caching loader.
+        self.env = Environment(
+            loader=CachingFileSystemLoader(self.tmp.name),
+            globals={"site": "shop"},
+        )
+        self.env.render_cache = RenderCache()
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def test_reuse_partial_output(self):
+        """Test that we reuse output from the render tag given the same inputs."""
+        template = self.env.from_string(
+            "{% for p in products %}{% render 'product', product: p %}\n{% endfor %}"
+        )
+        partial = self.env.get_template("product")
+        products = [{"title": "a"}, {"title": "b"}, {"title": "a"}]
+
+        with mock.patch.object(
+            partial, "render_with_context", wraps=partial.render_with_context
+        ) as render:
+            self.assertEqual(
+                template.render(products=products), "A shop\nB shop\nA shop\n"
+            )
+            self.assertEqual(render.call_count, 2)
+
+        info = self.env.render_cache.cache.cache_info()
+        self.assertEqual(info.hits, 1)
+        self.assertEqual(info.size, 2)
+
+    def test_globals_are_part_of_the_key(self):
+        """Test that referenced globals are part of the cache key."""
+        template = self.env.from_string("{% render 'greeting' %}")
+        self.assertEqual(template.render(you="World"), "Hello, World!")
+        self.assertEqual(template.render(you="Liquid"), "Hello, Liquid!")
+
+    def test_impure_filters_disable_caching(self):
+        """Test that templates using impure filters are not cached."""
+        template = self.env.from_string("{% render 'now' %}")
+        template.render()
+        template.render()
+        self.assertEqual(len(self.env.render_cache.cache), 0)
+
+        self.env.add_filter("shout", impure(lambda s: s.upper()))
+        template = self.env.from_string("{{ you | shout }}")
+        self.assertEqual(self.env.render_cache.render(template, you="a"), "A")
+        self.assertEqual(len(self.env.render_cache.cache), 0)
+
+    def test_drops_disable_caching(self):
+        """Test that we don't cache output for arbitrary objects."""
+
+        class MockDrop:
+            title = "a"
+
+        template = self.env.from_string("{% render 'product', product: p %}")
+        self.assertEqual(template.render(p=MockDrop()), " shop")
+        self.assertEqual(len(self.env.render_cache.cache), 0)
+
+    def test_forloop_disables_caching(self):
+        """Test that partials referencing `forloop` are not cached."""
+        template = self.env.from_string("{% render 'loop' for nums as x %}")
+        self.assertEqual(template.render(nums=[1, 2, 3]), "123")
+        self.assertEqual(len(self.env.render_cache.cache), 0)
+
+    def test_whole_template(self):
+        """Test that we can cache the output of whole templates."""
+        cache = RenderCache()
+        template = self.env.from_string("Hello, {{ you }}!")
+        self.assertEqual(cache.render(template, you="World"), "Hello, World!")
+        self.assertEqual(cache.render(template, you="World"), "Hello, World!")
+        self.assertEqual(cache.render(template, you="Liquid"), "Hello, Liquid!")
+        self.assertEqual(cache.cache.cache_info().hits, 1)
+
+    def test_whole_template_async(self):
+        """Test that we can cache the output of whole templates asynchronously."""
+        cache = RenderCache()
+        template = self.env.from_string("Hello, {{ you }}!")
+
+        async def coro():
+            return await cache.render_async(template, you="World")
+
+        self.assertEqual(asyncio.run(coro()), "Hello, World!")
+        self.assertEqual(asyncio.run(coro()), "Hello, World!")
+        self.assertEqual(cache.cache.cache_info().hits, 1)
+
+    def test_ttl(self):
+        """Test that cached output expires."""
+        cache = RenderCache(ttl=10)
+        template = self.env.from_string("Hello, {{ you }}!")
+
+        with mock.patch.object(
+            template, "render_with_context", wraps=template.render_with_context
+        ) as render:
+            with mock.patch("liquid.render_cache.time.monotonic", return_value=100):
+                cache.render(template, you="World")
+            with mock.patch("liquid.render_cache.time.monotonic", return_value=105):
+                cache.render(template, you="World")
+            self.assertEqual(render.call_count, 1)
+
+            with mock.patch("liquid.render_cache.time.monotonic", return_value=111):
+                cache.render(template, you="World")
+            self.assertEqual(render.call_count, 2)
+
+    def test_max_bytes(self):
+        """Test that we can bound the render cache by size."""
+        cache = RenderCache(max_bytes=200)
+        template = self.env.from_string("{{ you }}")
+        cache.render(template, you="a" * 100)
+        cache.render(template, you="b" * 100)
+        self.assertEqual(len(cache.cache), 1)
@@ -0,0 +1,84 @@
+"""Streaming render test cases."""
+import asyncio
+import unittest
+
+from liquid import Environment
+from liquid import golden
+from liquid.exceptions import Error
+from liquid.exceptions import LiquidSyntaxError
+from liquid.exceptions import OutputStreamLimitError
+from liquid.loaders import DictLoader
+from liquid.mode import Mode
+from liquid.template import AwareBoundTemplate
+
+
+class RenderIterTestCase(unittest.TestCase):
+    def test_golden(self):
+        """Test that streamed output matches the golden test suite."""
+        for test_case in golden.test_cases:
+            for case in test_case.cases:
+                if case.future:
+                    continue
+
+                with self.subTest(msg=case.description):
+                    env = Environment(loader=DictLoader(case.partials))
+                    env.template_class = AwareBoundTemplate
+                    if case.error:
+                        with self.assertRaises(Error):
+                            template = env.from_string(
+                                case.template, globals=case.globals
+                            )
+                            "".join(template.render_iter())
+                    else:
+                        template = env.from_string(case.template, globals=case.globals)
+                        self.assertEqual("".join(template.render_iter()), case.expect)
+
+    def test_yield_top_level_nodes(self):
+        """Test that we yield output for each top-level node."""
+        env = Environment()
+        template = env.from_string(
+            "Hello, {{ you }}!{% for x in (1..3) %}{{ x }}{% endfor %}"
+            "{% if false %} {% endif %}"
+        )
+        self.assertEqual(
+            list(template.render_iter(you="World")),
+            ["Hello, ", "World", "!", "123"],
+        )
+
+    def test_render_async_iter(self):
+        """Test that we can stream output asynchronously."""
+        env = Environment()
+        template = env.from_string("Hello, {{ you }}!")
+
+        async def coro():
+            return [chunk async for chunk in template.render_async_iter(you="World")]
+
+        self.assertEqual(asyncio.run(coro()), ["Hello, ", "World", "!"])
+
+    def test_output_stream_limit(self):
+        """Test that output stream limits apply to the whole render."""
+
+        class MockEnv(Environment):
+            output_stream_limit = 5
+
+        env = MockEnv()
+        template = env.from_string("{{ 'abc' }}{{ 'def' }}")
+        chunks = template.render_iter()
+        self.assertEqual(next(chunks), "abc")
+        with self.assertRaises(OutputStreamLimitError):
+            next(chunks)
+
+    def test_lax_errors_resume(self):
+        """Test that we continue streaming after errors in lax mode."""
+        env = Environment(tolerance=Mode.LAX)
+        template = env.from_string("a{{ 1 | nosuchthing }}b{% break %}c")
+        self.assertEqual("".join(template.render_iter()), "abc")
+
+    def test_unexpected_interrupt(self):
+        """Test that break outside a loop is a syntax error."""
+        env = Environment()
+        template = env.from_string("a{% break %}c")
+        chunks = template.render_iter()
+        self.assertEqual(next(chunks), "a")
+        with self.assertRaises(LiquidSyntaxError):
+            next(chunks)
@@ -0,0 +1,124 @@
+"""Batch rendering test cases."""
+import asyncio
+import pickle
+import unittest
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+from liquid import Environment
+from liquid import Mode
+from liquid.exceptions import OutputStreamLimitError
+from liquid.exceptions import UndefinedError
+from liquid.undefined import StrictUndefined
+
+
+class RenderManyTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self.contexts = [{"you": f"World {i}"} for i in range(50)]
+        self.expect = [f"Hello, World {i}!" for i in range(50)]
+
+    def test_render_many(self):
+        """Test that we can render a template against many contexts in order."""
+        template = Environment().from_string("Hello, {{ you }}!")
+        self.assertEqual(template.render_many(self.contexts), self.expect)
+
+    def test_render_many_with_threads(self):
+        """Test that we can render a batch using a thread pool."""
+        template = Environment().from_string("Hello, {{ you }}!")
+        self.assertEqual(template.render_many(self.contexts, workers=4), self.expect)
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            self.assertEqual(
+                template.render_many(self.contexts, executor=executor, chunksize=3),
+                self.expect,
+            )
+
+    def test_render_many_with_processes(self):
+        """Test that we can render a batch using a process pool."""
+        template = Environment().from_string("Hello, {{ you }}!")
+        self.assertEqual(
+            template.render_many(self.contexts, workers=2, processes=True),
+            self.expect,
+        )
+
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            self.assertEqual(
+                template.render_many(self.contexts, executor=executor), self.expect
+            )
+
+    def test_template_is_sent_to_each_process_once(self):
+        """Test that only render arguments are submitted with each chunk."""
+        template = Environment().from_string("Hello, {{ you }}!")
+        submitted = []
+        submit = ProcessPoolExecutor.submit
+
+        def mock_submit(executor, func, *args, **kwargs):
+            submitted.append(pickle.dumps((func, args, kwargs)))
+            return submit(executor, func, *args, **kwargs)
+
+        with patch.object(ProcessPoolExecutor, "submit", mock_submit):
+            results = template.render_many(
+                self.contexts, workers=2, processes=True, chunksize=5
+            )
+
+        self.assertEqual(results, self.expect)
+        self.assertEqual(len(submitted), 10)
+        template_size = len(pickle.dumps(template))
+        for data in submitted:
+            self.assertLess(len(data), template_size)
+
+    def test_strict_errors_do_not_stop_the_batch(self):
+        """Test that errors are returned in place of output in strict mode."""
+        env = Environment(undefined=StrictUndefined)
+        template = env.from_string("Hello, {{ you }}!")
+        contexts = [{"you": "World"}, {}, {"you": "Liquid"}]
+
+        for workers in (None, 2):
+            with self.subTest(workers=workers):
+                results = template.render_many(contexts, workers=workers)
+                self.assertEqual(results[0], "Hello, World!")
+                self.assertIsInstance(results[1], UndefinedError)
+                self.assertEqual(results[2], "Hello, Liquid!")
+
+    def test_lax_and_warn_errors(self):
+        """Test that errors are handled according to the environment's mode."""
+        source = "a{{ you | nosuchthing }}b"
+
+        env = Environment(tolerance=Mode.LAX)
+        template = env.from_string(source)
+        self.assertEqual(template.render_many([{}, {}]), ["ab", "ab"])
+
+        env = Environment(tolerance=Mode.WARN)
+        template = env.from_string(source)
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always")
+            self.assertEqual(template.render_many([{}, {}]), ["ab", "ab"])
+        self.assertEqual(len(caught), 2)
+
+    def test_output_limit_applies_per_render(self):
+        """Test that the output stream limit is reset between renders."""
+        env = Environment()
+        env.output_stream_limit = 5
+        template = env.from_string("{{ you }}")
+        contexts = [{"you": "abc"}, {"you": "abcdef"}, {"you": "de"}]
+        results = template.render_many(contexts)
+        self.assertEqual(results[0], "abc")
+        self.assertIsInstance(results[1], OutputStreamLimitError)
+        self.assertEqual(results[2], "de")
+
+    def test_render_many_async(self):
+        """Test that we can render a batch asynchronously."""
+        env = Environment(undefined=StrictUndefined)
+        template = env.from_string("Hello, {{ you }}!")
+
+        async def coro():
+            return await template.render_many_async(
+                [*self.contexts, {"you": 1}, {}], workers=4
+            )
+
+        results = asyncio.run(coro())
+        self.assertEqual(results[:50], self.expect)
+        self.assertEqual(results[50], "Hello, 1!")
+        self.assertIsInstance(results[51], UndefinedError)
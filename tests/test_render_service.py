@@ -0,0 +1,120 @@
+"""Process pool render service test cases."""
+import os
+import pickle
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from liquid import Environment
+from liquid import FileSystemLoader
+from liquid.exceptions import TemplateNotFound
+from liquid.exceptions import UndefinedError
+from liquid.render_service import RenderService
+from liquid.undefined import StrictUndefined
+
+
+class RenderServiceTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp.name)
+        self.path.joinpath("hello.liquid").write_text("Hello, {{ you }}!")
+        self.env = Environment(
+            loader=FileSystemLoader(self.path), undefined=StrictUndefined
+        )
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def _touch(self, name: str, source: str) -> None:
+        path = self.path.joinpath(name)
+        mtime = path.stat().st_mtime
+        path.write_text(source)
+        os.utime(path, (mtime + 1, mtime + 1))
+
+    def test_render_by_name(self):
+        """Test that we can render preloaded templates in worker processes."""
+        with RenderService(self.env, ["hello.liquid"], processes=2) as service:
+            self.assertEqual(
+                service.render("hello.liquid", you="World"), "Hello, World!"
+            )
+            results = [service.submit("hello.liquid", you=i) for i in range(10)]
+            self.assertEqual(
+                [result.get() for result in results],
+                [f"Hello, {i}!" for i in range(10)],
+            )
+
+    def test_load_on_first_use(self):
+        """Test that templates that were not preloaded are loaded on first use."""
+        self.path.joinpath("bye.liquid").write_text("Goodbye, {{ you }}!")
+        with RenderService(self.env, processes=1) as service:
+            self.assertEqual(
+                service.render("bye.liquid", you="World"), "Goodbye, World!"
+            )
+
+    def test_errors_are_raised(self):
+        """Test that render errors are raised in the calling process."""
+        with RenderService(self.env, ["hello.liquid"], processes=1) as service:
+            with self.assertRaises(UndefinedError):
+                service.render("hello.liquid")
+            with self.assertRaises(TemplateNotFound):
+                service.render("nosuchthing.liquid")
+
+    def test_auto_reload(self):
+        """Test that workers reload templates that have changed."""
+        with RenderService(self.env, ["hello.liquid"], processes=2) as service:
+            self.assertEqual(
+                service.render("hello.liquid", you="World"), "Hello, World!"
+            )
+            self._touch("hello.liquid", "Hi, {{ you }}!")
+            for _ in range(4):
+                self.assertEqual(
+                    service.render("hello.liquid", you="World"), "Hi, World!"
+                )
+
+    def test_recycled_workers_are_not_forked(self):
+        """Test that replacement workers are started without forking."""
+        with mock.patch(
+            "liquid.render_service._mp_context", side_effect=AssertionError("fork")
+        ), RenderService(
+            self.env, ["hello.liquid"], processes=1, max_jobs_per_worker=1
+        ) as service:
+            for _ in range(3):
+                self.assertEqual(
+                    service.render("hello.liquid", you="World"), "Hello, World!"
+                )
+
+    def test_recycle_workers_with_unpicklable_environment(self):
+        """Test that we can't replace workers without pickling the environment."""
+        env = Environment(loader=FileSystemLoader(self.path))
+        env.add_filter("shout", lambda s: str(s).upper())
+        with self.assertRaises((pickle.PicklingError, AttributeError)):
+            RenderService(env, ["hello.liquid"], processes=1, max_jobs_per_worker=1)
+
+    def test_invalidate(self):
+        """Test that we can tell workers to reload templates."""
+        env = Environment(loader=FileSystemLoader(self.path), auto_reload=False)
+        with RenderService(env, ["hello.liquid"], processes=1) as service:
+            self.assertEqual(
+                service.render("hello.liquid", you="World"), "Hello, World!"
+            )
+            self._touch("hello.liquid", "Hi, {{ you }}!")
+            self.assertEqual(
+                service.render("hello.liquid", you="World"), "Hello, World!"
+            )
+            service.invalidate("hello.liquid")
+            self.assertEqual(service.render("hello.liquid", you="World"), "Hi, World!")
+
+    def test_recycle_workers(self):
+        """Test that replacement workers start with up to date templates."""
+        with RenderService(
+            self.env, ["hello.liquid"], processes=1, max_jobs_per_worker=1
+        ) as service:
+            self.assertEqual(
+                service.render("hello.liquid", you="World"), "Hello, World!"
+            )
+            self._touch("hello.liquid", "Hi, {{ you }}!")
+            for _ in range(3):
+                self.assertEqual(
+                    service.render("hello.liquid", you="World"), "Hi, World!"
+                )
@@ -8,6 +8,7 @@ from liquid.exceptions import ContextDepthError
 from liquid.exceptions import LocalNamespaceLimitError
 from liquid.exceptions import LoopIterationLimitError
 from liquid.exceptions import OutputStreamLimitError
+from liquid.output import LimitedStringIO
 
 
 class ContextDepthLimitTestCase(unittest.TestCase):
@@ -310,3 +311,53 @@ class OutputStreamLimitTestCase(unittest.TestCase):
 
         with self.assertRaises(OutputStreamLimitError):
             template.render()
+
+    def test_suppressed_blocks_do_not_count_towards_limit(self):
+        """Test that whitespace only blocks don't count towards the output limit."""
+
+        class MockEnv(Environment):
+            output_stream_limit = 5
+
+        template = MockEnv().from_string(
+            "{% for x in (1..3) %}{% if true %}   {% endif %}{% endfor %}hello"
+        )
+        self.assertEqual(template.render(), "hello")
+
+    def test_output_stream_limit_counts_bytes(self):
+        """Test that output stream limits count UTF-8 encoded bytes by default."""
+
+        class MockEnv(Environment):
+            output_stream_limit = 5
+
+        env = MockEnv()
+        self.assertEqual(env.from_string("{{ 'hello' }}").render(), "hello")
+
+        with self.assertRaises(OutputStreamLimitError):
+            env.from_string("{{ 'héllo' }}").render()
+
+    def test_output_stream_limit_counts_characters(self):
+        """Test that we can set an output stream limit in characters."""
+
+        class MockEnv(Environment):
+            output_stream_limit = 5
+            output_stream_limit_unit = "characters"
+
+        env = MockEnv()
+        self.assertEqual(env.from_string("{{ 'héllo' }}").render(), "héllo")
+
+        with self.assertRaises(OutputStreamLimitError):
+            env.from_string("{{ 'héllo!' }}").render()
+
+    def test_write_intermediate_buffer(self):
+        """Test that we charge output from an intermediate buffer by its size."""
+        buffer = LimitedStringIO(limit=12)
+        buffer.write("héllo")
+        buf = LimitedStringIO(limit=buffer.limit - buffer.size)
+        buf.write("wörld")
+
+        buffer.write_buffer(buf)
+        self.assertEqual(buffer.getvalue(), "héllowörld")
+        self.assertEqual(buffer.size, 12)
+
+        with self.assertRaises(OutputStreamLimitError):
+            buffer.write_buffer(buf)
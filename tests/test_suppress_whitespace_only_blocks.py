@@ -1,6 +1,8 @@
 """Test cases for controlling automatic suppression of empty blocks."""
+import io
 import unittest
 
+from liquid import Context
 from liquid import Environment
 from liquid.builtin.tags.if_tag import IfNode
 from liquid.builtin.tags.if_tag import IfTag
@@ -140,3 +142,63 @@ class IfTagWhiteSpaceSuppressionTestCase(unittest.TestCase):
             "{% unless forloop.last %}\n{% endunless %}{% endfor %}"
         )
         self.assertEqual(template.render(), "1\n2\n3")
+
+
+class NestedBlockOutputTestCase(unittest.TestCase):
+    """Test cases for blocks rendered in place, in their enclosing buffer."""
+
+    def setUp(self) -> None:
+        self.env = Environment()
+
+    def test_suppress_nested_empty_blocks(self) -> None:
+        """Test that we suppress empty blocks nested in blocks with output."""
+        template = self.env.from_string(
+            "!{% for x in (1..3) %}{{ x }}"
+            "{% if true %} {% unless false %}\n{% endunless %} {% endif %}"
+            "{% endfor %}!"
+        )
+        self.assertEqual(template.render(), "!123!")
+
+    def test_suppress_empty_block_after_output(self) -> None:
+        """Test that suppressing a block does not remove preceding output."""
+        template = self.env.from_string(
+            "{% if true %}a{% if true %} \n {% endif %}b{% endif %}"
+        )
+        self.assertEqual(template.render(), "ab")
+
+    def test_discard_block_output_on_break(self) -> None:
+        """Test that a block's output is discarded when a loop is broken."""
+        template = self.env.from_string(
+            "{% for x in (1..3) %}{{ x }}"
+            "{% if x == 2 %}a{% if true %}b{% break %}{% endif %}{% endif %}"
+            "{% endfor %}!"
+        )
+        self.assertEqual(template.render(), "12!")
+
+    def test_capture_nested_blocks(self) -> None:
+        """Test that captured output is not written to the enclosing buffer."""
+        template = self.env.from_string(
+            "{% for x in (1..2) %}"
+            "{% capture y %}{% if true %}<{{ x }}>{% endif %}{% endcapture %}"
+            "{{ x }}{% endfor %}{{ y }}"
+        )
+        self.assertEqual(template.render(), "12<2>")
+
+    def test_ifchanged_nested_blocks(self) -> None:
+        """Test that unchanged ifchanged blocks are removed from the output."""
+        template = self.env.from_string(
+            "{% for x in (1..4) %}"
+            "{% ifchanged %}{% if x < 3 %}a{% else %}b{% endif %}{% endifchanged %}"
+            "{% endfor %}"
+        )
+        self.assertEqual(template.render(), "ab")
+
+    def test_render_to_other_text_streams(self) -> None:
+        """Test that we can render blocks to text streams that can't be rewound."""
+        template = self.env.from_string(
+            "{% for x in (1..3) %}{% if x > 1 %}{{ x }}{% endif %} {% endfor %}"
+        )
+        raw = io.BytesIO()
+        buf = io.TextIOWrapper(raw, encoding="utf-8", write_through=True)
+        template.render_with_context(Context(self.env), buf)
+        self.assertEqual(raw.getvalue(), b" 2 3 ")
@@ -1,7 +1,13 @@
 """Template cache test cases."""
+import sys
+import threading
 import unittest
+from unittest import mock
 
+from liquid import Environment
+from liquid.ast import estimate_size
 from liquid.utils import LRUCache
+from liquid.utils import SizedCache
 
 
 class TemplateCacheTestCase(unittest.TestCase):
@@ -81,3 +87,170 @@ class TemplateCacheTestCase(unittest.TestCase):
         self.cache["e"] = 5
         self.assertEqual("some" in self.cache, True)
         self.assertEqual("a" in self.cache, False)
+
+    def test_cache_info(self):
+        """Test that we count cache hits, misses and evictions."""
+        self.cache["foo"]
+        self.cache.get("nosuchthing")
+        for i in range(5):
+            self.cache[i] = i
+
+        info = self.cache.cache_info()
+        self.assertEqual(info.hits, 1)
+        self.assertEqual(info.misses, 1)
+        self.assertEqual(info.evictions, 2)
+        self.assertEqual(info.capacity, 5)
+        self.assertEqual(info.size, 5)
+
+    def test_large_capacity(self):
+        """Test that we maintain recency order in a large cache."""
+        cache = LRUCache(capacity=10000)
+        for i in range(10000):
+            cache[i] = i
+
+        cache[0]
+        cache[10000] = 10000
+        self.assertEqual(cache.keys()[:2], [10000, 0])
+        self.assertNotIn(1, cache)
+        self.assertEqual(len(cache), 10000)
+
+    def test_evicted_while_reading(self):
+        """Test that a key evicted by another thread after it was read is a hit."""
+        with mock.patch.object(self.cache, "_move_to_end", side_effect=KeyError):
+            self.assertEqual(self.cache["foo"], "bar")
+            self.assertEqual(self.cache.get("some"), "other")
+        self.assertEqual(self.cache.cache_info().hits, 2)
+
+    def test_concurrent_reads_and_writes(self):
+        """Test that reading without a lock does not corrupt the cache."""
+        cache = LRUCache(capacity=50)
+        errors = []
+
+        def read() -> None:
+            try:
+                for i in range(20000):
+                    val = cache.get(i % 100)
+                    if val is not None and val != i % 100:
+                        errors.append(val)
+            except Exception as err:  # noqa: BLE001
+                errors.append(err)
+
+        def write() -> None:
+            try:
+                for i in range(20000):
+                    cache[i % 100] = i % 100
+            except Exception as err:  # noqa: BLE001
+                errors.append(err)
+
+        threads = [threading.Thread(target=read) for _ in range(4)]
+        threads.append(threading.Thread(target=write))
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(len(cache), 50)
+        self.assertEqual(len(cache.keys()), 50)
+
+
+class SizedCacheTestCase(unittest.TestCase):
+    def test_max_bytes(self):
+        """Test that the cache does not exceed its size limit."""
+        cache = SizedCache(max_bytes=10, sizeof=len)
+        cache["a"] = "xxxx"
+        cache["b"] = "xxxx"
+        self.assertEqual(cache.nbytes, 8)
+
+        cache["c"] = "xxxx"
+        self.assertEqual(cache.keys(), ["c", "b"])
+        self.assertEqual(cache.nbytes, 8)
+        self.assertEqual(cache.cache_info().evictions, 1)
+
+    def test_too_big(self):
+        """Test that items larger than the size limit are not cached."""
+        cache = SizedCache(max_bytes=10, sizeof=len)
+        cache["a"] = "xxxx"
+        cache["b"] = "x" * 11
+        self.assertEqual(cache.keys(), ["a"])
+
+    def test_replace_item(self):
+        """Test that replacing an item updates the cache footprint."""
+        cache = SizedCache(max_bytes=10, sizeof=len)
+        cache["a"] = "xxxx"
+        cache["a"] = "xx"
+        self.assertEqual(cache.nbytes, 2)
+        del cache["a"]
+        self.assertEqual(cache.nbytes, 0)
+
+    def test_capacity(self):
+        """Test that the cache can be bounded by item count too."""
+        cache = SizedCache(max_bytes=100, capacity=2, sizeof=len)
+        cache["a"] = "x"
+        cache["b"] = "x"
+        cache["c"] = "x"
+        self.assertEqual(cache.keys(), ["c", "b"])
+
+    def test_lru(self):
+        """Test that the least recently used item is evicted first."""
+        cache = SizedCache(max_bytes=3, sizeof=len)
+        cache["a"] = "x"
+        cache["b"] = "x"
+        cache["c"] = "x"
+        cache["a"]
+        cache["d"] = "x"
+        self.assertNotIn("b", cache)
+        self.assertEqual(cache.keys(), ["d", "a", "c"])
+
+    def test_lfu(self):
+        """Test that the least frequently used item is evicted first."""
+        cache = SizedCache(max_bytes=3, policy="lfu", sizeof=len)
+        cache["a"] = "x"
+        cache["b"] = "x"
+        cache["c"] = "x"
+        cache["a"]
+        cache["a"]
+        cache["b"]
+        cache["d"] = "x"
+        self.assertNotIn("c", cache)
+        cache["e"] = "x"
+        self.assertNotIn("d", cache)
+        self.assertEqual(cache.keys(), ["a", "b", "e"])
+
+        info = cache.cache_info()
+        self.assertEqual(info.hits, 3)
+        self.assertEqual(info.evictions, 2)
+        self.assertEqual(info.nbytes, 3)
+
+    def test_copy(self):
+        """Test that we can copy a sized cache."""
+        cache = SizedCache(max_bytes=3, policy="lfu", sizeof=len)
+        cache["a"] = "x"
+        cache["b"] = "x"
+        cache["a"]
+        self.assertEqual(cache.copy().items(), cache.items())
+
+    def test_unknown_policy(self):
+        """Test that we raise a ValueError for unknown eviction policies."""
+        with self.assertRaises(ValueError):
+            SizedCache(max_bytes=3, policy="nosuchthing")
+
+    def test_template_size(self):
+        """Test that we estimate the size of templates from their parse tree."""
+        env = Environment()
+        small = env.from_string("Hello, {{ you }}!")
+        big = env.from_string("Hello, {{ you }}!" * 100)
+        self.assertGreater(estimate_size(big.tree), estimate_size(small.tree) * 50)
+        self.assertGreater(sys.getsizeof(big), estimate_size(big.tree))
+
+    def test_environment_cache_max_bytes(self):
+        """Test that we can bound an environment's template cache by size."""
+
+        class MockEnv(Environment):
+            cache_max_bytes = 10000
+            cache_policy = "lfu"
+
+        env = MockEnv()
+        self.assertIsInstance(env.cache, SizedCache)
+        assert isinstance(env.cache, SizedCache)
+        self.assertEqual(env.cache.policy, "lfu")
@@ -5,6 +5,7 @@ from typing import Dict
 from typing import Mapping
 from typing import NamedTuple
 from unittest import TestCase
+from unittest import mock
 
 from liquid import BoundTemplate
 from liquid import Environment
@@ -14,7 +15,9 @@ from liquid.exceptions import RequiredBlockError
 from liquid.exceptions import TemplateInheritanceError
 from liquid.exceptions import UndefinedError
 from liquid.extra import add_inheritance_tags
+from liquid.extra.tags import extends
 from liquid.loaders import DictLoader
+from liquid.loaders import TemplateSource
 
 
 class Case(NamedTuple):
@@ -732,3 +735,109 @@ class TemplateInheritanceTestCase(TestCase):
         with self.subTest(asynchronous=True):
             result = asyncio.run(coro(template))
             self.assertEqual(result, expect)
+
+
+class ReloadingLoader(DictLoader):
+    """A dictionary loader with templates that can be marked as out of date."""
+
+    def __init__(self, templates: Dict[str, str]):
+        super().__init__(templates)
+        self.versions: Dict[str, int] = {}
+
+    def get_source(self, _: Environment, template_name: str) -> TemplateSource:
+        source = super().get_source(_, template_name)
+        version = self.versions.get(template_name, 0)
+        return source._replace(
+            uptodate=lambda: self.versions.get(template_name, 0) == version
+        )
+
+    def update(self, template_name: str, source: str) -> None:
+        self.templates[template_name] = source
+        self.versions[template_name] = self.versions.get(template_name, 0) + 1
+
+
+class BlockStackCacheTestCase(TestCase):
+    """Test that block stacks are built once per extending template."""
+
+    def setUp(self) -> None:
+        self.loader = ReloadingLoader(
+            {
+                "base": (
+                    "<h1>{% block title %}{% endblock %}</h1>"
+                    "{% block content %}base{% endblock %}"
+                ),
+                "layout": (
+                    "{% extends 'base' %}"
+                    "{% block content %}[{{ block.super }}]{% endblock %}"
+                ),
+                "page": (
+                    "{% extends 'layout' %}"
+                    "{% block title %}{{ title }}{% endblock %}"
+                ),
+            }
+        )
+
+    def test_reuse_block_stacks(self) -> None:
+        """Test that we don't search ancestors for blocks on every render."""
+        env = Environment(loader=self.loader)
+        add_inheritance_tags(env)
+        template = env.get_template("page")
+
+        with mock.patch.object(
+            extends,
+            "find_inheritance_nodes",
+            wraps=extends.find_inheritance_nodes,
+        ) as find:
+            for title in ("a", "b", "c"):
+                self.assertEqual(
+                    template.render(title=title), f"<h1>{title}</h1>[base]"
+                )
+                self.assertEqual(
+                    asyncio.run(template.render_async(title=title)),
+                    f"<h1>{title}</h1>[base]",
+                )
+
+        # Once for each template in the chain.
+        self.assertEqual(find.call_count, 3)
+
+    def test_rebuild_when_an_ancestor_changes(self) -> None:
+        """Test that block stacks are rebuilt if an ancestor is out of date."""
+        env = Environment(loader=self.loader, auto_reload=True)
+        add_inheritance_tags(env)
+        template = env.get_template("page")
+        self.assertEqual(template.render(title="a"), "<h1>a</h1>[base]")
+
+        self.loader.update("base", "{% block content %}new{% endblock %}")
+        self.assertEqual(template.render(title="a"), "[new]")
+
+        self.loader.update(
+            "layout",
+            "{% extends 'base' %}{% block content %}({{ block.super }}){% endblock %}",
+        )
+        self.assertEqual(asyncio.run(template.render_async(title="a")), "(new)")
+
+    def test_ignore_changes_without_auto_reload(self) -> None:
+        """Test that ancestors are not checked if auto reload is disabled."""
+        env = Environment(loader=self.loader, auto_reload=False)
+        add_inheritance_tags(env)
+        template = env.get_template("page")
+        self.assertEqual(template.render(title="a"), "<h1>a</h1>[base]")
+
+        self.loader.update("base", "{% block content %}new{% endblock %}")
+        self.assertEqual(template.render(title="a"), "<h1>a</h1>[base]")
+
+    def test_no_template_cache(self) -> None:
+        """Test that block stacks are built every time without a template cache."""
+        env = Environment(loader=self.loader, cache_size=0)
+        add_inheritance_tags(env)
+        template = env.get_template("page")
+
+        with mock.patch.object(
+            extends,
+            "find_inheritance_nodes",
+            wraps=extends.find_inheritance_nodes,
+        ) as find:
+            template.render(title="a")
+            template.render(title="b")
+
+        self.assertEqual(find.call_count, 6)